@@ -7,13 +7,28 @@ CookLikeHOC 菜谱数据导入器
 
 import os
 import re
+import sys
 import json
+import mmap
+import time
+import struct
+import functools
+import bisect
+import heapq
+import hashlib
 import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
+from dataclasses import dataclass, field, fields, asdict
 from datetime import datetime
 
+from asset_output import OutputProfile, get_output_profile, remove_stale_variants, write_bytes_atomic, write_json
+from recipe_discovery import RecipeFile, scan_recipe_files
+from recipe_ids import DEFAULT_ID_MAP_FILE, RecipeIdMap
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -25,7 +40,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     """菜谱数据模型"""
     title: str
@@ -46,6 +61,94 @@ class Recipe:
             self.ingredients = []
         if self.instructions is None:
             self.instructions = []
+        self.intern_strings()
+    
+    def intern_strings(self):
+        """驻留分类、描述、难度和配料等高度重复的字符串，使相同取值共享同一对象"""
+        self.category = sys.intern(self.category)
+        self.description = sys.intern(self.description)
+        self.difficulty = sys.intern(self.difficulty)
+        self.ingredients = [sys.intern(ingredient) for ingredient in self.ingredients]
+
+# 预编译的正则表达式
+IMAGE_PATTERN = re.compile(r'!\[.*?\]\((.+?)\)')
+ITALIC_PATTERN = re.compile(r'_.*?_')
+PARENTHESES_PATTERN = re.compile(r'\(.*?\)')
+STEP_NUMBER_PATTERN = re.compile(r'^\d+\.\s*')
+# 数字 + 单位；重量单位 g 必须紧跟数字，其余单位允许中间有空白
+QUANTITY_PATTERN = re.compile(r'(\d+)(?:\s*(分钟|小时|秒|人份|份|人)|(g))')
+# 时长前的烹饪动作，顺序决定匹配优先级
+DURATION_QUALIFIERS = ('蒸制', '蒸', '煮', '炒')
+
+RECIPE_FIELD_NAMES = tuple(recipe_field.name for recipe_field in fields(Recipe))
+
+@dataclass(slots=True)
+class Quantity:
+    """文本中的一个数量实体"""
+    value: int
+    unit: str
+    start: int
+    qualifier: str = ""  # 紧邻数字之前的烹饪动作（蒸/煮/炒），仅时长单位记录
+
+def extract_quantities(text: str) -> List[Quantity]:
+    """一次扫描提取文本中所有 数字+单位 实体（g、分钟、小时、秒、份、人份、人）"""
+    quantities = []
+    for match in QUANTITY_PATTERN.finditer(text):
+        unit = match.group(2) or match.group(3)
+        start = match.start()
+        qualifier = ""
+        if unit in ('分钟', '秒'):
+            preceding = text[max(0, start - 8):start].rstrip()
+            for action in DURATION_QUALIFIERS:
+                if preceding.endswith(action):
+                    qualifier = action[0]
+                    break
+        quantities.append(Quantity(int(match.group(1)), unit, start, qualifier))
+    return quantities
+
+@dataclass
+class MarkdownDocument:
+    """一次扫描切分后的 Markdown 文档"""
+    content: str
+    title: str = ""
+    images: List[str] = field(default_factory=list)
+    sections: Dict[str, str] = field(default_factory=dict)
+
+def tokenize_markdown(content: str) -> MarkdownDocument:
+    """逐行扫描一次，将文档切分为标题、图片和以二级及以下标题为键的章节
+
+    章节内容到下一个以 # 开头的行为止；同名章节以第一次出现的为准
+    """
+    document = MarkdownDocument(content=content)
+    section_name = None
+    section_lines = []
+    
+    for line in content.split('\n'):
+        if line.startswith('#'):
+            if section_name is not None and section_name not in document.sections:
+                document.sections[section_name] = '\n'.join(section_lines).strip()
+            section_name = None
+            
+            heading = line.lstrip('#')
+            level = len(line) - len(heading)
+            if level == 1:
+                if not document.title and heading[:1].isspace() and heading.strip():
+                    document.title = heading.strip()
+            else:
+                section_name = heading.strip()
+                section_lines = []
+            continue
+        
+        if '![' in line:
+            document.images.extend(IMAGE_PATTERN.findall(line))
+        
+        if section_name is not None:
+            section_lines.append(line)
+    
+    if section_name is not None and section_name not in document.sections:
+        document.sections[section_name] = '\n'.join(section_lines).strip()
+    
+    return document
 
 class CookLikeHOCParser:
     """CookLikeHOC 项目专用解析器"""
@@ -69,55 +172,86 @@ class CookLikeHOCParser:
             '饮品': 'beverage',
             '配料': 'seasoning'
         }
+        # 分步解析耗时（秒），为 None 时不计时
+        self.timings: Optional[Dict[str, float]] = None
         
-    def discover_recipe_files(self) -> List[Path]:
-        """发现所有菜谱文件"""
-        recipe_files = []
+    def discover_recipe_entries(self, workers: Optional[int] = None) -> List[RecipeFile]:
+        """发现所有菜谱文件（含子分类目录），附带文件大小与 mtime
+
+        目录在线程池中并发扫描，结果按路径排序
+        """
+        recipe_files = scan_recipe_files(self.project_path, self.categories, workers)
         
-        for category_dir in self.project_path.iterdir():
-            if category_dir.is_dir() and category_dir.name in self.categories:
-                logger.info(f"扫描分类目录: {category_dir.name}")
-                
-                for file_path in category_dir.glob("*.md"):
-                    if file_path.name != "README.md":
-                        recipe_files.append(file_path)
-                        logger.debug(f"发现菜谱文件: {file_path}")
+        counts = {}
+        for recipe_file in recipe_files:
+            counts[recipe_file.category_dir] = counts.get(recipe_file.category_dir, 0) + 1
+        for category_dir, count in counts.items():
+            logger.info(f"扫描分类目录: {category_dir} ({count} 个文件)")
         
         logger.info(f"总共发现 {len(recipe_files)} 个菜谱文件")
         return recipe_files
     
+    def discover_recipe_files(self, workers: Optional[int] = None) -> List[Path]:
+        """发现所有菜谱文件"""
+        return [recipe_file.path for recipe_file in self.discover_recipe_entries(workers)]
+    
+    def category_dir_name(self, file_path: Path) -> str:
+        """菜谱所属的分类目录名：项目根目录下的第一级目录，子分类目录中的菜谱归入其上级分类"""
+        try:
+            return file_path.relative_to(self.project_path).parts[0]
+        except (ValueError, IndexError):
+            return file_path.parent.name
+    
     def parse_markdown_recipe(self, file_path: Path) -> Optional[Recipe]:
         """解析单个 Markdown 菜谱文件"""
         try:
+            timings = self.timings
+            if timings is not None:
+                started = time.perf_counter()
+            
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
+            if timings is not None:
+                read_done = time.perf_counter()
+                timings['read'] += read_done - started
+            
+            document = tokenize_markdown(content)
+            
             # 提取标题
-            title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-            title = title_match.group(1).strip() if title_match else file_path.stem
+            title = document.title or file_path.stem
             
             # 确定分类
-            category_name = file_path.parent.name
+            category_name = self.category_dir_name(file_path)
             category = self.categories.get(category_name, 'other')
             
             # 提取图片路径
-            image_match = re.search(r'!\[.*?\]\((.+?)\)', content)
-            image_path = image_match.group(1) if image_match else ""
+            image_path = document.images[0] if document.images else ""
             
             # 提取配料/品类
-            ingredients = self._extract_ingredients(content)
+            ingredients = self._extract_ingredients(document)
             
             # 提取步骤
-            instructions = self._extract_instructions(content)
+            instructions = self._extract_instructions(document)
+            
+            if timings is not None:
+                extract_done = time.perf_counter()
+                timings['extract'] += extract_done - read_done
+            
+            # 一次扫描提取全文的数量实体，供时间与份数估算共用
+            quantities = extract_quantities(content)
             
             # 估算烹饪时间
-            cooking_time = self._estimate_cooking_time(content, instructions)
+            cooking_time = self._estimate_cooking_time(quantities, instructions)
             
             # 估算难度
             difficulty = self._estimate_difficulty(instructions, ingredients)
             
             # 估算份数
-            servings = self._estimate_servings(content, ingredients)
+            servings = self._estimate_servings(quantities, ingredients)
+            
+            if timings is not None:
+                timings['heuristics'] += time.perf_counter() - extract_done
             
             recipe = Recipe(
                 title=title,
@@ -139,79 +273,63 @@ class CookLikeHOCParser:
             logger.error(f"解析文件 {file_path} 时出错: {e}")
             return None
     
-    def _extract_ingredients(self, content: str) -> List[str]:
+    def _extract_ingredients(self, document: MarkdownDocument) -> List[str]:
         """提取配料列表"""
         ingredients = []
         
         # 查找配料或品类部分
-        sections = ['## 配料', '## 品类']
-        for section in sections:
-            pattern = rf'{section}\s*\n(.*?)(?=\n##|\n#|\Z)'
-            match = re.search(pattern, content, re.DOTALL)
+        for section in ['配料', '品类']:
+            if section not in document.sections:
+                continue
             
-            if match:
-                ingredient_text = match.group(1).strip()
-                # 提取列表项
-                lines = ingredient_text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('- '):
-                        ingredient = line[2:].strip()
-                        # 清理特殊标记
-                        ingredient = re.sub(r'_.*?_', '', ingredient)  # 移除斜体
-                        ingredient = re.sub(r'\(.*?\)', '', ingredient)  # 移除括号内容
-                        ingredient = ingredient.strip()
-                        if ingredient and not ingredient.startswith('_'):
-                            ingredients.append(ingredient)
-                break
+            # 提取列表项
+            for line in document.sections[section].split('\n'):
+                line = line.strip()
+                if line.startswith('- '):
+                    ingredient = line[2:].strip()
+                    # 清理特殊标记
+                    ingredient = ITALIC_PATTERN.sub('', ingredient)  # 移除斜体
+                    ingredient = PARENTHESES_PATTERN.sub('', ingredient)  # 移除括号内容
+                    ingredient = ingredient.strip()
+                    if ingredient and not ingredient.startswith('_'):
+                        ingredients.append(ingredient)
+            break
         
         return ingredients
     
-    def _extract_instructions(self, content: str) -> List[str]:
+    def _extract_instructions(self, document: MarkdownDocument) -> List[str]:
         """提取制作步骤"""
         instructions = []
         
         # 查找步骤部分
-        pattern = r'## 步骤\s*\n(.*?)(?=\n##|\n#|\Z)'
-        match = re.search(pattern, content, re.DOTALL)
-        
-        if match:
-            steps_text = match.group(1).strip()
-            lines = steps_text.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('- '):
-                    step = line[2:].strip()
-                    # 清理步骤编号
-                    step = re.sub(r'^\d+\.\s*', '', step)
-                    if step:
-                        instructions.append(step)
+        for line in document.sections.get('步骤', '').split('\n'):
+            line = line.strip()
+            if line.startswith('- '):
+                step = line[2:].strip()
+                # 清理步骤编号
+                step = STEP_NUMBER_PATTERN.sub('', step)
+                if step:
+                    instructions.append(step)
         
         return instructions
     
-    def _estimate_cooking_time(self, content: str, instructions: List[str]) -> int:
-        """估算烹饪时间（分钟）"""
-        time_patterns = [
-            r'(\d+)\s*分钟',
-            r'(\d+)\s*小时',
-            r'蒸制?\s*(\d+)\s*分钟',
-            r'煮\s*(\d+)\s*分钟',
-            r'炒\s*(\d+)\s*秒'
-        ]
-        
+    def _estimate_cooking_time(self, quantities: List[Quantity], instructions: List[str]) -> int:
+        """估算烹饪时间（分钟）
+
+        步骤已包含在全文中，只统计一次
+        """
         total_time = 0
-        text = content + ' '.join(instructions)
-        
-        for pattern in time_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                time_val = int(match)
-                if '小时' in pattern:
-                    time_val *= 60
-                elif '秒' in pattern:
-                    time_val = max(1, time_val // 60)  # 转换为分钟
-                total_time += time_val
+        
+        for quantity in quantities:
+            if quantity.unit == '分钟':
+                total_time += quantity.value
+                # 蒸、煮的时长按原有规则额外计入一次
+                if quantity.qualifier in ('蒸', '煮'):
+                    total_time += quantity.value
+            elif quantity.unit == '小时':
+                total_time += quantity.value * 60
+            elif quantity.unit == '秒' and quantity.qualifier == '炒':
+                total_time += max(1, quantity.value // 60)  # 转换为分钟
         
         # 如果没有找到时间信息，根据步骤数量估算
         if total_time == 0:
@@ -261,26 +379,25 @@ class CookLikeHOCParser:
         else:
             return "困难"
     
-    def _estimate_servings(self, content: str, ingredients: List[str]) -> int:
+    def _estimate_servings(self, quantities: List[Quantity], ingredients: List[str]) -> int:
         """估算份数"""
-        # 查找明确的份数信息
-        serving_patterns = [
-            r'(\d+)\s*份',
-            r'(\d+)\s*人份',
-            r'(\d+)\s*人'
-        ]
-        
-        for pattern in serving_patterns:
-            match = re.search(pattern, content)
-            if match:
-                return int(match.group(1))
-        
-        # 根据配料重量估算
+        # 查找明确的份数信息，优先级：份 > 人份 > 人
+        first_by_unit = {}
+        for quantity in quantities:
+            if quantity.unit in ('份', '人份', '人') and quantity.unit not in first_by_unit:
+                first_by_unit[quantity.unit] = quantity.value
+        
+        for unit in ('份', '人份', '人'):
+            if unit in first_by_unit:
+                return first_by_unit[unit]
+        
+        # 根据配料重量估算：每个配料取第一个重量
         total_weight = 0
         for ingredient in ingredients:
-            weight_match = re.search(r'(\d+)g', ingredient)
-            if weight_match:
-                total_weight += int(weight_match.group(1))
+            for quantity in extract_quantities(ingredient):
+                if quantity.unit == 'g':
+                    total_weight += quantity.value
+                    break
         
         if total_weight > 1000:
             return 6
@@ -291,10 +408,373 @@ class CookLikeHOCParser:
         else:
             return 1
 
+class ImportCache:
+    """增量导入缓存
+
+    以清单文件记录每个源文件的路径、mtime、大小、内容哈希及解析结果，
+    再次导入时只重新解析新增或内容变化的文件
+    """
+    
+    # 缓存格式或解析结果发生变化时递增，旧缓存将被整体忽略
+    VERSION = 3
+    
+    def __init__(self, cache_file: str, project_path: str):
+        self.cache_file = cache_file
+        self.project_path = str(project_path)
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, Tuple[int, int, str]] = {}
+        # 清单与磁盘上的缓存文件不一致时为 True，未变化时 save 不再重写整个清单
+        self.dirty = False
+        self._load()
+    
+    def _load(self):
+        """读取缓存清单，版本或项目路径不匹配时忽略"""
+        if not os.path.exists(self.cache_file):
+            return
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取导入缓存失败，将重新解析所有文件: {e}")
+            return
+        
+        if data.get('version') != self.VERSION or data.get('project_path') != self.project_path:
+            logger.info("导入缓存版本或项目路径不匹配，已忽略")
+            return
+        
+        self.entries = data.get('files', {})
+    
+    @staticmethod
+    def _file_hash(file_path: Path) -> str:
+        """计算文件内容的 SHA-256"""
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+    
+    def lookup(self, file_path: Path, file_stat: Optional[Tuple[int, int]] = None) -> Tuple[bool, Optional[Recipe]]:
+        """查询缓存，返回 (是否命中, 菜谱)
+
+        mtime 与大小一致时直接命中；不一致时再比较内容哈希。
+        file_stat 为发现阶段已取得的 (mtime_ns, 大小)，提供时不再 stat
+        """
+        key = str(file_path)
+        if file_stat is None:
+            try:
+                stat = file_path.stat()
+            except OSError:
+                self.misses += 1
+                return False, None
+            file_stat = (stat.st_mtime_ns, stat.st_size)
+        mtime, size = file_stat
+        
+        entry = self.entries.get(key)
+        if entry and entry['mtime'] == mtime and entry['size'] == size:
+            self.hits += 1
+            return True, self._to_recipe(entry)
+        
+        try:
+            digest = self._file_hash(file_path)
+        except OSError:
+            self.misses += 1
+            return False, None
+        if entry and entry['sha256'] == digest:
+            # 仅 mtime 变化（例如重新检出），内容未变
+            entry['mtime'] = mtime
+            entry['size'] = size
+            self.dirty = True
+            self.hits += 1
+            return True, self._to_recipe(entry)
+        
+        # 记录解析前的文件状态，解析期间文件再次变化时下次导入会重新解析
+        self._pending[key] = (mtime, size, digest)
+        self.misses += 1
+        return False, None
+    
+    def store(self, file_path: Path, recipe: Optional[Recipe]):
+        """记录新解析的结果"""
+        key = str(file_path)
+        if key not in self._pending:
+            return
+        
+        mtime, size, digest = self._pending.pop(key)
+        self.entries[key] = {
+            'mtime': mtime,
+            'size': size,
+            'sha256': digest,
+            'recipe': self._from_recipe(recipe) if recipe else None
+        }
+        self.dirty = True
+    
+    def save(self, recipe_files: List[Path]):
+        """移除已删除文件的记录并写回缓存清单；没有任何变化时跳过写入"""
+        live_files = {str(file_path) for file_path in recipe_files}
+        removed = [key for key in self.entries if key not in live_files]
+        for key in removed:
+            del self.entries[key]
+        
+        if removed:
+            self.dirty = True
+            logger.info(f"导入缓存移除 {len(removed)} 个已删除的文件")
+        
+        if not self.dirty:
+            return
+        
+        data = {
+            'version': self.VERSION,
+            'project_path': self.project_path,
+            'files': self.entries
+        }
+        
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            # json.dumps 整体走 C 编码器，json.dump 逐块写出时退回纯 Python 编码，大清单慢数倍
+            f.write(json.dumps(data, ensure_ascii=False))
+        os.replace(temp_file, self.cache_file)
+        self.dirty = False
+    
+    @staticmethod
+    def _from_recipe(recipe: Recipe) -> Dict:
+        """浅拷贝菜谱字段；字段只有字符串、整数与字符串列表，无需 asdict 的逐层深拷贝"""
+        return {name: getattr(recipe, name) for name in RECIPE_FIELD_NAMES}
+    
+    @staticmethod
+    def _to_recipe(entry: Dict) -> Optional[Recipe]:
+        recipe_data = entry.get('recipe')
+        return Recipe(**recipe_data) if recipe_data else None
+
+# 二进制菜谱文件（export_to_binary 写出，RecipeBinaryReader 读取）
+# 文件头: 魔数 | 格式版本 | 菜谱数 | 元数据长度
+# 元数据: JSON {"fields": 字段名列表, "categories": {分类: [起始偏移, 结束偏移, 菜谱数]}}
+# 偏移表: 按菜谱 id（稳定 ID，与预置数据库一致）升序排列的 (id, 记录偏移) 对，按 id 二分查找
+# 记录区: 同一分类的记录连续存放，每条为 4 字节长度前缀 + 按 fields 顺序排列的紧凑 JSON 数组
+# 偏移均相对于记录区起点
+BINARY_MAGIC = b'CLHR'
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct('<4sHII')
+BINARY_UINT = struct.Struct('<I')
+BINARY_OFFSET_ENTRY = struct.Struct('<II')
+
+class RecipeBinaryReader:
+    """二进制菜谱文件读取器
+
+    通过 mmap 按需解码，按 id 读取单个菜谱或按分类读取一段连续记录时
+    不需要解析文件的其余部分
+    """
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        try:
+            magic, version, count, metadata_length = BINARY_HEADER.unpack_from(self._data, 0)
+        except struct.error:
+            magic, version = None, None
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self._data.close()
+            raise ValueError(f"不是受支持的菜谱二进制文件: {file_path}")
+        
+        metadata_start = BINARY_HEADER.size
+        metadata = json.loads(self._data[metadata_start:metadata_start + metadata_length])
+        self.fields: List[str] = metadata['fields']
+        self.categories: Dict[str, Tuple[int, int, int]] = {
+            category: tuple(entry) for category, entry in metadata['categories'].items()
+        }
+        self._count = count
+        self._offsets_start = metadata_start + metadata_length
+        self._records_start = self._offsets_start + count * BINARY_OFFSET_ENTRY.size
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        self._data.close()
+    
+    def get(self, recipe_id: int) -> Recipe:
+        """按 id 读取单个菜谱，id 不存在时抛出 KeyError"""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry_id, offset = BINARY_OFFSET_ENTRY.unpack_from(
+                self._data, self._offsets_start + middle * BINARY_OFFSET_ENTRY.size)
+            if entry_id == recipe_id:
+                return self._decode(self._records_start + offset)[0]
+            if entry_id < recipe_id:
+                low = middle + 1
+            else:
+                high = middle
+        raise KeyError(recipe_id)
+    
+    def iter_category(self, category: str) -> Iterator[Recipe]:
+        """按存储顺序逐个读取某一分类的菜谱，分类不存在时抛出 KeyError"""
+        start, end, _ = self.categories[category]
+        position = self._records_start + start
+        end += self._records_start
+        while position < end:
+            recipe, position = self._decode(position)
+            yield recipe
+    
+    def _decode(self, position: int) -> Tuple[Recipe, int]:
+        """解码 position 处的记录，返回 (菜谱, 下一条记录的位置)"""
+        length, = BINARY_UINT.unpack_from(self._data, position)
+        position += BINARY_UINT.size
+        values = json.loads(self._data[position:position + length])
+        return Recipe(**dict(zip(self.fields, values))), position + length
+
+class ImportMetrics:
+    """导入性能指标：阶段墙钟/CPU 耗时、单文件解析延迟直方图、最慢文件与读写字节数"""
+    
+    # 单文件解析延迟直方图的桶上界（秒）
+    LATENCY_BUCKETS = [0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0]
+    
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.bucket_counts = [0] * (len(self.LATENCY_BUCKETS) + 1)
+        self.parse_count = 0
+        self.parse_seconds = 0.0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._slowest: List[Tuple[float, str]] = []
+        self._write_lock = threading.Lock()
+    
+    @contextmanager
+    def stage(self, name: str):
+        """记录一个阶段的墙钟与 CPU 耗时"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+    
+    def add_stage(self, name: str, wall_seconds: float, cpu_seconds: float = 0.0):
+        """累加阶段耗时；同名阶段多次调用时合并"""
+        stage = self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0})
+        stage['wall_seconds'] += wall_seconds
+        stage['cpu_seconds'] += cpu_seconds
+        stage['calls'] += 1
+    
+    def record_parse(self, file_path: Path, seconds: float, size: int):
+        """记录单个文件的解析延迟和读取字节数"""
+        self.bucket_counts[bisect.bisect_left(self.LATENCY_BUCKETS, seconds)] += 1
+        self.parse_count += 1
+        self.parse_seconds += seconds
+        self.bytes_read += size
+        
+        item = (seconds, str(file_path))
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, item)
+        elif item > self._slowest[0]:
+            heapq.heapreplace(self._slowest, item)
+    
+    def record_write(self, file_path: str):
+        """记录写出文件的字节数（可在多个写线程中调用）"""
+        size = os.path.getsize(file_path)
+        with self._write_lock:
+            self.bytes_written += size
+    
+    def slowest_files(self) -> List[Tuple[str, float]]:
+        """按耗时从高到低返回最慢的文件"""
+        return [(path, seconds) for seconds, path in sorted(self._slowest, reverse=True)]
+    
+    def to_dict(self) -> Dict:
+        """转换为可序列化为 JSON 的字典"""
+        cumulative = 0
+        histogram = []
+        for bound, count in zip(self.LATENCY_BUCKETS + [float('inf')], self.bucket_counts):
+            cumulative += count
+            histogram.append({'le': '+Inf' if bound == float('inf') else bound, 'count': cumulative})
+        
+        return {
+            'stages': self.stages,
+            'parse_latency': {
+                'count': self.parse_count,
+                'sum_seconds': self.parse_seconds,
+                'histogram': histogram
+            },
+            'slowest_files': [
+                {'file': path, 'seconds': seconds} for path, seconds in self.slowest_files()
+            ],
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written
+        }
+    
+    def to_openmetrics(self, prefix: str = "cooklikehoc_import") -> str:
+        """转换为 OpenMetrics 文本格式"""
+        lines = [f"# TYPE {prefix}_stage_wall_seconds gauge"]
+        for name, stage in self.stages.items():
+            lines.append(f'{prefix}_stage_wall_seconds{{stage="{name}"}} {stage["wall_seconds"]:.6f}')
+        
+        lines.append(f"# TYPE {prefix}_stage_cpu_seconds gauge")
+        for name, stage in self.stages.items():
+            lines.append(f'{prefix}_stage_cpu_seconds{{stage="{name}"}} {stage["cpu_seconds"]:.6f}')
+        
+        lines.append(f"# TYPE {prefix}_parse_seconds histogram")
+        for bucket in self.to_dict()['parse_latency']['histogram']:
+            lines.append(f'{prefix}_parse_seconds_bucket{{le="{bucket["le"]}"}} {bucket["count"]}')
+        lines.append(f"{prefix}_parse_seconds_count {self.parse_count}")
+        lines.append(f"{prefix}_parse_seconds_sum {self.parse_seconds:.6f}")
+        
+        lines.append(f"# TYPE {prefix}_bytes_read counter")
+        lines.append(f"{prefix}_bytes_read_total {self.bytes_read}")
+        lines.append(f"# TYPE {prefix}_bytes_written counter")
+        lines.append(f"{prefix}_bytes_written_total {self.bytes_written}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+def timed_stage(name: str):
+    """方法装饰器：启用指标时把整个方法记为一个阶段，未启用时直接调用"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.metrics:
+                return method(self, *args, **kwargs)
+            with self.metrics.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def _new_parse_timings() -> Dict[str, float]:
+    return {'read': 0.0, 'extract': 0.0, 'heuristics': 0.0}
+
+def _parse_recipe_batch(project_path: str, batch: List[Tuple[int, str]], timed: bool = False):
+    """在子进程中解析一批菜谱文件
+
+    返回 ((原始序号, 菜谱, 解析耗时) 列表, 分步耗时, 子进程 CPU 耗时)；
+    未启用计时时解析耗时为 0，分步耗时为 None
+    """
+    parser = CookLikeHOCParser(project_path)
+    if not timed:
+        return [(index, parser.parse_markdown_recipe(Path(file_path)), 0.0) for index, file_path in batch], None, 0.0
+    
+    parser.timings = _new_parse_timings()
+    cpu_start = time.process_time()
+    results = []
+    for index, file_path in batch:
+        started = time.perf_counter()
+        recipe = parser.parse_markdown_recipe(Path(file_path))
+        results.append((index, recipe, time.perf_counter() - started))
+    return results, parser.timings, time.process_time() - cpu_start
+
 class DataImporter:
     """数据导入器主类"""
     
-    def __init__(self, project_path: str = r"e:\UGit\CookLikeHOC"):
+    def __init__(self, project_path: str = r"e:\UGit\CookLikeHOC", metrics: bool = False,
+                 output_profile: str = "pretty", id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE):
         self.project_path = project_path
         self.parser = CookLikeHOCParser(project_path)
         self.recipes = []
@@ -304,9 +784,38 @@ class DataImporter:
             'failed': 0,
             'categories': {}
         }
+        # 性能指标，未启用时为 None，各阶段不做任何计时
+        self.metrics = ImportMetrics() if metrics else None
+        if self.metrics:
+            self.parser.timings = _new_parse_timings()
+        # JSON 输出配置（缩进 / 压缩为单行 / 附带 gzip、zstd），见 asset_output.OUTPUT_PROFILES
+        self.output_profile = get_output_profile(output_profile)
+        # 稳定菜谱 ID 映射文件，见 recipe_ids；为 None 时 ID 只由哈希决定
+        self.id_map_file = id_map_file
+    
+    def recipe_ids(self) -> List[int]:
+        """按 self.recipes 的顺序返回稳定菜谱 ID
+
+        与 prepare_recipe_data 使用同一映射，分类文件、预置数据库、全文检索与二进制文件的 id 都取自这里；
+        只读取映射不写回，新菜谱的 ID 由哈希确定，写回由准备应用数据的步骤负责
+        """
+        id_map = RecipeIdMap(self.id_map_file)
+        return [id_map.assign(recipe.category, recipe.title) for recipe in self.recipes]
+    
+    def _stage(self, name: str):
+        """返回阶段计时上下文；未启用指标时为空操作"""
+        return self.metrics.stage(name) if self.metrics else nullcontext()
     
-    def import_all_recipes(self) -> Dict:
-        """导入所有菜谱数据"""
+    def _record_write(self, file_path: str):
+        if self.metrics:
+            self.metrics.record_write(file_path)
+    
+    def import_all_recipes(self, workers: int = 1, cache_file: Optional[str] = None) -> Dict:
+        """导入所有菜谱数据
+
+        workers 大于 1 时使用进程池并行解析，结果顺序与统计信息与串行模式一致；
+        指定 cache_file 时启用增量缓存，只重新解析新增或变化的文件
+        """
         logger.info("开始导入 CookLikeHOC 菜谱数据...")
         logger.info(f"项目路径: {self.project_path}")
         
@@ -315,29 +824,193 @@ class DataImporter:
             raise FileNotFoundError(f"项目路径不存在: {self.project_path}")
         
         # 发现所有菜谱文件
-        recipe_files = self.parser.discover_recipe_files()
+        with self._stage('discover'):
+            recipe_entries = self.parser.discover_recipe_entries()
+        recipe_files = [recipe_file.path for recipe_file in recipe_entries]
         self.import_stats['total_files'] = len(recipe_files)
         
-        # 解析每个文件
-        for file_path in recipe_files:
-            recipe = self.parser.parse_markdown_recipe(file_path)
-            
+        # 查询增量缓存
+        cache = ImportCache(cache_file, self.project_path) if cache_file else None
+        parsed_recipes = [None] * len(recipe_files)
+        pending_indexes = []
+        with self._stage('cache_lookup') if cache else nullcontext():
+            for index, recipe_file in enumerate(recipe_entries):
+                if cache:
+                    hit, recipe = cache.lookup(recipe_file.path, recipe_file.stat_key)
+                    if hit:
+                        parsed_recipes[index] = recipe
+                        continue
+                pending_indexes.append(index)
+        
+        if cache:
+            logger.info(f"导入缓存命中 {cache.hits} 个文件，需要解析 {cache.misses} 个文件")
+        
+        # 解析缓存未命中的文件
+        pending_files = [recipe_files[index] for index in pending_indexes]
+        with self._stage('parse'):
+            if workers > 1 and len(pending_files) > 1:
+                logger.info(f"使用 {workers} 个进程并行解析")
+                pending_sizes = [recipe_entries[index].size for index in pending_indexes]
+                fresh_recipes = self._parse_files_parallel(pending_files, workers, pending_sizes)
+            elif self.metrics:
+                fresh_recipes = [self._parse_file_timed(file_path) for file_path in pending_files]
+            else:
+                fresh_recipes = [self.parser.parse_markdown_recipe(file_path) for file_path in pending_files]
+        
+        if self.metrics:
+            self._flush_parse_timings(self.parser.timings)
+            self.parser.timings = _new_parse_timings()
+        
+        for index, recipe in zip(pending_indexes, fresh_recipes):
+            parsed_recipes[index] = recipe
+            if cache:
+                cache.store(recipe_files[index], recipe)
+        
+        if cache:
+            with self._stage('cache_save'):
+                cache.save(recipe_files)
+        
+        for recipe in parsed_recipes:
             if recipe:
                 self.recipes.append(recipe)
-                self.import_stats['successful'] += 1
-                
-                # 统计分类
-                category = recipe.category
-                if category not in self.import_stats['categories']:
-                    self.import_stats['categories'][category] = 0
-                self.import_stats['categories'][category] += 1
-                
-            else:
-                self.import_stats['failed'] += 1
+            self._record_result(recipe)
         
         logger.info(f"导入完成! 成功: {self.import_stats['successful']}, 失败: {self.import_stats['failed']}")
         return self.import_stats
     
+    def iter_parsed_recipes(self) -> Iterator[Recipe]:
+        """逐个解析并产出菜谱，同时更新 import_stats
+
+        菜谱不会保存到 self.recipes，配合流式导出可使内存占用保持平稳
+        """
+        if not os.path.exists(self.project_path):
+            raise FileNotFoundError(f"项目路径不存在: {self.project_path}")
+        
+        with self._stage('discover'):
+            recipe_files = self.parser.discover_recipe_files()
+        self.import_stats['total_files'] += len(recipe_files)
+        
+        for file_path in recipe_files:
+            if self.metrics:
+                recipe = self._parse_file_timed(file_path)
+            else:
+                recipe = self.parser.parse_markdown_recipe(file_path)
+            self._record_result(recipe)
+            if recipe:
+                yield recipe
+        
+        if self.metrics:
+            self._flush_parse_timings(self.parser.timings)
+            self.parser.timings = _new_parse_timings()
+    
+    def _record_result(self, recipe: Optional[Recipe]):
+        """更新导入统计"""
+        if recipe:
+            self.import_stats['successful'] += 1
+            
+            # 统计分类
+            category = recipe.category
+            if category not in self.import_stats['categories']:
+                self.import_stats['categories'][category] = 0
+            self.import_stats['categories'][category] += 1
+        else:
+            self.import_stats['failed'] += 1
+    
+    def _parse_file_timed(self, file_path: Path) -> Optional[Recipe]:
+        """解析单个文件并记录延迟与读取字节数"""
+        started = time.perf_counter()
+        recipe = self.parser.parse_markdown_recipe(file_path)
+        self.metrics.record_parse(file_path, time.perf_counter() - started, self._file_size(file_path))
+        return recipe
+    
+    def _flush_parse_timings(self, timings: Dict[str, float]):
+        """把解析器的分步耗时计入 parse.* 子阶段"""
+        for step, seconds in timings.items():
+            self.metrics.add_stage(f"parse.{step}", seconds)
+    
+    @staticmethod
+    def _file_size(file_path: Path) -> int:
+        try:
+            return file_path.stat().st_size
+        except OSError:
+            return 0
+    
+    def _parse_files_parallel(self, recipe_files: List[Path], workers: int,
+                              sizes: Optional[List[int]] = None) -> List[Optional[Recipe]]:
+        """按文件大小均衡分批后并行解析，返回与 recipe_files 顺序一致的结果
+
+        sizes 为发现阶段已取得的文件大小，未提供时逐个 stat
+        """
+        # 每个进程分配多个批次，避免个别大文件拖慢整体
+        batches = self._balance_by_size(recipe_files, workers * 4, sizes)
+        results = [None] * len(recipe_files)
+        timed = self.metrics is not None
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_parse_recipe_batch, str(self.project_path), batch, timed)
+                for batch in batches
+            ]
+            for future in futures:
+                batch_results, timings, worker_cpu = future.result()
+                for index, recipe, seconds in batch_results:
+                    # 反序列化得到的字符串不是驻留对象，需要重新驻留
+                    if recipe:
+                        recipe.intern_strings()
+                    results[index] = recipe
+                    if timed:
+                        file_path = recipe_files[index]
+                        self.metrics.record_parse(file_path, seconds, self._file_size(file_path))
+                
+                if timed:
+                    # 子进程的 CPU 时间不计入主进程的 process_time
+                    self.metrics.add_stage('parse.worker_cpu', 0.0, worker_cpu)
+                    self._flush_parse_timings(timings)
+        
+        return results
+    
+    @staticmethod
+    def _balance_by_size(recipe_files: List[Path], batch_count: int,
+                         sizes: Optional[List[int]] = None) -> List[List[Tuple[int, str]]]:
+        """按文件大小将文件分配到若干批次（最长处理时间优先的贪心策略）"""
+        sized_files = []
+        for index, file_path in enumerate(recipe_files):
+            if sizes is not None:
+                size = sizes[index]
+            else:
+                try:
+                    size = file_path.stat().st_size
+                except OSError:
+                    size = 0
+            sized_files.append((size, index, str(file_path)))
+        
+        # 从大到小依次放入当前总大小最小的批次；序号参与排序保证分批结果确定
+        sized_files.sort(key=lambda item: (-item[0], item[1]))
+        batch_count = max(1, min(batch_count, len(sized_files)))
+        heap = [(0, batch_id) for batch_id in range(batch_count)]
+        batches = [[] for _ in range(batch_count)]
+        
+        for size, index, file_path in sized_files:
+            load, batch_id = heapq.heappop(heap)
+            batches[batch_id].append((index, file_path))
+            heapq.heappush(heap, (load + size, batch_id))
+        
+        return [batch for batch in batches if batch]
+    
+    @classmethod
+    def from_json(cls, json_file: str, project_path: str = r"e:\UGit\CookLikeHOC",
+                  output_profile: str = "pretty", id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE) -> 'DataImporter':
+        """从 export_to_json 的输出恢复导入器，供不需要重新解析 Markdown 的后续步骤使用"""
+        importer = cls(project_path, output_profile=output_profile, id_map_file=id_map_file)
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        importer.recipes = [Recipe(**recipe) for recipe in data['recipes']]
+        for recipe in importer.recipes:
+            importer._record_result(recipe)
+        importer.import_stats['total_files'] = len(importer.recipes)
+        return importer
+
+    @timed_stage('export_json')
     def export_to_json(self, output_file: str = "cooklikehoc_recipes.json") -> str:
         """导出为 JSON 格式"""
         recipes_data = {
@@ -350,41 +1023,199 @@ class DataImporter:
             'recipes': [asdict(recipe) for recipe in self.recipes]
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(recipes_data, f, ensure_ascii=False, indent=2)
+        for written_file in write_json(output_file, recipes_data, self.output_profile):
+            self._record_write(written_file)
         
         logger.info(f"数据已导出到: {output_file}")
         return output_file
     
-    def export_to_android_assets(self, output_dir: str = "android_assets") -> str:
-        """导出为 Android Assets 格式"""
+    @timed_stage('export_json_stream')
+    def export_to_json_stream(self, output_file: str = "cooklikehoc_recipes.json",
+                              recipes: Optional[Iterable[Recipe]] = None) -> str:
+        """流式导出为 JSON 格式
+
+        逐个写出菜谱而不构建完整的数据结构；recipes 可以是 iter_parsed_recipes()
+        这样的生成器，边解析边写出。元数据依赖全部菜谱，因此写在 recipes 之后
+        """
+        if recipes is None:
+            recipes = self.recipes
+        
+        total_recipes = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write('{\n  "recipes": [')
+            for recipe in recipes:
+                recipe_json = json.dumps(asdict(recipe), ensure_ascii=False, indent=2)
+                f.write(',\n    ' if total_recipes else '\n    ')
+                f.write(recipe_json.replace('\n', '\n    '))
+                total_recipes += 1
+            f.write('\n  ],\n' if total_recipes else '],\n')
+            
+            metadata = {
+                'source': 'CookLikeHOC',
+                'import_time': datetime.now().isoformat(),
+                'total_recipes': total_recipes,
+                'categories': list(self.import_stats['categories'].keys())
+            }
+            metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2)
+            f.write('  "metadata": ' + metadata_json.replace('\n', '\n  ') + '\n}')
+        self._record_write(output_file)
+        
+        logger.info(f"数据已流式导出到: {output_file} ({total_recipes} 个菜谱)")
+        return output_file
+    
+    @timed_stage('export_ndjson')
+    def export_to_ndjson(self, output_file: str = "cooklikehoc_recipes.ndjson",
+                         recipes: Optional[Iterable[Recipe]] = None) -> str:
+        """导出为 NDJSON 格式，每行一个菜谱，下游可边写边读"""
+        if recipes is None:
+            recipes = self.recipes
+        
+        total_recipes = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for recipe in recipes:
+                f.write(json.dumps(asdict(recipe), ensure_ascii=False))
+                f.write('\n')
+                total_recipes += 1
+        self._record_write(output_file)
+        
+        logger.info(f"数据已导出到: {output_file} ({total_recipes} 个菜谱)")
+        return output_file
+    
+    @timed_stage('export_binary')
+    def export_to_binary(self, output_file: str = "cooklikehoc_recipes.bin") -> str:
+        """导出为可随机访问的二进制格式，格式见 BINARY_MAGIC 处的说明，读取使用 RecipeBinaryReader"""
+        field_names = [recipe_field.name for recipe_field in fields(Recipe)]
+        
+        category_indices: Dict[str, List[int]] = {}
+        for index, recipe in enumerate(self.recipes):
+            category_indices.setdefault(recipe.category, []).append(index)
+        
+        recipe_ids = self.recipe_ids()
+        records = bytearray()
+        offsets = {}
+        categories = {}
+        for category, indices in category_indices.items():
+            start = len(records)
+            for index in indices:
+                recipe = self.recipes[index]
+                payload = json.dumps(
+                    [getattr(recipe, name) for name in field_names], ensure_ascii=False, separators=(',', ':')
+                ).encode('utf-8')
+                offsets[recipe_ids[index]] = len(records)
+                records += BINARY_UINT.pack(len(payload))
+                records += payload
+            categories[category] = [start, len(records), len(indices)]
+        
+        if len(records) > 0xFFFFFFFF:
+            raise ValueError(f"记录区超过 4GB，无法写入 32 位偏移表: {len(records)} 字节")
+        
+        metadata = json.dumps(
+            {'fields': field_names, 'categories': categories}, ensure_ascii=False, separators=(',', ':')
+        ).encode('utf-8')
+        
+        temp_file = f"{output_file}.tmp"
+        with open(temp_file, 'wb') as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(self.recipes), len(metadata)))
+            f.write(metadata)
+            for recipe_id in sorted(offsets):
+                f.write(BINARY_OFFSET_ENTRY.pack(recipe_id, offsets[recipe_id]))
+            f.write(records)
+        os.replace(temp_file, output_file)
+        self._record_write(output_file)
+        
+        logger.info(f"数据已导出到: {output_file} ({len(self.recipes)} 个菜谱, {len(categories)} 个分类)")
+        return output_file
+    
+    @timed_stage('export_android_assets')
+    def export_to_android_assets(self, output_dir: str = "android_assets", workers: int = 4) -> str:
+        """导出为 Android Assets 格式
+
+        分类文件由线程池并发写出；内容与现有文件一致的文件不会被改写，
+        以免无谓地使 Gradle 的 assets 合并缓存失效
+        """
         os.makedirs(output_dir, exist_ok=True)
+        groups = self._group_by_category()
+        group_ids = self._group_ids_by_category(self.recipe_ids())
         
         # 按分类导出
-        for category, recipes in self._group_by_category().items():
-            category_file = os.path.join(output_dir, f"{category}_recipes.json")
-            category_data = {
-                'category': category,
-                'count': len(recipes),
-                'recipes': [asdict(recipe) for recipe in recipes]
-            }
-            
-            with open(category_file, 'w', encoding='utf-8') as f:
-                json.dump(category_data, f, ensure_ascii=False, indent=2)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = list(executor.map(
+                lambda item: self.write_category_file(output_dir, item[0], item[1], group_ids[item[0]]),
+                groups.items()
+            ))
         
         # 创建索引文件
+        results.append(self.write_index_file(output_dir, groups))
+        
+        written = sum(1 for result in results if result)
+        logger.info(f"Android Assets 已导出到: {output_dir} (写入 {written} 个文件, 未变化跳过 {len(results) - written} 个)")
+        return output_dir
+    
+    def write_category_file(self, output_dir: str, category: str, recipes: List[Recipe], recipe_ids: List[int],
+                            profile: Optional[OutputProfile] = None) -> Optional[str]:
+        """写出单个分类的 {category}_recipes.json，内容未变化时跳过并返回 None
+
+        recipe_ids 为与 recipes 对应的稳定 ID，写入每个菜谱的 id 字段（应用导入时直接作为 Room 主键）；
+        profile 为输出配置，默认使用导入器的 output_profile
+        """
+        category_file = os.path.join(output_dir, f"{category}_recipes.json")
+        category_data = {
+            'category': category,
+            'count': len(recipes),
+            'recipes': [{'id': recipe_id, **asdict(recipe)} for recipe_id, recipe in zip(recipe_ids, recipes)]
+        }
+        
+        return category_file if self._write_json_if_changed(category_file, category_data, profile) else None
+    
+    def write_index_file(self, output_dir: str, groups: Dict[str, List[Recipe]]) -> Optional[str]:
+        """写出 recipes_index.json，内容未变化时跳过并返回 None"""
         index_file = os.path.join(output_dir, "recipes_index.json")
         index_data = {
-            'total_recipes': len(self.recipes),
-            'categories': {cat: len(recipes) for cat, recipes in self._group_by_category().items()},
-            'files': [f"{cat}_recipes.json" for cat in self._group_by_category().keys()]
+            'total_recipes': sum(len(recipes) for recipes in groups.values()),
+            'categories': {cat: len(recipes) for cat, recipes in groups.items()},
+            'files': [f"{cat}_recipes.json" for cat in groups.keys()]
         }
         
-        with open(index_file, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, ensure_ascii=False, indent=2)
+        return index_file if self._write_json_if_changed(index_file, index_data) else None
+    
+    def _write_json_if_changed(self, output_file: str, data: Dict, profile: Optional[OutputProfile] = None) -> bool:
+        """按输出配置序列化后与现有文件比较内容哈希，不同时经临时文件原子替换写出
+
+        压缩版本随主文件一起写出；主文件未变化时只补写缺失的压缩版本
+        """
+        profile = profile or self.output_profile
+        payload = profile.encode(data)
+        new_hash = hashlib.sha256(payload).digest()
         
-        logger.info(f"Android Assets 已导出到: {output_dir}")
-        return output_dir
+        unchanged = False
+        if os.path.exists(output_file):
+            try:
+                with open(output_file, 'rb') as f:
+                    unchanged = hashlib.sha256(f.read()).digest() == new_hash
+            except OSError:
+                pass
+        
+        remove_stale_variants(output_file, profile)
+        missing = [suffix for suffix in profile.variant_suffixes()
+                   if not os.path.exists(output_file + suffix)]
+        if unchanged and not missing:
+            return False
+        
+        if not unchanged:
+            write_bytes_atomic(output_file, payload)
+            self._record_write(output_file)
+        for suffix, blob in profile.variants(payload):
+            if not unchanged or suffix in missing:
+                write_bytes_atomic(output_file + suffix, blob)
+                self._record_write(output_file + suffix)
+        return True
+    
+    def _group_ids_by_category(self, recipe_ids: List[int]) -> Dict[str, List[int]]:
+        """按分类分组菜谱 ID，顺序与 _group_by_category 一致"""
+        groups = {}
+        for recipe, recipe_id in zip(self.recipes, recipe_ids):
+            groups.setdefault(recipe.category, []).append(recipe_id)
+        return groups
     
     def _group_by_category(self) -> Dict[str, List[Recipe]]:
         """按分类分组菜谱"""
@@ -415,7 +1246,45 @@ class DataImporter:
         for i, recipe in enumerate(self.recipes[:5]):
             print(f"  {i+1}. {recipe.title} ({recipe.category})")
         
+        if self.metrics:
+            self._print_metrics_summary()
+        
         print("="*60)
+    
+    def _print_metrics_summary(self):
+        """打印性能指标摘要"""
+        metrics = self.metrics
+        print("\n⏱️ 阶段耗时:")
+        for name, stage in metrics.stages.items():
+            # parse.* 子阶段只统计墙钟时间
+            cpu_text = f", CPU {stage['cpu_seconds']:.3f}s" if stage['cpu_seconds'] else ""
+            print(f"  {name}: 墙钟 {stage['wall_seconds']:.3f}s{cpu_text}")
+        
+        if metrics.parse_count:
+            average_ms = metrics.parse_seconds / metrics.parse_count * 1000
+            print(f"\n📄 单文件解析: {metrics.parse_count} 个, 平均 {average_ms:.2f}ms")
+            print("  最慢文件:")
+            for file_path, seconds in metrics.slowest_files():
+                print(f"    {seconds * 1000:.2f}ms  {file_path}")
+        
+        print(f"\n💾 读取 {metrics.bytes_read:,} 字节, 写出 {metrics.bytes_written:,} 字节")
+    
+    def export_metrics(self, json_file: str = "import_metrics.json",
+                       openmetrics_file: Optional[str] = "import_metrics.prom") -> Optional[str]:
+        """导出性能指标为 JSON，并可同时写出 OpenMetrics 文本文件"""
+        if not self.metrics:
+            logger.warning("未启用性能指标，跳过导出")
+            return None
+        
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(self.metrics.to_dict(), f, ensure_ascii=False, indent=2)
+        
+        if openmetrics_file:
+            with open(openmetrics_file, 'w', encoding='utf-8') as f:
+                f.write(self.metrics.to_openmetrics())
+        
+        logger.info(f"性能指标已导出到: {json_file}")
+        return json_file
 
 def main():
     """主函数"""
@@ -424,7 +1293,7 @@ def main():
         importer = DataImporter()
         
         # 导入所有菜谱
-        stats = importer.import_all_recipes()
+        stats = importer.import_all_recipes(cache_file="import_cache.json")
         
         # 打印摘要
         importer.print_import_summary()
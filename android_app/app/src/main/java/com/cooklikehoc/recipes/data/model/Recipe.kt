@@ -122,7 +122,10 @@ data class ImportMetadata(
 data class CategoryRecipeData(
     val category: String,
     val count: Int,
-    val recipes: List<Recipe>
+    val recipes: List<Recipe> = emptyList(),
+    // 内容寻址布局（prepare_recipe_data.py --layout store）下只包含指向 store/ 的路径
+    @SerializedName("recipe_blobs")
+    val recipeBlobs: List<String>? = null
 )
 
 // 用于统计的数据类
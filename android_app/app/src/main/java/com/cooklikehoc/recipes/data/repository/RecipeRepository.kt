@@ -159,7 +159,7 @@ class RecipeRepositoryImpl @Inject constructor(
                     val categoryData = gson.fromJson(fileContent, CategoryRecipeData::class.java)
                     
                     // 为每个菜谱设置时间戳
-                    val recipesWithTimestamp = categoryData.recipes.map { recipe ->
+                    val recipesWithTimestamp = resolveCategoryRecipes(categoryData).map { recipe ->
                         recipe.copy(
                             createdAt = Date(),
                             updatedAt = Date()
@@ -237,6 +237,23 @@ class RecipeRepositoryImpl @Inject constructor(
         }
     }
     
+    // 内容寻址布局下分类文件只记录内容块路径，菜谱正文从 store/ 中逐个读取；
+    // 内容块不含时间戳，这里补上
+    private fun resolveCategoryRecipes(categoryData: CategoryRecipeData): List<Recipe> {
+        val blobs = categoryData.recipeBlobs
+        if (blobs.isNullOrEmpty()) {
+            return categoryData.recipes
+        }
+        return blobs.map { blobPath ->
+            val blobContent = context.assets.open(blobPath)
+                .bufferedReader().use { it.readText() }
+            gson.fromJson(blobContent, Recipe::class.java).copy(
+                createdAt = Date(),
+                updatedAt = Date()
+            )
+        }
+    }
+    
     private fun getCategoryDisplayName(category: String): String {
         return when (category) {
             "staple" -> "主食"
@@ -267,7 +284,7 @@ class RecipeRepositoryImpl @Inject constructor(
             val categoryData = gson.fromJson(fileContent, CategoryRecipeData::class.java)
             
             // 返回配料数据，不需要时间戳
-            categoryData.recipes
+            resolveCategoryRecipes(categoryData)
         } catch (e: Exception) {
             android.util.Log.e("RecipeRepository", "读取配料数据失败: ${e.message}")
             emptyList()
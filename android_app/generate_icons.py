@@ -2,32 +2,57 @@
 """
 CookLikeHOC App Icon Generator
 生成Android应用所需的各种尺寸图标
+
+图标只在 MASTER_SIZE 下绘制一次，各尺寸由主图缩放得到并行编码；
+绘制参数与本脚本均未变化且输出文件完好时跳过生成
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ThreadPoolExecutor
 import os
+import io
+import sys
+import json
 import math
+import hashlib
+import argparse
+
+# 主图尺寸：最大输出 512px 的两倍，缩小后边缘自然抗锯齿
+MASTER_SIZE = 1024
+
+# Android图标尺寸配置
+ICON_SIZES = {
+    'mipmap-mdpi': 48,
+    'mipmap-hdpi': 72,
+    'mipmap-xhdpi': 96,
+    'mipmap-xxhdpi': 144,
+    'mipmap-xxxhdpi': 192
+}
+
+# 额外生成到当前目录的常用尺寸
+EXTRA_SIZES = [48, 72, 96, 144, 192, 512]
+
+# 背景渐变色（橙红到黄色）
+GRADIENT_TOP = (255, 107, 53)
+GRADIENT_BOTTOM = (255, 210, 63)
+
+ICON_CACHE_FILE = '.icon_cache.json'
+
+def gradient_background(size):
+    """生成纵向渐变背景：对线性灰度渐变按通道查表，一次得到整幅渐变"""
+    ramp = Image.linear_gradient('L').resize((size, size), Image.BILINEAR)
+    return Image.merge('RGB', [
+        ramp.point(lambda v, top=top, bottom=bottom: int(top * (1 - v / 255) + bottom * v / 255))
+        for top, bottom in zip(GRADIENT_TOP, GRADIENT_BOTTOM)
+    ]).convert('RGBA')
 
 def create_icon(size):
     """创建指定尺寸的应用图标"""
-    # 创建画布
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # 背景渐变色（橙红到黄色）
     # 创建圆角矩形背景
     radius = int(size * 0.2)
     
     # 绘制渐变背景
-    for y in range(size):
-        # 计算渐变颜色
-        ratio = y / size
-        r = int(255 * (1 - ratio) + 255 * ratio)  # 255 to 255
-        g = int(107 * (1 - ratio) + 210 * ratio)  # 107 to 210  
-        b = int(53 * (1 - ratio) + 63 * ratio)   # 53 to 63
-        
-        color = (r, g, b, 255)
-        draw.line([(0, y), (size, y)], fill=color)
+    img = gradient_background(size)
     
     # 创建圆角蒙版
     mask = Image.new('L', (size, size), 0)
@@ -134,52 +159,93 @@ def draw_star(draw, x, y, size, color):
     
     draw.polygon(points, fill=color)
 
-def create_all_icons():
-    """创建所有尺寸的图标"""
-    # Android图标尺寸配置
-    icon_sizes = {
-        'mipmap-mdpi': 48,
-        'mipmap-hdpi': 72,
-        'mipmap-xhdpi': 96,
-        'mipmap-xxhdpi': 144,
-        'mipmap-xxxhdpi': 192
-    }
-    
-    # 创建输出目录
-    base_path = 'app/src/main/res'
-    
-    for folder, size in icon_sizes.items():
-        # 创建目录
+def resample_icon(master, size):
+    """把主图缩放到指定尺寸并编码为 PNG 字节"""
+    # 在预乘 alpha 下缩放，避免透明圆角边缘出现暗边
+    icon = master.convert('RGBa').resize((size, size), Image.LANCZOS).convert('RGBA')
+    buffer = io.BytesIO()
+    icon.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+def icon_outputs(base_path='app/src/main/res', extra_dir='.'):
+    """返回 {输出文件: 尺寸}；ic_launcher 与 ic_launcher_round 使用同一张图"""
+    outputs = {}
+    for folder, size in ICON_SIZES.items():
         folder_path = os.path.join(base_path, folder)
-        os.makedirs(folder_path, exist_ok=True)
-        
-        # 生成图标
-        icon = create_icon(size)
-        
-        # 保存图标
-        icon_path = os.path.join(folder_path, 'ic_launcher.png')
-        icon.save(icon_path, 'PNG')
-        
-        # 同时保存为圆形图标（适配版本）
-        icon_round_path = os.path.join(folder_path, 'ic_launcher_round.png')
-        icon.save(icon_round_path, 'PNG')
-        
-        print(f"Generated: {icon_path} ({size}x{size})")
-        print(f"Generated: {icon_round_path} ({size}x{size})")
+        outputs[os.path.join(folder_path, 'ic_launcher.png')] = size
+        outputs[os.path.join(folder_path, 'ic_launcher_round.png')] = size
+    for size in EXTRA_SIZES:
+        outputs[os.path.join(extra_dir, f'ic_launcher_{size}x{size}.png')] = size
+    return outputs
+
+def _file_sha256(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def render_fingerprint():
+    """绘制参数与本脚本内容的哈希，任一变化都需要重新生成"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        source = f.read()
+    params = json.dumps({
+        'master_size': MASTER_SIZE,
+        'icon_sizes': ICON_SIZES,
+        'extra_sizes': EXTRA_SIZES,
+        'gradient': [GRADIENT_TOP, GRADIENT_BOTTOM]
+    }, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(source + params).hexdigest()
+
+def _is_up_to_date(cache_file, fingerprint, outputs):
+    """指纹一致且输出文件都存在、内容未被改动时无需重新生成"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if cache.get('fingerprint') != fingerprint or set(cache.get('outputs', {})) != set(outputs):
+        return False
+    return all(
+        os.path.exists(path) and _file_sha256(path) == digest
+        for path, digest in cache['outputs'].items()
+    )
+
+def create_all_icons(base_path='app/src/main/res', extra_dir='.', force=False, workers=None,
+                     cache_file=ICON_CACHE_FILE):
+    """创建所有尺寸的图标，返回是否实际重新生成"""
+    outputs = icon_outputs(base_path, extra_dir)
+    fingerprint = render_fingerprint()
+    if not force and _is_up_to_date(cache_file, fingerprint, outputs):
+        print("⏭️ 图标参数未变化，跳过生成（使用 --force 强制重新生成）")
+        return False
+    
+    # 只绘制一次主图，各尺寸并行缩放与编码，每个尺寸只编码一次
+    master = create_icon(MASTER_SIZE)
+    sizes = sorted(set(outputs.values()))
+    with ThreadPoolExecutor(max_workers=workers or min(len(sizes), os.cpu_count() or 1)) as executor:
+        encoded = dict(zip(sizes, executor.map(lambda size: resample_icon(master, size), sizes)))
     
-    # 额外生成一些常用尺寸到当前目录
-    extra_sizes = [48, 72, 96, 144, 192, 512]
-    for size in extra_sizes:
-        icon = create_icon(size)
-        icon.save(f'ic_launcher_{size}x{size}.png', 'PNG')
-        print(f"Generated: ic_launcher_{size}x{size}.png")
+    digests = {}
+    for path, size in outputs.items():
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(encoded[size])
+        digests[path] = hashlib.sha256(encoded[size]).hexdigest()
+        print(f"Generated: {path} ({size}x{size})")
+    
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({'fingerprint': fingerprint, 'outputs': digests}, f, indent=2)
+    return True
 
 if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="生成 Android 应用图标")
+    arg_parser.add_argument("--force", action="store_true", help="忽略缓存强制重新生成")
+    arg_parser.add_argument("--workers", type=int, help="并行缩放的线程数")
+    args = arg_parser.parse_args()
+    
     print("CookLikeHOC App Icon Generator")
     print("=" * 40)
     
     try:
-        create_all_icons()
+        create_all_icons(force=args.force, workers=args.workers)
         print("\n✅ 所有图标生成完成！")
         print("\n使用说明：")
         print("1. 图标已自动放置到正确的Android资源目录")
@@ -188,4 +254,5 @@ if __name__ == '__main__':
         
     except Exception as e:
         print(f"❌ 生成图标时出错: {e}")
-        print("请确保已安装 Pillow 库: pip install Pillow")
\ No newline at end of file
+        print("请确保已安装 Pillow 库: pip install Pillow")
+        sys.exit(1)
@@ -6,80 +6,199 @@ CookLikeHOC Recipe Data Preparation
 
 import json
 import os
+import sys
 import shutil
+import argparse
 from datetime import datetime
 
-def load_category_recipes(category_file):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asset_output import GZIP_SUFFIX, ZSTD_SUFFIX, OUTPUT_PROFILES, get_output_profile, print_size_report, write_json
+from copy_assets import SyncStats, sync_file
+from asset_store import MANIFEST_FILE, STORE_DIR, build_asset_store, verify_asset_store
+from image_metadata import METADATA_FILE, build_image_metadata
+from recipe_ids import ID_MAP_FILE, RecipeIdMap
+
+# 分类 id 对应的中文名称
+CATEGORY_DISPLAY_NAMES = {
+    "staple": "主食",
+    "stir_fry": "炒菜", 
+    "stew": "炖菜",
+    "steam": "蒸菜",
+    "grill": "烤类",
+    "fried": "炸品",
+    "cold_dish": "凉拌",
+    "braised": "卤菜",
+    "breakfast": "早餐",
+    "soup": "汤",
+    "blanched": "烫菜",
+    "casserole": "砂锅菜",
+    "hot_pot": "煮锅",
+    "beverage": "饮品",
+    "seasoning": "配料"
+}
+
+def load_category_recipes(category_file, source_dir="../android_assets"):
     """加载单个分类的菜谱数据"""
     try:
-        with open(f'../android_assets/{category_file}', 'r', encoding='utf-8') as f:
+        with open(os.path.join(source_dir, category_file), 'r', encoding='utf-8') as f:
             data = json.load(f)
             return data.get('recipes', [])
     except Exception as e:
         print(f"加载 {category_file} 失败: {e}")
         return []
 
-def prepare_recipe_data():
-    """准备菜谱数据"""
+def load_published_recipes(recipes_file):
+    """读取已发布的合并菜谱文件，用于首次生成 ID 映射时沿用其中的 ID"""
+    try:
+        with open(recipes_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    # 内容寻址布局下合并文件只是索引，没有标题与分类
+    return data if isinstance(data, list) else []
+
+def load_id_map(id_map_file, assets_dir="app/src/main/assets"):
+    """打开 ID 映射；映射为空（首次运行）时沿用 assets_dir 中已发布数据的 ID，之后只为新菜谱分配"""
+    id_map = RecipeIdMap(id_map_file)
+    if not id_map.ids:
+        seeded = id_map.seed(load_published_recipes(os.path.join(assets_dir, "cooklikehoc_recipes.json")))
+        if seeded:
+            print(f"🔖 从已发布数据沿用 {seeded} 个菜谱 ID")
+    return id_map
+
+def _recipe_value(recipe, name, default):
+    """同时支持分类文件中的菜谱字典与 DataImporter 的 Recipe 对象"""
+    if isinstance(recipe, dict):
+        return recipe.get(name, default)
+    return getattr(recipe, name, default)
+
+def prepare_recipe_data(profile="pretty", layout="copies", id_map_file=ID_MAP_FILE,
+                        source_dir="../android_assets", assets_dir="app/src/main/assets"):
+    """从 export_to_android_assets 写出的分类文件准备菜谱数据
+
+    profile 为 asset_output.OUTPUT_PROFILES 中的输出配置；
+    layout 为 "copies" 时写出完整的合并文件并复制分类文件，
+    为 "store" 时改用 asset_store 的内容寻址布局，菜谱正文只保存一次；
+    菜谱 ID 由 recipe_ids 根据分类与标题分配，并持久化在 id_map_file 中；
+    source_dir 为 DataImporter 导出的分类文件目录，assets_dir 为 Android assets 目录，
+    成功时返回写出的文件列表，失败时返回 None。
+    与 DataImporter 在同一进程中时改用 prepare_from_importer，省去分类文件的读取与解析
+    """
+    profile = get_output_profile(profile)
     print("CookLikeHOC Recipe Data Preparation")
     print("=" * 50)
     
     # 读取索引文件
     try:
-        with open('../android_assets/recipes_index.json', 'r', encoding='utf-8') as f:
+        with open(os.path.join(source_dir, 'recipes_index.json'), 'r', encoding='utf-8') as f:
             index_data = json.load(f)
     except Exception as e:
         print(f"读取索引文件失败: {e}")
-        return
+        return None
+    
+    # 加载分类菜谱
+    groups = {
+        category_id: load_category_recipes(f"{category_id}_recipes.json", source_dir)
+        for category_id in index_data['categories']
+    }
+    
+    def copy_category_files(category_assets_dir, category_ids):
+        output_files = []
+        copy_stats = SyncStats()
+        for category_id, recipes in groups.items():
+            category_file = f"{category_id}_recipes.json"
+            src_file = os.path.join(source_dir, category_file)
+            dst_file = os.path.join(category_assets_dir, category_file)
+            if [recipe.get('id') for recipe in recipes] != category_ids[category_id]:
+                # 源文件缺少 id 或与 ID 映射不一致（旧导出或使用了其他映射文件）时按映射重写
+                category_data = {
+                    'category': category_id,
+                    'count': len(recipes),
+                    'recipes': [{'id': recipe_id, **{name: value for name, value in recipe.items() if name != 'id'}}
+                                for recipe_id, recipe in zip(category_ids[category_id], recipes)]
+                }
+                write_json(dst_file, category_data, profile)
+                print(f"✅ 按 ID 映射重写分类文件: {category_file}")
+                output_files.append(dst_file)
+            elif os.path.exists(src_file):
+                if sync_file(src_file, dst_file, copy_stats):
+                    print(f"✅ 复制分类文件: {category_file}")
+                output_files.append(dst_file)
+            # 同时复制导入时按输出配置生成的压缩版本，源中已不存在的旧版本一并删除
+            for suffix in (GZIP_SUFFIX, ZSTD_SUFFIX):
+                if os.path.exists(src_file + suffix):
+                    sync_file(src_file + suffix, dst_file + suffix, copy_stats)
+                elif os.path.exists(dst_file + suffix):
+                    os.remove(dst_file + suffix)
+                    copy_stats.removed_files += 1
+        print(f"📊 分类文件: {copy_stats.summary()}")
+        return output_files
+    
+    return _prepare_app_data(groups, profile, layout, id_map_file, assets_dir, copy_category_files)
+
+def prepare_from_importer(importer, layout="copies", id_map_file=ID_MAP_FILE,
+                          assets_dir="app/src/main/assets", profile=None):
+    """直接使用同一进程中 DataImporter.recipes 准备菜谱数据
+
+    不读取 export_to_android_assets 写出的文件；完整副本布局下分类文件由
+    importer.write_category_file 直接写入 assets（内容未变化时跳过）。
+    profile 默认沿用导入器的输出配置，返回值同 prepare_recipe_data
+    """
+    profile = get_output_profile(profile or importer.output_profile)
+    print("CookLikeHOC Recipe Data Preparation")
+    print("=" * 50)
     
+    groups = {}
+    for recipe in importer.recipes:
+        groups.setdefault(recipe.category, []).append(recipe)
+    
+    def write_category_files(category_assets_dir, category_ids):
+        output_files = []
+        for category_id, recipes in groups.items():
+            if importer.write_category_file(category_assets_dir, category_id, recipes,
+                                            category_ids[category_id], profile):
+                print(f"✅ 写出分类文件: {category_id}_recipes.json")
+            output_files.append(os.path.join(category_assets_dir, f"{category_id}_recipes.json"))
+        return output_files
+    
+    return _prepare_app_data(groups, profile, layout, id_map_file, assets_dir, write_category_files)
+
+def _prepare_app_data(groups, profile, layout, id_map_file, assets_dir, write_category_files):
+    """由 {分类: 菜谱列表} 一次生成合并菜谱、分类与元数据文件
+
+    write_category_files(分类目录, {分类: 菜谱 ID 列表}) 在完整副本布局下放置带 id 的分类文件并返回文件列表
+    """
     # 合并所有菜谱数据
     all_recipes = []
     categories_data = []
+    category_ids = {}
     
-    category_mapping = {
-        "staple": "主食",
-        "stir_fry": "炒菜", 
-        "stew": "炖菜",
-        "steam": "蒸菜",
-        "grill": "烤类",
-        "fried": "炸品",
-        "cold_dish": "凉拌",
-        "braised": "卤菜",
-        "breakfast": "早餐",
-        "soup": "汤",
-        "blanched": "烫菜",
-        "casserole": "砂锅菜",
-        "hot_pot": "煮锅",
-        "beverage": "饮品",
-        "seasoning": "配料"
-    }
-    
-    recipe_id = 1
+    # 稳定 ID：首次运行时沿用已发布数据中的 ID，之后只为新菜谱分配
+    recipes_file = os.path.join(assets_dir, "cooklikehoc_recipes.json")
+    id_map = load_id_map(id_map_file, assets_dir)
     
-    for category_id, count in index_data['categories'].items():
+    for category_id, recipes in groups.items():
         category_file = f"{category_id}_recipes.json"
-        print(f"处理分类: {category_mapping.get(category_id, category_id)} ({count}个菜谱)")
-        
-        # 加载分类菜谱
-        recipes = load_category_recipes(category_file)
+        print(f"处理分类: {CATEGORY_DISPLAY_NAMES.get(category_id, category_id)} ({len(recipes)}个菜谱)")
         
         # 处理每个菜谱
         processed_recipes = []
         for recipe in recipes:
+            title = _recipe_value(recipe, "title", "")
             # 添加ID和标准化数据
             processed_recipe = {
-                "id": recipe_id,
-                "title": recipe.get("title", ""),
+                "id": id_map.assign(category_id, title),
+                "title": title,
                 "category": category_id,
-                "description": recipe.get("description", ""),
-                "difficulty": recipe.get("difficulty", "未知"),
-                "cooking_time": recipe.get("cooking_time", 0),
-                "servings": recipe.get("servings", 1),
-                "ingredients": recipe.get("ingredients", []),
-                "instructions": recipe.get("instructions", []),
-                "tips": recipe.get("tips", ""),
-                "nutrition": recipe.get("nutrition", ""),
-                "image_path": recipe.get("image_path", ""),
+                "description": _recipe_value(recipe, "description", ""),
+                "difficulty": _recipe_value(recipe, "difficulty", "未知"),
+                "cooking_time": _recipe_value(recipe, "cooking_time", 0),
+                "servings": _recipe_value(recipe, "servings", 1),
+                "ingredients": _recipe_value(recipe, "ingredients", []),
+                "instructions": _recipe_value(recipe, "instructions", []),
+                "tips": _recipe_value(recipe, "tips", ""),
+                "nutrition": _recipe_value(recipe, "nutrition", ""),
+                "image_path": _recipe_value(recipe, "image_path", ""),
                 "source_file": category_file,
                 "is_favorite": False,
                 "rating": 0.0,
@@ -88,14 +207,15 @@ def prepare_recipe_data():
             }
             processed_recipes.append(processed_recipe)
             all_recipes.append(processed_recipe)
-            recipe_id += 1
+        
+        category_ids[category_id] = [recipe["id"] for recipe in processed_recipes]
         
         # 创建分类数据
         category_data = {
             "id": category_id,
             "name": category_id,
-            "display_name": category_mapping.get(category_id, category_id),
-            "description": f"{category_mapping.get(category_id, category_id)}类菜品",
+            "display_name": CATEGORY_DISPLAY_NAMES.get(category_id, category_id),
+            "description": f"{CATEGORY_DISPLAY_NAMES.get(category_id, category_id)}类菜品",
             "icon": "",
             "sort_order": len(categories_data),
             "recipe_count": len(processed_recipes)
@@ -105,20 +225,24 @@ def prepare_recipe_data():
     print(f"\n总计处理: {len(all_recipes)} 个菜谱")
     print(f"分类数量: {len(categories_data)} 个")
     
+    new_ids = id_map.added
+    if id_map.save():
+        print(f"🔖 ID 映射已更新: {id_map_file} (新增 {new_ids} 个)")
+    retired = id_map.retired_keys()
+    if retired:
+        print(f"   {len(retired)} 个已删除菜谱的 ID 继续保留，不会分配给其他菜谱")
+    
     # 创建assets目录
-    assets_dir = "app/src/main/assets"
     os.makedirs(assets_dir, exist_ok=True)
     
-    # 保存合并的菜谱数据
-    recipes_file = os.path.join(assets_dir, "cooklikehoc_recipes.json")
-    with open(recipes_file, 'w', encoding='utf-8') as f:
-        json.dump(all_recipes, f, ensure_ascii=False, indent=2)
-    print(f"✅ 保存菜谱数据: {recipes_file}")
+    # 保存合并的菜谱数据（内容寻址布局下由 build_asset_store 写出索引视图）
+    if layout == "copies":
+        write_json(recipes_file, all_recipes, profile)
+        print(f"✅ 保存菜谱数据: {recipes_file}")
     
     # 保存分类数据
     categories_file = os.path.join(assets_dir, "categories.json")
-    with open(categories_file, 'w', encoding='utf-8') as f:
-        json.dump(categories_data, f, ensure_ascii=False, indent=2)
+    write_json(categories_file, categories_data, profile)
     print(f"✅ 保存分类数据: {categories_file}")
     
     # 保存元数据
@@ -127,32 +251,68 @@ def prepare_recipe_data():
         "import_time": datetime.now().isoformat(),
         "total_recipes": len(all_recipes),
         "total_categories": len(categories_data),
-        "categories": list(index_data['categories'].keys()),
+        "categories": list(groups),
         "version": "1.0.0"
     }
     
     metadata_file = os.path.join(assets_dir, "metadata.json")
-    with open(metadata_file, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    write_json(metadata_file, metadata, profile)
     print(f"✅ 保存元数据: {metadata_file}")
     
-    # 复制分类文件到assets（可选，用于按需加载）
+    # 分类文件目录（可选，用于按需加载）
     category_assets_dir = os.path.join(assets_dir, "categories")
     os.makedirs(category_assets_dir, exist_ok=True)
     
-    for category_file in index_data['files']:
-        src_file = f"../android_assets/{category_file}"
-        dst_file = os.path.join(category_assets_dir, category_file)
-        if os.path.exists(src_file):
-            shutil.copy2(src_file, dst_file)
-            print(f"✅ 复制分类文件: {category_file}")
+    output_files = [recipes_file, categories_file, metadata_file]
+    
+    # 图片尺寸与占位符清单，按图片内容哈希缓存
+    build_image_metadata(all_recipes, assets_dir)
+    output_files.append(os.path.join(assets_dir, METADATA_FILE))
+    
+    if layout == "store":
+        manifest = build_asset_store(all_recipes, assets_dir, profile, metadata)
+        output_files.append(os.path.join(assets_dir, MANIFEST_FILE))
+        output_files += [os.path.join(category_assets_dir, f"{category_id}_recipes.json")
+                         for category_id in manifest['categories']]
+        print(f"✅ 内容寻址存储: {len(manifest['blobs'])} 个内容块, {len(manifest['recipes'])} 个菜谱")
+        
+        # copy_assets.py 复制的 android_assets/ 副本应用并不读取，这里一并移除
+        legacy_copy_dir = os.path.join(assets_dir, "android_assets")
+        if os.path.isdir(legacy_copy_dir):
+            shutil.rmtree(legacy_copy_dir)
+            print(f"🧹 移除冗余副本: {legacy_copy_dir}")
+        
+        errors = verify_asset_store(assets_dir)
+        if errors:
+            print(f"❌ 资源布局校验失败 ({len(errors)} 个问题):")
+            for error in errors:
+                print(f"   - {error}")
+            return None
+        print("✅ 资源布局校验通过")
+    else:
+        output_files += write_category_files(category_assets_dir, category_ids)
+        
+        # 切换回完整副本布局时清单与内容块已失效
+        if os.path.exists(os.path.join(assets_dir, MANIFEST_FILE)):
+            os.remove(os.path.join(assets_dir, MANIFEST_FILE))
+            shutil.rmtree(os.path.join(assets_dir, STORE_DIR), ignore_errors=True)
     
     print(f"\n🎉 数据准备完成！")
     print(f"📁 文件位置: {assets_dir}")
     print(f"📊 统计信息:")
-    for category_id, count in index_data['categories'].items():
-        display_name = category_mapping.get(category_id, category_id)
-        print(f"   - {display_name}: {count}个菜谱")
+    for category_id, recipes in groups.items():
+        display_name = CATEGORY_DISPLAY_NAMES.get(category_id, category_id)
+        print(f"   - {display_name}: {len(recipes)}个菜谱")
+    
+    print_size_report(output_files, f"资源体积报告 ({profile.name})")
+    return output_files
 
 if __name__ == '__main__':
-    prepare_recipe_data()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="准备 Android 应用使用的菜谱数据")
+    arg_parser.add_argument("profile", nargs="?", default="pretty", choices=list(OUTPUT_PROFILES), help="JSON 输出配置")
+    arg_parser.add_argument("--layout", default="copies", choices=["copies", "store"],
+                            help="copies: 完整副本; store: 内容寻址存储 + 清单")
+    arg_parser.add_argument("--id-map", default=ID_MAP_FILE, help="持久化的菜谱 ID 映射文件")
+    args = arg_parser.parse_args()
+    if prepare_recipe_data(args.profile, args.layout, args.id_map) is None:
+        sys.exit(1)
\ No newline at end of file
@@ -7,10 +7,76 @@ Android 应用数据导入器
 
 import json
 import os
+import re
+import time
+import sqlite3
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from CookLikeHOCImporter import DataImporter, Recipe
 
+# 与 generate_kotlin_data_classes 中实体一致的 Room 建表语句
+# Room 校验预置数据库时比较列名、类型亲和性、NOT NULL、主键与索引
+ROOM_CREATE_STATEMENTS = [
+    "CREATE TABLE IF NOT EXISTS `recipes` ("
+    "`id` INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, `title` TEXT NOT NULL, `category` TEXT NOT NULL, "
+    "`description` TEXT NOT NULL, `difficulty` TEXT NOT NULL, `cooking_time` INTEGER NOT NULL, "
+    "`servings` INTEGER NOT NULL, `ingredients` TEXT NOT NULL, `instructions` TEXT NOT NULL, "
+    "`tips` TEXT NOT NULL, `nutrition` TEXT NOT NULL, `image_path` TEXT NOT NULL, "
+    "`source_file` TEXT NOT NULL, `created_at` INTEGER NOT NULL, `updated_at` INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS `idx_recipes_category` ON `recipes` (`category`)",
+    "CREATE INDEX IF NOT EXISTS `idx_recipes_difficulty` ON `recipes` (`difficulty`)",
+    "CREATE INDEX IF NOT EXISTS `idx_recipes_cooking_time` ON `recipes` (`cooking_time`)",
+    "CREATE TABLE IF NOT EXISTS `categories` ("
+    "`id` TEXT NOT NULL, `name` TEXT NOT NULL, `display_name` TEXT NOT NULL, `description` TEXT NOT NULL, "
+    "`icon` TEXT NOT NULL, `sort_order` INTEGER NOT NULL, PRIMARY KEY(`id`))"
+]
+
+# 生成的 Kotlin 代码中 createFromAsset 使用的路径
+PREBUILT_DATABASE_ASSET = "databases/cooklikehoc.db"
+
+# 全文检索表：FTS5 没有内置的中文分词器，检索词在构建时由 bigram_tokenize 切好，
+# 表中只保存索引（content=''），rowid 与 recipes.id 对应；rank 按 bm25 加权标题 > 配料 > 步骤
+FTS_CREATE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS `recipes_fts` USING fts5("
+    "title, ingredients, instructions, content='', tokenize='unicode61')",
+    "INSERT INTO `recipes_fts` (`recipes_fts`, `rank`) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')"
+]
+
+FTS_SEARCH_QUERY = (
+    "SELECT recipes.* FROM recipes_fts JOIN recipes ON recipes.id = recipes_fts.rowid "
+    "WHERE recipes_fts MATCH ? ORDER BY recipes_fts.rank"
+)
+
+SEARCH_TOKEN_PATTERN = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[0-9A-Za-z]+')
+
+
+def bigram_tokenize(text: str) -> str:
+    """把文本切分为空格分隔的检索词
+
+    连续汉字与连续字母数字（小写）都输出重叠的二元组并补上末字
+    （"鸡汤面" -> "鸡汤 汤面 面"，"200g" -> "20 00 0g g"），
+    这样汉字或字母数字的任意子串（如 "g"、"ml"）都能用短语查询命中
+    """
+    tokens = []
+    for match in SEARCH_TOKEN_PATTERN.finditer(text):
+        run = match.group().lower()
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        tokens.append(run[-1])
+    return ' '.join(tokens)
+
+
+def build_fts_query(query: str) -> Optional[str]:
+    """把用户输入转换为与 bigram_tokenize 对应的 MATCH 表达式，无有效字符时返回 None"""
+    phrases = []
+    for match in SEARCH_TOKEN_PATTERN.finditer(query):
+        run = match.group().lower()
+        if len(run) == 1:
+            # 单字匹配以该字开头的二元组或末字
+            phrases.append(f'"{run}"*')
+        else:
+            phrases.append('"' + ' '.join(run[i:i + 2] for i in range(len(run) - 1)) + '"')
+    return ' AND '.join(phrases) or None
+
 class AndroidDataGenerator:
     """Android 数据生成器"""
     
@@ -73,9 +139,116 @@ INSERT INTO categories (id, name, display_name, description, sort_order) VALUES
 ('hot_pot', 'hot_pot', '煮锅', '火锅类菜品', 13),
 ('beverage', 'beverage', '饮品', '各种饮品', 14),
 ('seasoning', 'seasoning', '配料', '调料和配菜', 15);
+
+-- 全文检索（检索词在构建时切分为汉字二元组，rowid 对应 recipes.id）
+CREATE VIRTUAL TABLE recipes_fts USING fts5(
+    title, ingredients, instructions,
+    content='', tokenize='unicode61'
+);
+INSERT INTO recipes_fts (recipes_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)');
 '''
         return schema
     
+    def generate_prebuilt_database(self, output_file: str = os.path.join("android_generated", "cooklikehoc.db"),
+                                   room_schema_file: Optional[str] = None, version: int = 1) -> str:
+        """生成可由 Room createFromAsset 直接打开的预置 SQLite 数据库
+
+        room_schema_file 为 Room 导出的 schema JSON（exportSchema = true 时生成）时，
+        直接使用其中的建表语句和 room_master_table 身份哈希，数据库版本也取自该文件；
+        否则使用 ROOM_CREATE_STATEMENTS，并且不写入 room_master_table，
+        由 Room 在首次打开时校验表结构后自行写入身份哈希
+        """
+        create_statements = list(ROOM_CREATE_STATEMENTS)
+        setup_queries = []
+        
+        if room_schema_file:
+            with open(room_schema_file, 'r', encoding='utf-8') as f:
+                room_schema = json.load(f)['database']
+            version = room_schema['version']
+            create_statements = []
+            for entity in room_schema['entities']:
+                table_name = entity['tableName']
+                create_statements.append(entity['createSql'].replace('${TABLE_NAME}', table_name))
+                for index in entity.get('indices', []):
+                    create_statements.append(index['createSql'].replace('${TABLE_NAME}', table_name))
+            setup_queries = room_schema.get('setupQueries', [])
+        
+        # 分类数据直接取自 generate_room_database_schema 中的 INSERT 语句
+        schema_db = sqlite3.connect(':memory:')
+        schema_db.executescript(self.generate_room_database_schema())
+        categories = schema_db.execute(
+            "SELECT id, name, display_name, COALESCE(description, ''), COALESCE(icon, ''), sort_order "
+            "FROM categories ORDER BY sort_order"
+        ).fetchall()
+        schema_db.close()
+        
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        temp_file = f"{output_file}.tmp"
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        
+        # Room 的 Date 转换器以毫秒存储；id 为 recipe_ids 的稳定 ID，新增菜谱不会使其他菜谱的 id 移位
+        now_ms = int(time.time() * 1000)
+        recipe_ids = self.importer.recipe_ids()
+        rows = [
+            (
+                recipe_id, recipe.title, recipe.category, recipe.description, recipe.difficulty,
+                recipe.cooking_time, recipe.servings,
+                json.dumps(recipe.ingredients, ensure_ascii=False, separators=(',', ':')),
+                json.dumps(recipe.instructions, ensure_ascii=False, separators=(',', ':')),
+                recipe.tips, recipe.nutrition, recipe.image_path, recipe.source_file, now_ms, now_ms
+            )
+            for recipe_id, recipe in zip(recipe_ids, self.recipes)
+        ]
+        
+        db = sqlite3.connect(temp_file)
+        try:
+            with db:
+                for statement in create_statements:
+                    db.execute(statement)
+                db.executemany(
+                    "INSERT INTO recipes (id, title, category, description, difficulty, cooking_time, servings, "
+                    "ingredients, instructions, tips, nutrition, image_path, source_file, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                db.executemany(
+                    "INSERT INTO categories (id, name, display_name, description, icon, sort_order) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    categories
+                )
+                self.populate_search_index(db, recipe_ids)
+                for query in setup_queries:
+                    db.execute(query)
+            
+            # Room 通过 user_version 判断数据库版本
+            db.execute(f"PRAGMA user_version = {int(version)}")
+            db.execute("ANALYZE")
+            db.execute("VACUUM")
+        finally:
+            db.close()
+        
+        os.replace(temp_file, output_file)
+        print(f"预置数据库已生成: {output_file} ({len(rows)} 个菜谱, 版本 {version})")
+        return output_file
+    
+    def populate_search_index(self, db: sqlite3.Connection, recipe_ids: Optional[List[int]] = None):
+        """创建 recipes_fts 并写入预先切分的检索词，rowid 为菜谱的稳定 ID，与 recipes.id 一致"""
+        if recipe_ids is None:
+            recipe_ids = self.importer.recipe_ids()
+        for statement in FTS_CREATE_STATEMENTS:
+            db.execute(statement)
+        db.executemany(
+            "INSERT INTO recipes_fts (rowid, title, ingredients, instructions) VALUES (?, ?, ?, ?)",
+            (
+                (recipe_id, bigram_tokenize(recipe.title),
+                 bigram_tokenize('\n'.join(recipe.ingredients)), bigram_tokenize('\n'.join(recipe.instructions)))
+                for recipe_id, recipe in zip(recipe_ids, self.recipes)
+            )
+        )
+        # 合并索引段，减小体积并加快查询
+        db.execute("INSERT INTO recipes_fts (recipes_fts) VALUES ('optimize')")
+    
     def generate_kotlin_data_classes(self) -> str:
         """生成 Kotlin 数据类"""
         kotlin_code = '''
@@ -83,10 +256,19 @@ INSERT INTO categories (id, name, display_name, description, sort_order) VALUES
 // 适用于 Android Kotlin 项目
 
 import androidx.room.*
+import androidx.sqlite.db.SimpleSQLiteQuery
+import androidx.sqlite.db.SupportSQLiteQuery
 import com.google.gson.annotations.SerializedName
 import java.util.Date
 
-@Entity(tableName = "recipes")
+@Entity(
+    tableName = "recipes",
+    indices = [
+        Index(value = ["category"], name = "idx_recipes_category"),
+        Index(value = ["difficulty"], name = "idx_recipes_difficulty"),
+        Index(value = ["cooking_time"], name = "idx_recipes_cooking_time")
+    ]
+)
 data class Recipe(
     @PrimaryKey(autoGenerate = true)
     val id: Long = 0,
@@ -164,8 +346,18 @@ interface RecipeDao {
     @Query("SELECT * FROM recipes WHERE category = :category ORDER BY title")
     suspend fun getRecipesByCategory(category: String): List<Recipe>
     
+    // recipes_fts 由 generate_prebuilt_database 预先生成，Room 不管理 FTS5 表，因此使用 RawQuery
+    @RawQuery(observedEntities = [Recipe::class])
+    suspend fun searchRecipesRaw(query: SupportSQLiteQuery): List<Recipe>
+    
+    suspend fun searchRecipes(query: String): List<Recipe> {
+        val match = RecipeSearch.toFtsQuery(query) ?: return emptyList()
+        return searchRecipesRaw(SimpleSQLiteQuery(RecipeSearch.SEARCH_SQL, arrayOf(match)))
+    }
+    
+    // 设备 SQLite 未启用 FTS5 时的回退实现（全表扫描）
     @Query("SELECT * FROM recipes WHERE title LIKE '%' || :query || '%' OR ingredients LIKE '%' || :query || '%'")
-    suspend fun searchRecipes(query: String): List<Recipe>
+    suspend fun searchRecipesLike(query: String): List<Recipe>
     
     @Query("SELECT * FROM recipes WHERE difficulty = :difficulty ORDER BY title")
     suspend fun getRecipesByDifficulty(difficulty: String): List<Recipe>
@@ -222,7 +414,10 @@ abstract class CookLikeHOCDatabase : RoomDatabase() {
                     context.applicationContext,
                     CookLikeHOCDatabase::class.java,
                     "cooklikehoc_database"
-                ).build()
+                )
+                // 预置数据库由 AndroidDataGenerator.generate_prebuilt_database 生成
+                .createFromAsset("databases/cooklikehoc.db")
+                .build()
                 INSTANCE = instance
                 instance
             }
@@ -230,6 +425,22 @@ abstract class CookLikeHOCDatabase : RoomDatabase() {
     }
 }
 
+// 全文检索查询构造，切分规则与 android_importer.bigram_tokenize 保持一致
+object RecipeSearch {
+    const val SEARCH_SQL = "SELECT recipes.* FROM recipes_fts JOIN recipes ON recipes.id = recipes_fts.rowid " +
+        "WHERE recipes_fts MATCH ? ORDER BY recipes_fts.rank"
+    
+    private val TOKEN_PATTERN = Regex("[\\u3400-\\u4dbf\\u4e00-\\u9fff\\uf900-\\ufaff]+|[0-9A-Za-z]+")
+    
+    fun toFtsQuery(query: String): String? {
+        val phrases = TOKEN_PATTERN.findAll(query).map { match ->
+            val run = match.value.lowercase()
+            if (run.length == 1) "\\"$run\\"*" else "\\"" + run.windowed(2).joinToString(" ") + "\\""
+        }.toList()
+        return if (phrases.isEmpty()) null else phrases.joinToString(" AND ")
+    }
+}
+
 // 类型转换器
 class Converters {
     @TypeConverter
@@ -558,6 +769,9 @@ def main():
         # 生成 Android 代码文件
         code_dir = android_generator.generate_all_android_files("android_generated")
         
+        # 生成预置数据库（复制到 app/src/main/assets/databases/ 供 createFromAsset 使用）
+        android_generator.generate_prebuilt_database(os.path.join(code_dir, "cooklikehoc.db"))
+        
         print("\n🎉 Android 数据和代码生成完成!")
         print(f"📱 Assets 目录: {assets_dir}")
         print(f"💻 代码文件目录: {code_dir}")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 资源输出配置
+控制导出 JSON 的格式（缩进或压缩为单行）以及是否附带 gzip / zstd 预压缩版本，
+并提供按文件统计体积与解析耗时的报告，用于衡量 APK 体积与加载时间
+"""
+
+import os
+import gzip
+import json
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖: pip install zstandard
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+GZIP_SUFFIX = ".gz"
+ZSTD_SUFFIX = ".zst"
+
+
+@dataclass(frozen=True)
+class OutputProfile:
+    """JSON 输出配置"""
+    name: str
+    indent: Optional[int] = 2
+    gzip: bool = False
+    zstd: bool = False
+    zstd_level: int = 19
+
+    def encode(self, data) -> bytes:
+        """序列化为 UTF-8 JSON；indent 为 None 时去掉所有多余空白"""
+        if self.indent is None:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        else:
+            text = json.dumps(data, ensure_ascii=False, indent=self.indent)
+        return text.encode('utf-8')
+
+    def variant_suffixes(self) -> List[str]:
+        """返回需要额外写出的压缩文件后缀；未安装 zstandard 时不含 .zst"""
+        suffixes = []
+        if self.gzip:
+            suffixes.append(GZIP_SUFFIX)
+        if self.zstd and zstandard is not None:
+            suffixes.append(ZSTD_SUFFIX)
+        return suffixes
+
+    def variants(self, payload: bytes) -> List[Tuple[str, bytes]]:
+        """返回需要额外写出的 (后缀, 压缩内容) 列表"""
+        results = []
+        for suffix in self.variant_suffixes():
+            if suffix == GZIP_SUFFIX:
+                # mtime=0 保证相同内容得到相同字节，便于跳过未变化的文件
+                results.append((suffix, gzip.compress(payload, compresslevel=9, mtime=0)))
+            else:
+                results.append((suffix, zstandard.ZstdCompressor(level=self.zstd_level).compress(payload)))
+        return results
+
+
+OUTPUT_PROFILES: Dict[str, OutputProfile] = {
+    'pretty': OutputProfile('pretty'),
+    'minified': OutputProfile('minified', indent=None),
+    'compressed': OutputProfile('compressed', indent=None, gzip=True, zstd=True),
+}
+
+DEFAULT_PROFILE = OUTPUT_PROFILES['pretty']
+
+
+def get_output_profile(profile) -> OutputProfile:
+    """按名称取得输出配置；已是 OutputProfile 时原样返回"""
+    if not isinstance(profile, OutputProfile):
+        try:
+            profile = OUTPUT_PROFILES[profile]
+        except KeyError:
+            raise ValueError(f"未知的输出配置: {profile}，可选: {', '.join(OUTPUT_PROFILES)}") from None
+
+    if profile.zstd and zstandard is None:
+        logger.warning(f"未安装 zstandard，输出配置 {profile.name} 将跳过 .zst 输出")
+    return profile
+
+
+def write_bytes_atomic(output_file: str, payload: bytes):
+    """经临时文件原子替换写出"""
+    temp_file = f"{output_file}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(temp_file, output_file)
+
+
+def remove_stale_variants(output_file: str, profile: OutputProfile):
+    """删除当前配置不再生成的旧压缩文件，避免打包过期数据"""
+    for suffix in (GZIP_SUFFIX, ZSTD_SUFFIX):
+        if suffix not in profile.variant_suffixes() and os.path.exists(output_file + suffix):
+            os.remove(output_file + suffix)
+
+
+def write_json(output_file: str, data, profile=DEFAULT_PROFILE) -> List[str]:
+    """按输出配置写出 JSON 及其压缩版本，返回写出的文件列表"""
+    if not isinstance(profile, OutputProfile):
+        profile = get_output_profile(profile)
+    payload = profile.encode(data)
+    write_bytes_atomic(output_file, payload)
+    written = [output_file]
+
+    for suffix, blob in profile.variants(payload):
+        write_bytes_atomic(output_file + suffix, blob)
+        written.append(output_file + suffix)
+    remove_stale_variants(output_file, profile)
+    return written
+
+
+def _decode_seconds(file_path: str) -> float:
+    """读取、解压并解析一个文件所需的时间（秒）"""
+    start = time.perf_counter()
+    with open(file_path, 'rb') as f:
+        payload = f.read()
+    if file_path.endswith(GZIP_SUFFIX):
+        payload = gzip.decompress(payload)
+    elif file_path.endswith(ZSTD_SUFFIX):
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    json.loads(payload)
+    return time.perf_counter() - start
+
+
+def collect_size_report(json_files: List[str]) -> List[Dict]:
+    """统计每个 JSON 文件及其已存在的 .gz/.zst 版本的体积与解析耗时"""
+    report = []
+    for json_file in json_files:
+        entry = {'file': json_file, 'variants': {}}
+        for suffix in ('', GZIP_SUFFIX, ZSTD_SUFFIX):
+            variant_file = json_file + suffix
+            if not os.path.exists(variant_file) or (suffix == ZSTD_SUFFIX and zstandard is None):
+                continue
+            entry['variants'][suffix or '.json'] = {
+                'bytes': os.path.getsize(variant_file),
+                'parse_ms': round(_decode_seconds(variant_file) * 1000, 3)
+            }
+        report.append(entry)
+    return report
+
+
+def print_size_report(json_files: List[str], title: str = "资源体积报告") -> List[Dict]:
+    """打印每个文件及合计的体积与解析耗时，返回报告数据"""
+    report = collect_size_report(json_files)
+    columns = ['.json', GZIP_SUFFIX, ZSTD_SUFFIX]
+    totals = {column: {'bytes': 0, 'parse_ms': 0.0, 'files': 0} for column in columns}
+
+    print(f"\n📦 {title}")
+    print(f"{'文件':<40}" + "".join(f"{column + ' KB / ms':>22}" for column in columns))
+    for entry in report:
+        row = f"{os.path.basename(entry['file']):<40}"
+        for column in columns:
+            variant = entry['variants'].get(column)
+            if variant:
+                totals[column]['bytes'] += variant['bytes']
+                totals[column]['parse_ms'] += variant['parse_ms']
+                totals[column]['files'] += 1
+                row += f"{variant['bytes'] / 1024:>13.1f} / {variant['parse_ms']:>6.2f}"
+            else:
+                row += f"{'-':>22}"
+        print(row)
+
+    row = f"{'合计':<40}"
+    for column in columns:
+        total = totals[column]
+        if total['files']:
+            row += f"{total['bytes'] / 1024:>13.1f} / {total['parse_ms']:>6.2f}"
+        else:
+            row += f"{'-':>22}"
+    print(row)
+    return report
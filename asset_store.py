@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容寻址的 Android 资源布局
+每个菜谱正文只以 store/<哈希前两位>/<sha256>.json 保存一次，
+manifest.json 记录分类、菜谱 id、图片与这些内容块的对应关系，
+分类文件和合并文件只是指向内容块的索引，verify_asset_store 校验整个布局是否一致
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from typing import Dict, List, Optional
+
+from asset_output import DEFAULT_PROFILE, get_output_profile, write_bytes_atomic, write_json
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+STORE_DIR = "store"
+IMAGES_DIR = "images"
+
+# 每次构建都会变化的字段不写入内容块，否则相同菜谱会得到不同的哈希
+VOLATILE_FIELDS = ('created_at', 'updated_at')
+
+
+def _sha256(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _file_sha256(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _blob_intact(file_path: str, digest: str, size: int) -> bool:
+    """已有内容块的大小与哈希都和文件名一致；上次中断或损坏留下的内容块需要重写"""
+    if not os.path.isfile(file_path) or os.path.getsize(file_path) != size:
+        return False
+    return _file_sha256(file_path) == digest
+
+
+def blob_path(digest: str) -> str:
+    """内容块相对 assets 目录的路径（始终使用 / 分隔，与 AssetManager 一致）"""
+    return f"{STORE_DIR}/{digest[:2]}/{digest}.json"
+
+
+def image_name_from_path(image_path: str) -> Optional[str]:
+    """把菜谱中的 ../images/x.png、images/x.png 或 x.png 统一为文件名"""
+    if not image_path:
+        return None
+    return image_path.replace('\\', '/').rsplit('/', 1)[-1]
+
+
+def _index_images(assets_dir: str) -> Dict[str, Dict]:
+    """计算 images 目录下每个文件的哈希；内容相同的图片只保留第一个文件名"""
+    images_dir = os.path.join(assets_dir, IMAGES_DIR)
+    images = {}
+    canonical = {}
+    if not os.path.isdir(images_dir):
+        return images
+
+    for name in sorted(os.listdir(images_dir)):
+        file_path = os.path.join(images_dir, name)
+        if not os.path.isfile(file_path):
+            continue
+        digest = _file_sha256(file_path)
+        images[name] = {
+            'sha256': digest,
+            'size': os.path.getsize(file_path),
+            'path': f"{IMAGES_DIR}/{canonical.setdefault(digest, name)}"
+        }
+    return images
+
+
+def build_asset_store(recipes: List[Dict], assets_dir: str, profile=DEFAULT_PROFILE,
+                      metadata: Optional[Dict] = None) -> Dict:
+    """把菜谱写入内容寻址存储，生成 manifest.json 与分类 / 合并索引，返回清单
+
+    recipes 为带 id 与 category 的菜谱字典（prepare_recipe_data 的输出）；
+    内容相同的菜谱只存储一次，重复内容的图片改为引用同一个文件
+    """
+    profile = get_output_profile(profile)
+    images = _index_images(assets_dir)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'metadata': metadata or {},
+        'recipes': {},
+        'categories': {},
+        'images': images,
+        'blobs': {}
+    }
+
+    for recipe in recipes:
+        payload_data = {key: value for key, value in recipe.items() if key not in VOLATILE_FIELDS}
+        image_name = image_name_from_path(payload_data.get('image_path', ''))
+        image_entry = images.get(image_name) if image_name else None
+        if image_entry:
+            payload_data['image_path'] = image_entry['path']
+
+        payload = profile.encode(payload_data)
+        digest = _sha256(payload)
+        relative_path = blob_path(digest)
+        if digest not in manifest['blobs']:
+            output_file = os.path.join(assets_dir, *relative_path.split('/'))
+            if not _blob_intact(output_file, digest, len(payload)):
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                write_bytes_atomic(output_file, payload)
+            manifest['blobs'][digest] = {'path': relative_path, 'size': len(payload)}
+
+        manifest['recipes'][str(recipe['id'])] = {
+            'blob': digest,
+            'category': recipe['category'],
+            'image': image_entry['path'] if image_entry else None
+        }
+        manifest['categories'].setdefault(recipe['category'], []).append(recipe['id'])
+
+    removed = _remove_orphan_blobs(assets_dir, set(manifest['blobs']))
+    if removed:
+        print(f"🧹 删除 {removed} 个未被引用的内容块")
+    duplicates = sorted(name for name, image in images.items() if image['path'] != f"{IMAGES_DIR}/{name}")
+    if duplicates:
+        print(f"💡 {len(duplicates)} 张图片与其他图片内容相同，已改为引用同一文件，可从 images/ 中删除: "
+              f"{', '.join(duplicates)}")
+
+    _write_views(manifest, assets_dir, profile)
+    write_json(os.path.join(assets_dir, MANIFEST_FILE), manifest, profile)
+    return manifest
+
+
+def _category_view(manifest: Dict, category: str) -> Dict:
+    ids = manifest['categories'][category]
+    return {
+        'category': category,
+        'count': len(ids),
+        'recipe_ids': ids,
+        'recipe_blobs': [manifest['blobs'][manifest['recipes'][str(recipe_id)]['blob']]['path'] for recipe_id in ids]
+    }
+
+
+def _merged_view(manifest: Dict) -> Dict:
+    return {
+        'count': len(manifest['recipes']),
+        'recipe_ids': [int(recipe_id) for recipe_id in manifest['recipes']],
+        'recipe_blobs': [manifest['blobs'][entry['blob']]['path'] for entry in manifest['recipes'].values()]
+    }
+
+
+def _write_views(manifest: Dict, assets_dir: str, profile):
+    """写出 categories/{分类}_recipes.json 与 cooklikehoc_recipes.json 两种索引视图"""
+    categories_dir = os.path.join(assets_dir, "categories")
+    os.makedirs(categories_dir, exist_ok=True)
+    for category in manifest['categories']:
+        write_json(os.path.join(categories_dir, f"{category}_recipes.json"), _category_view(manifest, category), profile)
+    write_json(os.path.join(assets_dir, "cooklikehoc_recipes.json"), _merged_view(manifest), profile)
+
+
+def _remove_orphan_blobs(assets_dir: str, live_digests: set) -> int:
+    """删除 store 中不再被引用的内容块"""
+    removed = 0
+    store_dir = os.path.join(assets_dir, STORE_DIR)
+    if not os.path.isdir(store_dir):
+        return removed
+
+    for root, _, files in os.walk(store_dir):
+        for name in files:
+            if name.endswith('.json') and name[:-len('.json')] not in live_digests:
+                os.remove(os.path.join(root, name))
+                removed += 1
+    return removed
+
+
+def verify_asset_store(assets_dir: str) -> List[str]:
+    """校验内容寻址布局，返回发现的问题列表（为空表示一致）"""
+    errors = []
+    manifest_file = os.path.join(assets_dir, MANIFEST_FILE)
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        return [f"无法读取清单 {manifest_file}: {e}"]
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        return [f"清单版本不受支持: {manifest.get('version')}"]
+
+    # 内容块存在且哈希与文件名一致
+    for digest, blob in manifest['blobs'].items():
+        file_path = os.path.join(assets_dir, *blob['path'].split('/'))
+        if not os.path.exists(file_path):
+            errors.append(f"内容块缺失: {blob['path']}")
+        elif _file_sha256(file_path) != digest:
+            errors.append(f"内容块哈希不匹配: {blob['path']}")
+
+    # 菜谱、分类、图片引用完整
+    category_ids = set()
+    for category, ids in manifest['categories'].items():
+        for recipe_id in ids:
+            entry = manifest['recipes'].get(str(recipe_id))
+            if entry is None:
+                errors.append(f"分类 {category} 引用了不存在的菜谱 {recipe_id}")
+            elif entry['category'] != category:
+                errors.append(f"菜谱 {recipe_id} 的分类为 {entry['category']}，却出现在分类 {category} 中")
+            category_ids.add(str(recipe_id))
+
+    image_paths = {image['path'] for image in manifest['images'].values()}
+    for recipe_id, entry in manifest['recipes'].items():
+        if entry['blob'] not in manifest['blobs']:
+            errors.append(f"菜谱 {recipe_id} 引用了不存在的内容块 {entry['blob']}")
+        if recipe_id not in category_ids:
+            errors.append(f"菜谱 {recipe_id} 不属于任何分类")
+        if entry['image'] and entry['image'] not in image_paths:
+            errors.append(f"菜谱 {recipe_id} 引用了不存在的图片 {entry['image']}")
+
+    for name, image in manifest['images'].items():
+        file_path = os.path.join(assets_dir, IMAGES_DIR, name)
+        if not os.path.exists(file_path):
+            errors.append(f"图片缺失: {IMAGES_DIR}/{name}")
+        elif _file_sha256(file_path) != image['sha256']:
+            errors.append(f"图片内容已变化: {IMAGES_DIR}/{name}")
+
+    if errors:
+        return errors
+
+    # 索引视图与清单一致
+    expected_views = {
+        os.path.join("categories", f"{category}_recipes.json"): _category_view(manifest, category)
+        for category in manifest['categories']
+    }
+    expected_views["cooklikehoc_recipes.json"] = _merged_view(manifest)
+    for relative_path, expected in expected_views.items():
+        try:
+            with open(os.path.join(assets_dir, relative_path), 'r', encoding='utf-8') as f:
+                if json.load(f) != expected:
+                    errors.append(f"索引文件与清单不一致: {relative_path}")
+        except (OSError, ValueError) as e:
+            errors.append(f"无法读取索引文件 {relative_path}: {e}")
+
+    return errors
+
+
+def main():
+    """校验指定 assets 目录的内容寻址布局"""
+    arg_parser = argparse.ArgumentParser(description="校验内容寻址的 Android 资源布局")
+    arg_parser.add_argument("assets_dir", nargs="?", default=os.path.join("android_app", "app", "src", "main", "assets"),
+                            help="Android assets 目录")
+    args = arg_parser.parse_args()
+
+    errors = verify_asset_store(args.assets_dir)
+    if errors:
+        print(f"❌ 资源布局校验失败 ({len(errors)} 个问题):")
+        for error in errors:
+            print(f"   - {error}")
+        sys.exit(1)
+    print(f"✅ 资源布局校验通过: {args.assets_dir}")
+
+
+if __name__ == "__main__":
+    main()
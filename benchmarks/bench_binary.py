@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单菜谱读取基准
+对比解析完整 cooklikehoc_recipes.json 后取出一个菜谱，
+与通过 RecipeBinaryReader 按 id 直接读取的延迟
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from CookLikeHOCImporter import Recipe, RecipeBinaryReader  # noqa: E402
+from bench_prebuilt_db import build_importer  # noqa: E402
+
+
+def median_seconds(func, ids) -> float:
+    """对每个 id 调用一次 func，返回耗时中位数（秒）"""
+    samples = []
+    for recipe_id in ids:
+        start = time.perf_counter()
+        func(recipe_id)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比 JSON 与二进制格式的单菜谱读取延迟")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[200, 10000, 100000], help="菜谱数量")
+    arg_parser.add_argument("--lookups", type=int, default=20, help="随机读取次数")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with open(ROOT_DIR / "cooklikehoc_recipes.json", 'r', encoding='utf-8') as f:
+        templates = json.load(f)['recipes']
+
+    rng = random.Random(42)
+    print(f"{'菜谱数':>8}{'JSON(KB)':>10}{'BIN(KB)':>10}{'JSON 全量解析(ms)':>20}"
+          f"{'BIN 打开+读取(ms)':>20}{'BIN 已打开(ms)':>16}")
+    for size in args.sizes:
+        work_dir = tempfile.mkdtemp(prefix="cooklikehoc_binary_")
+        try:
+            importer = build_importer(templates, size)
+            json_file = importer.export_to_json(os.path.join(work_dir, "cooklikehoc_recipes.json"))
+            binary_file = importer.export_to_binary(os.path.join(work_dir, "cooklikehoc_recipes.bin"))
+            recipe_ids = importer.recipe_ids()
+            positions = {recipe_id: index for index, recipe_id in enumerate(recipe_ids)}
+            ids = [rng.choice(recipe_ids) for _ in range(args.lookups)]
+
+            def json_lookup(recipe_id):
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    return Recipe(**json.load(f)['recipes'][positions[recipe_id]])
+
+            def binary_lookup(recipe_id):
+                with RecipeBinaryReader(binary_file) as reader:
+                    return reader.get(recipe_id)
+
+            json_seconds = median_seconds(json_lookup, ids)
+            cold_seconds = median_seconds(binary_lookup, ids)
+            with RecipeBinaryReader(binary_file) as reader:
+                warm_seconds = median_seconds(reader.get, ids)
+
+            print(f"{size:>8}{os.path.getsize(json_file) / 1024:>10.0f}{os.path.getsize(binary_file) / 1024:>10.0f}"
+                  f"{json_seconds * 1000:>20.3f}{cold_seconds * 1000:>20.3f}{warm_seconds * 1000:>16.4f}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
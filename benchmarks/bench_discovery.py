@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱文件发现基准
+在多层子分类目录的合成目录树上，对比逐个 stat 的 Path.rglob 与基于 scandir 的
+scan_recipe_files（单线程与线程池）；--latency 为每次读取目录附加固定延迟，模拟网络挂载的检出
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import recipe_discovery  # noqa: E402
+from generate_corpus import CATEGORY_DIRS  # noqa: E402
+
+
+def generate_tree(root: str, depth: int, fanout: int, files_per_dir: int) -> int:
+    """每个分类目录下生成 depth 层、每层 fanout 个子目录的目录树，每个目录放 files_per_dir 个菜谱
+
+    每个目录另有一个 README.md 与一个非 .md 文件用于检验过滤，返回菜谱文件数
+    """
+    count = 0
+    for category_dir in CATEGORY_DIRS:
+        level = [Path(root) / category_dir]
+        for current_depth in range(depth + 1):
+            next_level = []
+            for dir_path in level:
+                dir_path.mkdir(parents=True, exist_ok=True)
+                (dir_path / "README.md").write_text("# 说明\n", encoding='utf-8')
+                (dir_path / "cover.png").write_bytes(b"")
+                for index in range(files_per_dir):
+                    (dir_path / f"菜谱{index}.md").write_text(f"# {dir_path.name}{index}\n", encoding='utf-8')
+                    count += 1
+                if current_depth < depth:
+                    next_level.extend(dir_path / f"子类{child}" for child in range(fanout))
+            level = next_level
+    return count
+
+
+def rglob_discovery(root: str):
+    """朴素递归实现：Path.rglob 后对每个文件再 stat 一次取大小与 mtime"""
+    found = []
+    for category_dir in CATEGORY_DIRS:
+        for file_path in (Path(root) / category_dir).rglob("*.md"):
+            if file_path.name != "README.md" and file_path.is_file():
+                stat = file_path.stat()
+                found.append((file_path, stat.st_size, stat.st_mtime_ns))
+    return found
+
+
+def with_scandir_latency(latency: float):
+    """给 os.scandir 附加固定延迟（Path.rglob 与 scan_recipe_files 都经由它读取目录）"""
+    original = os.scandir
+
+    def slow_scandir(path='.'):
+        time.sleep(latency)
+        return original(path)
+
+    os.scandir = slow_scandir
+    return lambda: setattr(os, 'scandir', original)
+
+
+def median_seconds(func, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比菜谱文件发现实现的耗时")
+    arg_parser.add_argument("--depth", type=int, default=4, help="子分类目录层数")
+    arg_parser.add_argument("--fanout", type=int, default=3, help="每层子目录数")
+    arg_parser.add_argument("--files", type=int, default=8, help="每个目录的菜谱数")
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="scan_recipe_files 的线程数")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="每次读取目录附加的延迟（毫秒）")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="每种方式重复次数")
+    args = arg_parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cooklikehoc_discovery_")
+    restore = None
+    try:
+        expected = generate_tree(root, args.depth, args.fanout, args.files)
+        directories = sum(1 for _ in os.walk(root))
+        print(f"目录树: {directories} 个目录, {expected} 个菜谱文件, 读取目录延迟 {args.latency:g} ms, "
+              f"重复 {args.repeat} 次取中位数")
+
+        if args.latency:
+            restore = with_scandir_latency(args.latency / 1000)
+
+        baseline, found = median_seconds(lambda: rglob_discovery(root), args.repeat)
+        assert len(found) == expected, f"rglob 发现 {len(found)} 个文件"
+        print(f"{'Path.rglob + stat':<26}{baseline * 1000:>10.1f} ms")
+
+        for workers in args.workers:
+            seconds, found = median_seconds(
+                lambda: recipe_discovery.scan_recipe_files(root, CATEGORY_DIRS, workers), args.repeat)
+            assert len(found) == expected, f"scan_recipe_files 发现 {len(found)} 个文件"
+            label = f"scandir ({workers} 线程)"
+            print(f"{label:<26}{seconds * 1000:>10.1f} ms  ({baseline / seconds:.1f}x)")
+    finally:
+        if restore:
+            restore()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图标生成基准
+对比旧实现（逐行绘制渐变、每个尺寸从头重绘）与新实现（主图绘制一次后并行缩放）
+生成全部图标的总耗时，以及参数未变化时跳过生成的耗时
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import contextlib
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "android_app"))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+import generate_icons  # noqa: E402
+
+
+def legacy_gradient_background(size):
+    """旧版渐变：每一行调用一次 draw.line"""
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for y in range(size):
+        ratio = y / size
+        color = tuple(int(top * (1 - ratio) + bottom * ratio)
+                      for top, bottom in zip(generate_icons.GRADIENT_TOP, generate_icons.GRADIENT_BOTTOM))
+        draw.line([(0, y), (size, y)], fill=color + (255,))
+    return img
+
+
+def legacy_create_all_icons(base_path, extra_dir):
+    """旧版流程：每个密度与额外尺寸都从头绘制，ic_launcher_round 再编码一次"""
+    original = generate_icons.gradient_background
+    generate_icons.gradient_background = legacy_gradient_background
+    try:
+        for folder, size in generate_icons.ICON_SIZES.items():
+            folder_path = os.path.join(base_path, folder)
+            os.makedirs(folder_path, exist_ok=True)
+            icon = generate_icons.create_icon(size)
+            icon.save(os.path.join(folder_path, 'ic_launcher.png'), 'PNG')
+            icon.save(os.path.join(folder_path, 'ic_launcher_round.png'), 'PNG')
+        for size in generate_icons.EXTRA_SIZES:
+            generate_icons.create_icon(size).save(os.path.join(extra_dir, f'ic_launcher_{size}x{size}.png'), 'PNG')
+    finally:
+        generate_icons.gradient_background = original
+
+
+def median_seconds(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比新旧图标生成流程的总耗时")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="每种方式重复次数")
+    args = arg_parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="cooklikehoc_icons_")
+    base_path = os.path.join(work_dir, "res")
+    cache_file = os.path.join(work_dir, generate_icons.ICON_CACHE_FILE)
+    try:
+        # 屏蔽每个文件一行的 Generated 输出
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            legacy = median_seconds(lambda: legacy_create_all_icons(base_path, work_dir), args.repeat)
+            cold = median_seconds(lambda: generate_icons.create_all_icons(
+                base_path, work_dir, force=True, cache_file=cache_file), args.repeat)
+            cached = median_seconds(lambda: generate_icons.create_all_icons(
+                base_path, work_dir, cache_file=cache_file), args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    files = len(generate_icons.icon_outputs(base_path, work_dir))
+    print(f"生成 {files} 个图标文件，重复 {args.repeat} 次取中位数")
+    print(f"{'旧实现 (逐尺寸重绘)':<24}{legacy * 1000:>10.1f} ms")
+    print(f"{'新实现 (主图缩放)':<24}{cold * 1000:>10.1f} ms  ({legacy / cold:.1f}x)")
+    print(f"{'参数未变化 (跳过)':<24}{cached * 1000:>10.1f} ms  ({legacy / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
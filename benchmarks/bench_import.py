@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+端到端导入基准
+在不同规模的合成语料上分别计时 discover_recipe_files、解析、export_to_json
+和 export_to_android_assets，并把结果保存为 JSON 以便在多次运行之间对比；
+--check-parallel 改为校验并行解析的菜谱与统计信息是否与串行模式完全一致
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CookLikeHOCImporter import DataImporter  # noqa: E402
+from generate_corpus import generate_corpus  # noqa: E402
+
+STAGES = ['discover', 'parse', 'export_json', 'export_android_assets']
+
+# 校验并行解析时混入的无法解码的文件数，使失败计数也参与比较
+BROKEN_FILES = 5
+
+
+def run_once(corpus_dir: str, work_dir: str, workers: int) -> Dict[str, float]:
+    """完整运行一次导入流程，返回各阶段耗时（秒）"""
+    importer = DataImporter(corpus_dir)
+    timings = {}
+
+    def timed(stage: str, func: Callable):
+        start = time.perf_counter()
+        result = func()
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    files = timed('discover', importer.parser.discover_recipe_files)
+    importer.import_stats['total_files'] = len(files)
+
+    def parse():
+        if workers > 1:
+            recipes = importer._parse_files_parallel(files, workers)
+        else:
+            recipes = [importer.parser.parse_markdown_recipe(file_path) for file_path in files]
+        for recipe in recipes:
+            if recipe:
+                importer.recipes.append(recipe)
+            importer._record_result(recipe)
+
+    timed('parse', parse)
+    timed('export_json', lambda: importer.export_to_json(str(Path(work_dir) / "cooklikehoc_recipes.json")))
+    timed('export_android_assets', lambda: importer.export_to_android_assets(str(Path(work_dir) / "android_assets")))
+    return timings
+
+
+def bench_size(size: int, workers: int, repeat: int, seed: int) -> Dict:
+    """生成指定规模的语料并取多次运行中各阶段的最小耗时"""
+    corpus_dir = tempfile.mkdtemp(prefix=f"cooklikehoc_corpus_{size}_")
+    work_dir = tempfile.mkdtemp(prefix=f"cooklikehoc_output_{size}_")
+    try:
+        generate_corpus(corpus_dir, size, seed=seed)
+        best = {stage: float('inf') for stage in STAGES}
+        for _ in range(repeat):
+            for stage, seconds in run_once(corpus_dir, work_dir, workers).items():
+                best[stage] = min(best[stage], seconds)
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    total = sum(best.values())
+    return {
+        'size': size,
+        'stages': {stage: round(seconds, 6) for stage, seconds in best.items()},
+        'total': round(total, 6),
+        'files_per_second': round(size / total, 1) if total else None
+    }
+
+
+def check_parallel(size: int, workers: int, seed: int) -> bool:
+    """分别以 workers=1 与 workers=N 运行 import_all_recipes，比较菜谱列表与 import_stats
+
+    分类统计的顺序决定导出中的分类顺序，因此按插入顺序比较
+    """
+    corpus_dir = tempfile.mkdtemp(prefix=f"cooklikehoc_corpus_{size}_")
+    try:
+        files = generate_corpus(corpus_dir, size, seed=seed)
+        for index in range(BROKEN_FILES):
+            broken_file = files[index].with_name(f"损坏{index}.md")
+            broken_file.write_bytes(b'\xff\xfe# \xc3\x28\n')
+
+        results = {}
+        for worker_count in (1, workers):
+            importer = DataImporter(corpus_dir)
+            importer.import_all_recipes(workers=worker_count)
+            results[worker_count] = (importer.recipes, importer.import_stats)
+    finally:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    (serial_recipes, serial_stats), (parallel_recipes, parallel_stats) = results[1], results[workers]
+    ok = True
+    if serial_recipes != parallel_recipes:
+        ok = False
+        mismatch = next((index for index, (serial, parallel) in enumerate(zip(serial_recipes, parallel_recipes))
+                         if serial != parallel), min(len(serial_recipes), len(parallel_recipes)))
+        print(f"❌ 规模 {size}: 菜谱不一致（串行 {len(serial_recipes)} 个, 并行 {len(parallel_recipes)} 个, "
+              f"首个差异位于第 {mismatch} 个）")
+    if (serial_stats != parallel_stats
+            or list(serial_stats['categories'].items()) != list(parallel_stats['categories'].items())):
+        ok = False
+        print(f"❌ 规模 {size}: import_stats 不一致\n   串行: {serial_stats}\n   并行: {parallel_stats}")
+    if ok:
+        print(f"✅ 规模 {size}: workers=1 与 workers={workers} 的 {len(serial_recipes)} 个菜谱及统计信息一致 "
+              f"(失败 {serial_stats['failed']} 个)")
+    return ok
+
+
+def print_results(runs: List[Dict], baseline: Dict = None):
+    """打印结果表格；提供基线时附带相对变化"""
+    baseline_runs = {run['size']: run for run in (baseline or {}).get('runs', [])}
+    header = f"{'规模':>8}" + "".join(f"{stage:>24}" for stage in STAGES) + f"{'合计':>12}"
+    print(header)
+    for run in runs:
+        row = f"{run['size']:>8}"
+        base = baseline_runs.get(run['size'])
+        for stage in STAGES:
+            cell = f"{run['stages'][stage]:.3f}s"
+            if base and base['stages'].get(stage):
+                cell += f" ({run['stages'][stage] / base['stages'][stage] - 1:+.0%})"
+            row += f"{cell:>24}"
+        row += f"{run['total']:>11.3f}s"
+        print(row)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="CookLikeHOC 导入流程端到端基准")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="语料规模")
+    arg_parser.add_argument("--workers", type=int, default=1, help="解析进程数")
+    arg_parser.add_argument("--repeat", type=int, default=1, help="每个规模重复次数，取最小值")
+    arg_parser.add_argument("--seed", type=int, default=42, help="语料随机种子")
+    arg_parser.add_argument("--output", default="bench_results.json", help="结果 JSON 文件")
+    arg_parser.add_argument("--compare", help="与之前保存的结果 JSON 对比")
+    arg_parser.add_argument("--check-parallel", action="store_true",
+                            help="不计时，校验并行解析与串行解析的结果一致（--workers 小于 2 时使用 CPU 核数）")
+    args = arg_parser.parse_args()
+
+    # 屏蔽逐文件日志，避免日志 I/O 干扰计时
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.check_parallel:
+        workers = args.workers if args.workers > 1 else max(os.cpu_count() or 2, 2)
+        passed = [check_parallel(size, workers, args.seed) for size in args.sizes]
+        if not all(passed):
+            sys.exit(1)
+        return
+
+    runs = []
+    for size in args.sizes:
+        print(f"⏱️  规模 {size} ...")
+        runs.append(bench_size(size, args.workers, args.repeat, args.seed))
+
+    results = {
+        'generated_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': args.workers,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'runs': runs
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_results(runs, baseline)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"✅ 结果已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
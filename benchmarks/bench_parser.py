@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析器性能基准
+对比逐节正则扫描的旧解析实现与单次扫描切分的新实现的单文件解析耗时
+"""
+
+import re
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+from dataclasses import asdict
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CookLikeHOCImporter import CookLikeHOCParser, Recipe  # noqa: E402
+
+
+class LegacyParser(CookLikeHOCParser):
+    """旧版解析实现：每个章节单独使用 DOTALL 正则扫描全文，正则未预编译"""
+
+    def parse_markdown_recipe(self, file_path: Path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        title = title_match.group(1).strip() if title_match else file_path.stem
+
+        category_name = file_path.parent.name
+        category = self.categories.get(category_name, 'other')
+
+        image_match = re.search(r'!\[.*?\]\((.+?)\)', content)
+        image_path = image_match.group(1) if image_match else ""
+
+        ingredients = self._legacy_ingredients(content)
+        instructions = self._legacy_instructions(content)
+        cooking_time = self._legacy_cooking_time(content, instructions)
+        difficulty = self._estimate_difficulty(instructions, ingredients)
+        servings = self._legacy_servings(content, ingredients)
+
+        return Recipe(
+            title=title,
+            category=category,
+            description=f"{category_name}类菜品",
+            difficulty=difficulty,
+            cooking_time=cooking_time,
+            servings=servings,
+            ingredients=ingredients,
+            instructions=instructions,
+            image_path=image_path,
+            source_file=str(file_path)
+        )
+
+    @staticmethod
+    def _legacy_ingredients(content: str) -> List[str]:
+        ingredients = []
+        for section in ['## 配料', '## 品类']:
+            pattern = rf'{section}\s*\n(.*?)(?=\n##|\n#|\Z)'
+            match = re.search(pattern, content, re.DOTALL)
+            if match:
+                for line in match.group(1).strip().split('\n'):
+                    line = line.strip()
+                    if line.startswith('- '):
+                        ingredient = line[2:].strip()
+                        ingredient = re.sub(r'_.*?_', '', ingredient)
+                        ingredient = re.sub(r'\(.*?\)', '', ingredient)
+                        ingredient = ingredient.strip()
+                        if ingredient and not ingredient.startswith('_'):
+                            ingredients.append(ingredient)
+                break
+        return ingredients
+
+    @staticmethod
+    def _legacy_instructions(content: str) -> List[str]:
+        instructions = []
+        match = re.search(r'## 步骤\s*\n(.*?)(?=\n##|\n#|\Z)', content, re.DOTALL)
+        if match:
+            for line in match.group(1).strip().split('\n'):
+                line = line.strip()
+                if line.startswith('- '):
+                    step = re.sub(r'^\d+\.\s*', '', line[2:].strip())
+                    if step:
+                        instructions.append(step)
+        return instructions
+
+    @staticmethod
+    def _legacy_cooking_time(content: str, instructions: List[str]) -> int:
+        time_patterns = [
+            r'(\d+)\s*分钟',
+            r'(\d+)\s*小时',
+            r'蒸制?\s*(\d+)\s*分钟',
+            r'煮\s*(\d+)\s*分钟',
+            r'炒\s*(\d+)\s*秒'
+        ]
+        total_time = 0
+        text = content + ' '.join(instructions)
+        for pattern in time_patterns:
+            for match in re.findall(pattern, text):
+                time_val = int(match)
+                if '小时' in pattern:
+                    time_val *= 60
+                elif '秒' in pattern:
+                    time_val = max(1, time_val // 60)
+                total_time += time_val
+        if total_time == 0:
+            step_count = len(instructions)
+            if step_count <= 2:
+                total_time = 15
+            elif step_count <= 4:
+                total_time = 30
+            else:
+                total_time = 45
+        return min(total_time, 180)
+
+    @staticmethod
+    def _legacy_servings(content: str, ingredients: List[str]) -> int:
+        for pattern in [r'(\d+)\s*份', r'(\d+)\s*人份', r'(\d+)\s*人']:
+            match = re.search(pattern, content)
+            if match:
+                return int(match.group(1))
+        total_weight = 0
+        for ingredient in ingredients:
+            weight_match = re.search(r'(\d+)g', ingredient)
+            if weight_match:
+                total_weight += int(weight_match.group(1))
+        if total_weight > 1000:
+            return 6
+        elif total_weight > 500:
+            return 4
+        elif total_weight > 200:
+            return 2
+        return 1
+
+
+def time_parser(parser: CookLikeHOCParser, files: List[Path], repeat: int) -> List[float]:
+    """返回每个文件的最佳解析耗时（微秒）"""
+    timings = []
+    for file_path in files:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parser.parse_markdown_recipe(file_path)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1e6)
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比新旧解析器的单文件解析耗时")
+    arg_parser.add_argument("project_path", help="CookLikeHOC 菜谱目录")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="每个文件重复解析次数，取最小值")
+    args = arg_parser.parse_args()
+
+    current = CookLikeHOCParser(args.project_path)
+    legacy = LegacyParser(args.project_path)
+    files = current.discover_recipe_files()
+    if not files:
+        print(f"❌ 未发现菜谱文件: {args.project_path}")
+        return
+
+    mismatches = sum(
+        1 for file_path in files
+        if asdict(current.parse_markdown_recipe(file_path)) != asdict(legacy.parse_markdown_recipe(file_path))
+    )
+
+    legacy_timings = time_parser(legacy, files, args.repeat)
+    current_timings = time_parser(current, files, args.repeat)
+
+    print(f"文件数: {len(files)}  输出不一致: {mismatches}")
+    print(f"{'实现':<10}{'平均(μs)':>12}{'中位数(μs)':>14}{'最大(μs)':>12}")
+    for name, timings in [("legacy", legacy_timings), ("tokenizer", current_timings)]:
+        print(f"{name:<10}{statistics.mean(timings):>12.1f}"
+              f"{statistics.median(timings):>14.1f}{max(timings):>12.1f}")
+    print(f"加速比: {statistics.mean(legacy_timings) / statistics.mean(current_timings):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预置数据库基准
+模拟应用首次启动：对比“解析 JSON 后逐行插入”与“复制预置数据库后直接打开”
+两种方式得到可查询数据库所需的时间
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from CookLikeHOCImporter import DataImporter, Recipe  # noqa: E402
+from android_importer import AndroidDataGenerator, ROOM_CREATE_STATEMENTS  # noqa: E402
+
+
+def build_importer(templates, count: int) -> DataImporter:
+    """以模板菜谱循环构造 count 个菜谱"""
+    importer = DataImporter(str(ROOT_DIR))
+    for i in range(count):
+        data = dict(templates[i % len(templates)])
+        data['title'] = f"{data['title']}{i}"
+        importer.recipes.append(Recipe(**data))
+    return importer
+
+
+def json_import(json_file: str, db_file: str):
+    """JSON 导入路径：解析 JSON、建表并在事务中插入全部菜谱"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        recipes = json.load(f)['recipes']
+
+    db = sqlite3.connect(db_file)
+    with db:
+        for statement in ROOM_CREATE_STATEMENTS:
+            db.execute(statement)
+        db.executemany(
+            "INSERT INTO recipes (title, category, description, difficulty, cooking_time, servings, "
+            "ingredients, instructions, tips, nutrition, image_path, source_file, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (r['title'], r['category'], r['description'], r['difficulty'], r['cooking_time'], r['servings'],
+                 json.dumps(r['ingredients'], ensure_ascii=False), json.dumps(r['instructions'], ensure_ascii=False),
+                 r['tips'], r['nutrition'], r['image_path'], r['source_file'], 0, 0)
+                for r in recipes
+            ]
+        )
+    db.execute("SELECT * FROM recipes WHERE category = 'staple' ORDER BY title LIMIT 20").fetchall()
+    db.close()
+
+
+def prebuilt_open(asset_file: str, db_file: str):
+    """预置数据库路径：复制资源文件后直接打开查询（对应 createFromAsset）"""
+    shutil.copyfile(asset_file, db_file)
+    db = sqlite3.connect(db_file)
+    db.execute("SELECT * FROM recipes WHERE category = 'staple' ORDER BY title LIMIT 20").fetchall()
+    db.close()
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比 JSON 导入与预置数据库的首次可查询时间")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[200, 10000, 100000], help="菜谱数量")
+    args = arg_parser.parse_args()
+
+    with open(ROOT_DIR / "cooklikehoc_recipes.json", 'r', encoding='utf-8') as f:
+        templates = json.load(f)['recipes']
+
+    print(f"{'菜谱数':>8}{'JSON(KB)':>10}{'DB(KB)':>10}{'JSON 导入(ms)':>16}{'预置数据库(ms)':>16}{'加速比':>8}")
+    for size in args.sizes:
+        work_dir = tempfile.mkdtemp(prefix="cooklikehoc_db_")
+        try:
+            importer = build_importer(templates, size)
+            json_file = importer.export_to_json(os.path.join(work_dir, "recipes.json"))
+            asset_file = AndroidDataGenerator(importer).generate_prebuilt_database(os.path.join(work_dir, "asset.db"))
+
+            json_seconds = timed(json_import, json_file, os.path.join(work_dir, "json_import.db"))
+            prebuilt_seconds = timed(prebuilt_open, asset_file, os.path.join(work_dir, "prebuilt.db"))
+
+            print(f"{size:>8}{os.path.getsize(json_file) / 1024:>10.0f}{os.path.getsize(asset_file) / 1024:>10.0f}"
+                  f"{json_seconds * 1000:>16.1f}{prebuilt_seconds * 1000:>16.1f}"
+                  f"{json_seconds / prebuilt_seconds:>7.1f}x")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数量/时长提取基准
+对比旧版多正则多次扫描的时间与份数估算，与一次扫描的 extract_quantities 实现
+在不同大小菜谱文件上的耗时
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from CookLikeHOCImporter import CookLikeHOCParser, extract_quantities, tokenize_markdown  # noqa: E402
+from bench_parser import LegacyParser  # noqa: E402
+from generate_corpus import make_recipe  # noqa: E402
+
+
+def best_of(func, repeat: int) -> float:
+    """返回 repeat 次调用中的最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比数量提取的新旧实现")
+    arg_parser.add_argument("--steps", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                            help="生成菜谱的步骤数")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最小值")
+    args = arg_parser.parse_args()
+
+    parser = CookLikeHOCParser(".")
+    rng = random.Random(42)
+
+    print(f"{'步骤数':>8}{'文件大小(KB)':>14}{'legacy(ms)':>12}{'one-pass(ms)':>14}{'加速比':>8}")
+    for steps in args.steps:
+        content = make_recipe(rng, "基准菜谱", steps)
+        document = tokenize_markdown(content)
+        ingredients = parser._extract_ingredients(document)
+        instructions = parser._extract_instructions(document)
+
+        def legacy():
+            LegacyParser._legacy_cooking_time(content, instructions)
+            LegacyParser._legacy_servings(content, ingredients)
+
+        def one_pass():
+            quantities = extract_quantities(content)
+            parser._estimate_cooking_time(quantities, instructions)
+            parser._estimate_servings(quantities, ingredients)
+
+        legacy_seconds = best_of(legacy, args.repeat)
+        current_seconds = best_of(one_pass, args.repeat)
+        size_kb = len(content.encode('utf-8')) / 1024
+        print(f"{steps:>8}{size_kb:>14.1f}{legacy_seconds * 1000:>12.3f}"
+              f"{current_seconds * 1000:>14.3f}{legacy_seconds / current_seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recipe 内存占用基准
+以仓库自带的 cooklikehoc_recipes.json 为模板构造大规模菜谱集合，
+对比普通 dataclass 与 slots + 字符串驻留实现的每个菜谱字节数
+"""
+
+import gc
+import sys
+import json
+import argparse
+import tracemalloc
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from CookLikeHOCImporter import Recipe  # noqa: E402
+
+
+@dataclass
+class LegacyRecipe:
+    """旧版菜谱模型：基于 __dict__，不驻留字符串"""
+    title: str
+    category: str
+    description: str = ""
+    difficulty: str = "未知"
+    cooking_time: int = 0
+    servings: int = 1
+    ingredients: List[str] = None
+    instructions: List[str] = None
+    tips: str = ""
+    nutrition: str = ""
+    image_path: str = ""
+    source_file: str = ""
+
+    def __post_init__(self):
+        if self.ingredients is None:
+            self.ingredients = []
+        if self.instructions is None:
+            self.instructions = []
+
+
+def fresh(text: str) -> str:
+    """复制出独立的字符串对象，模拟每次解析都会生成新字符串"""
+    return (text + '.')[:-1]
+
+
+def build_records(templates: List[Dict], count: int) -> List[Dict]:
+    """按模板循环生成 count 条互不共享字符串对象的菜谱字段"""
+    records = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        records.append({
+            'title': f"{template['title']}{i}",
+            'category': fresh(template['category']),
+            'description': fresh(template['description']),
+            'difficulty': fresh(template['difficulty']),
+            'cooking_time': template['cooking_time'],
+            'servings': template['servings'],
+            'ingredients': [fresh(item) for item in template['ingredients']],
+            'instructions': [fresh(step) for step in template['instructions']],
+            'image_path': fresh(template['image_path']),
+            'source_file': f"{template['source_file']}{i}"
+        })
+    return records
+
+
+def measure(factory: Callable, templates: List[Dict], count: int) -> int:
+    """返回构造全部菜谱并释放输入字段后净保留的内存字节数"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = build_records(templates, count)
+    recipes = [factory(**record) for record in records]
+    del records
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del recipes
+    return retained
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比 Recipe 新旧实现的内存占用")
+    arg_parser.add_argument("--count", type=int, default=100_000, help="构造的菜谱数量")
+    arg_parser.add_argument("--source", default=str(ROOT_DIR / "cooklikehoc_recipes.json"),
+                            help="模板菜谱 JSON 文件")
+    args = arg_parser.parse_args()
+
+    with open(args.source, 'r', encoding='utf-8') as f:
+        templates = json.load(f)['recipes']
+
+    legacy_bytes = measure(LegacyRecipe, templates, args.count)
+    compact_bytes = measure(Recipe, templates, args.count)
+
+    # 序列化结果必须保持兼容
+    sample = build_records(templates, 1)[0]
+    compatible = asdict(LegacyRecipe(**sample)) == asdict(Recipe(**sample))
+
+    print(f"菜谱数量: {args.count}  序列化兼容: {compatible}")
+    print(f"{'实现':<10}{'总字节数':>16}{'每个菜谱字节数':>18}")
+    for name, total in [("legacy", legacy_bytes), ("compact", compact_bytes)]:
+        print(f"{name:<10}{total:>16,}{total / args.count:>18,.1f}")
+    print(f"节省: {(1 - compact_bytes / legacy_bytes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
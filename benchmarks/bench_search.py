@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱检索基准
+在预置数据库上对比 LIKE '%query%' 全表扫描与 recipes_fts 全文检索的查询延迟
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from android_importer import AndroidDataGenerator, FTS_SEARCH_QUERY, build_fts_query  # noqa: E402
+from bench_prebuilt_db import build_importer  # noqa: E402
+
+LIKE_SEARCH_QUERY = (
+    "SELECT * FROM recipes WHERE title LIKE '%' || ?1 || '%' "
+    "OR ingredients LIKE '%' || ?1 || '%' OR instructions LIKE '%' || ?1 || '%'"
+)
+
+QUERIES = ['鸡蛋', '牛', '红烧肉', '蒜子', '老母鸡汤', '豆腐', '小米椒']
+
+
+def median_latency(db: sqlite3.Connection, sql: str, params_list, repeat: int) -> float:
+    """返回各查询 repeat 次执行中位耗时的平均值（秒）"""
+    per_query = []
+    for params in params_list:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            db.execute(sql, params).fetchall()
+            samples.append(time.perf_counter() - start)
+        per_query.append(statistics.median(samples))
+    return sum(per_query) / len(per_query)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比 LIKE 与 FTS5 检索延迟")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[200, 10000, 100000], help="菜谱数量")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="每个查询重复次数，取中位数")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with open(ROOT_DIR / "cooklikehoc_recipes.json", 'r', encoding='utf-8') as f:
+        templates = json.load(f)['recipes']
+
+    print(f"{'菜谱数':>8}{'DB(KB)':>10}{'LIKE(ms)':>12}{'FTS(ms)':>12}{'加速比':>8}")
+    for size in args.sizes:
+        work_dir = tempfile.mkdtemp(prefix="cooklikehoc_search_")
+        try:
+            generator = AndroidDataGenerator(build_importer(templates, size))
+            db_file = generator.generate_prebuilt_database(os.path.join(work_dir, "cooklikehoc.db"))
+            db = sqlite3.connect(db_file)
+
+            like_seconds = median_latency(db, LIKE_SEARCH_QUERY, [(query,) for query in QUERIES], args.repeat)
+            fts_seconds = median_latency(db, FTS_SEARCH_QUERY, [(build_fts_query(query),) for query in QUERIES],
+                                         args.repeat)
+            db.close()
+
+            print(f"{size:>8}{os.path.getsize(db_file) / 1024:>10.0f}{like_seconds * 1000:>12.3f}"
+                  f"{fts_seconds * 1000:>12.3f}{like_seconds / fts_seconds:>7.1f}x")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成菜谱语料生成器
+按 CookLikeHOC 的目录与 Markdown 结构（# 标题、图片、## 配料、## 步骤）
+生成指定数量的菜谱文件，用于导入器的规模测试
+"""
+
+import os
+import sys
+import random
+import argparse
+from pathlib import Path
+from typing import List
+
+CATEGORY_DIRS = [
+    '主食', '炒菜', '炖菜', '蒸菜', '烤类', '炸品', '凉拌', '卤菜',
+    '早餐', '汤', '烫菜', '砂锅菜', '煮锅', '饮品', '配料'
+]
+
+MAIN_INGREDIENTS = [
+    '鸡蛋', '五花肉', '牛腩', '鸡腿', '鲈鱼', '豆腐', '青椒', '土豆', '茄子', '白菜',
+    '香菇', '木耳', '莲藕', '冬瓜', '排骨', '鸭肉', '虾仁', '面筋', '粉丝', '西兰花'
+]
+
+SEASONINGS = [
+    '大豆油', '熟猪油', '蒜子', '生姜', '大葱', '白砂糖', '食盐', '鸡精', '生抽', '老抽',
+    '蚝油', '料酒', '香醋', '花椒油', '红油', '淀粉', '胡椒粉', '香菜', '葱花', '芝麻'
+]
+
+SUPPLIER_NOTES = [
+    '（来自成都圣恩生物）', '(大豆油、郫县豆瓣、辣椒等)', '_可选_', ''
+]
+
+ACTIONS = ['下入', '加入', '放入', '倒入']
+COOK_PHRASES = [
+    '大火爆炒 {n} 秒', '小火慢炖 {n} 分钟', '蒸制 {n} 分钟', '煮 {n} 分钟',
+    '焖 {n} 分钟', '炖 {h} 小时', '翻炒均匀', '腌制 {n} 分钟'
+]
+FINISHERS = ['出品。', '盛出备用；', '装盘即可。', '撒入葱花出品。']
+
+
+def make_recipe(rng: random.Random, title: str, step_count: int) -> str:
+    """生成一篇菜谱 Markdown 文本"""
+    ingredients = rng.sample(MAIN_INGREDIENTS, rng.randint(1, 3)) + rng.sample(SEASONINGS, rng.randint(2, 8))
+    lines = [f"# {title}", "", f"![{title}](../images/{title}.png)", "", "## 配料", ""]
+
+    for ingredient in ingredients:
+        note = rng.choice(SUPPLIER_NOTES)
+        lines.append(f"- {ingredient}{note}")
+
+    lines += ["", "## 步骤", ""]
+    for step in range(1, step_count + 1):
+        parts = []
+        for ingredient in rng.sample(ingredients, min(len(ingredients), rng.randint(1, 3))):
+            parts.append(f"{rng.randint(1, 30) * 10}g {ingredient}")
+        phrase = rng.choice(COOK_PHRASES).format(n=rng.randint(1, 40), h=rng.randint(1, 3))
+        lines.append(f"- {step}. {rng.choice(ACTIONS)} {'、'.join(parts)}，{phrase}，{rng.choice(FINISHERS)}")
+
+    if rng.random() < 0.2:
+        lines += ["", f"_以上为 {rng.randint(1, 10)} 份的用量_"]
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def generate_corpus(output_dir: str, count: int, seed: int = 42, max_steps: int = 8) -> List[Path]:
+    """在 output_dir 下生成 count 个菜谱文件，返回文件路径列表"""
+    rng = random.Random(seed)
+    root = Path(output_dir)
+    files = []
+
+    for category_name in CATEGORY_DIRS:
+        (root / category_name).mkdir(parents=True, exist_ok=True)
+
+    for index in range(count):
+        category_name = CATEGORY_DIRS[index % len(CATEGORY_DIRS)]
+        dish = rng.choice(MAIN_INGREDIENTS)
+        title = f"{rng.choice(['小炒', '红烧', '清蒸', '香煎', '卤', '凉拌'])}{dish}{index:06d}"
+        file_path = root / category_name / f"{title}.md"
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(make_recipe(rng, title, rng.randint(1, max_steps)))
+        files.append(file_path)
+
+    return files
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="生成 CookLikeHOC 风格的合成菜谱目录")
+    arg_parser.add_argument("output_dir", help="输出目录")
+    arg_parser.add_argument("--count", type=int, default=1000, help="菜谱数量，例如 1000/10000/100000")
+    arg_parser.add_argument("--seed", type=int, default=42, help="随机种子，相同种子生成相同语料")
+    arg_parser.add_argument("--max-steps", type=int, default=8, help="每个菜谱最多步骤数")
+    args = arg_parser.parse_args()
+
+    if os.path.exists(args.output_dir) and os.listdir(args.output_dir):
+        print(f"❌ 输出目录非空: {args.output_dir}")
+        sys.exit(1)
+
+    files = generate_corpus(args.output_dir, args.count, args.seed, args.max_steps)
+    print(f"✅ 已生成 {len(files)} 个菜谱文件: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱 HTTP 接口压测
+多个 keep-alive 连接并发请求分页列表、分类、详情、检索与随机推荐接口，
+部分请求带上次的 ETag 验证 304，最后报告吞吐与 p50 / p90 / p99 延迟；
+未指定 --url 时在后台线程中启动一个进程内的 recipe_server（与压测客户端共享 CPU，
+需要准确数字时请单独启动服务再用 --url 指向它）
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import quote, urlsplit
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import recipe_server  # noqa: E402
+from bench_search import QUERIES  # noqa: E402
+
+
+class HttpClient:
+    """单个 keep-alive 连接上的最小 HTTP/1.1 客户端"""
+
+    def __init__(self, host: str, port: int, accept_gzip: bool):
+        self.host = host
+        self.port = port
+        self.accept_gzip = accept_gzip
+        self.reader = None
+        self.writer = None
+
+    async def request(self, path: str, etag: str = None) -> Tuple[int, Dict[str, str], bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        if self.accept_gzip:
+            lines.append("Accept-Encoding: gzip")
+        if etag:
+            lines.append(f"If-None-Match: {etag}")
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8'))
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        body = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return int(status_line.split(' ')[1]), headers, body
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+def build_workload(recipe_ids: List[int], categories: List[str], count: int, seed: int) -> List[str]:
+    """按大致的真实访问比例生成请求路径：详情与列表为主，检索与随机推荐次之"""
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.35:
+            paths.append(f"/api/recipes/{rng.choice(recipe_ids)}")
+        elif roll < 0.60:
+            paths.append(f"/api/categories/{rng.choice(categories)}/recipes?page=1&page_size=20")
+        elif roll < 0.75:
+            paths.append(f"/api/recipes?page={rng.randint(1, 5)}&page_size=20")
+        elif roll < 0.90:
+            paths.append(f"/api/search?q={quote(rng.choice(QUERIES))}")
+        elif roll < 0.95:
+            paths.append("/api/categories")
+        else:
+            paths.append("/api/random?limit=10")
+    return paths
+
+
+def percentile(sorted_samples: List[float], percent: float) -> float:
+    """最近秩百分位数"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, round(percent / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+async def run_load(host: str, port: int, total: int, concurrency: int, revalidate: float,
+                   accept_gzip: bool, seed: int) -> Dict:
+    probe = HttpClient(host, port, False)
+    _, _, body = await probe.request("/api/recipes?page=1&page_size=100")
+    recipe_ids = [recipe['id'] for recipe in json.loads(body)['items']]
+    _, _, body = await probe.request("/api/categories")
+    categories = [entry['category'] for entry in json.loads(body)['categories']]
+    await probe.close()
+
+    paths = build_workload(recipe_ids, categories, total, seed)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    sent_bytes = [0]
+    etags: Dict[str, str] = {}
+    rng = random.Random(seed + 1)
+    queue = iter(paths)
+
+    async def worker():
+        client = HttpClient(host, port, accept_gzip)
+        try:
+            for path in queue:
+                etag = etags.get(path) if rng.random() < revalidate else None
+                started = time.perf_counter()
+                status, headers, body = await client.request(path, etag)
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+                sent_bytes[0] += len(body)
+                if 'etag' in headers:
+                    etags[path] = headers['etag']
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    probe = HttpClient(host, port, False)
+    _, _, body = await probe.request("/api/stats")
+    await probe.close()
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'statuses': statuses,
+        'body_bytes': sent_bytes[0],
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'max': latencies[-1] if latencies else 0.0,
+        'server': json.loads(body),
+    }
+
+
+def start_in_process_server(json_file: str, cache_size: int) -> Tuple[str, int]:
+    """在后台线程的事件循环中启动服务，返回监听地址"""
+    index = recipe_server.load_index(json_file)
+    app = recipe_server.RecipeServer(index, cache_size)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    address = {}
+
+    async def start():
+        server = await recipe_server.start_server(app, "127.0.0.1", 0)
+        address['host'], address['port'] = server.sockets[0].getsockname()[:2]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=lambda: loop.run_until_complete(start()), daemon=True).start()
+    ready.wait()
+    return address['host'], address['port']
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="压测菜谱 HTTP 接口并报告延迟分位数")
+    arg_parser.add_argument("--url", help="已启动的服务地址，如 http://127.0.0.1:8080；不指定时启动进程内服务")
+    arg_parser.add_argument("--json-file", default=str(ROOT_DIR / "cooklikehoc_recipes.json"), help="进程内服务加载的导出 JSON")
+    arg_parser.add_argument("--cache-size", type=int, default=recipe_server.DEFAULT_CACHE_SIZE, help="进程内服务的 LRU 缓存大小")
+    arg_parser.add_argument("--requests", type=int, default=5000, help="请求总数")
+    arg_parser.add_argument("--concurrency", type=int, default=32, help="并发连接数")
+    arg_parser.add_argument("--revalidate", type=float, default=0.2, help="带 If-None-Match 的请求比例")
+    arg_parser.add_argument("--no-gzip", action="store_true", help="不发送 Accept-Encoding: gzip")
+    arg_parser.add_argument("--seed", type=int, default=42, help="请求序列的随机种子")
+    args = arg_parser.parse_args()
+
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = start_in_process_server(args.json_file, args.cache_size)
+
+    result = asyncio.run(run_load(host, port, args.requests, args.concurrency, args.revalidate,
+                                  not args.no_gzip, args.seed))
+
+    print(f"目标 http://{host}:{port}, {args.concurrency} 个并发连接, gzip {'关' if args.no_gzip else '开'}")
+    print(f"请求数 {result['requests']}, 耗时 {result['seconds']:.2f}s, "
+          f"吞吐 {result['requests'] / result['seconds']:.0f} req/s, 响应体 {result['body_bytes'] / 1024:.0f} KB")
+    print("状态码: " + ", ".join(f"{status} x {count}" for status, count in sorted(result['statuses'].items())))
+    print(f"延迟 p50 {result['p50'] * 1000:.2f} ms, p90 {result['p90'] * 1000:.2f} ms, "
+          f"p99 {result['p99'] * 1000:.2f} ms, max {result['max'] * 1000:.2f} ms")
+    cache = result['server'].get('cache', {})
+    if cache:
+        lookups = cache['hits'] + cache['misses']
+        print(f"服务端响应缓存: {cache['size']}/{cache['capacity']} 项, 命中率 {cache['hits'] / max(1, lookups):.1%}")
+
+
+if __name__ == "__main__":
+    main()
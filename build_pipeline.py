@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+依赖跟踪的构建流水线
+每个阶段声明输入、输出与依赖阶段，构成有向无环图；
+输入文件内容、参数与上游结果的指纹都未变化且输出仍然存在时直接复用上次的结果，
+互不依赖的阶段在线程池中并发执行，最后报告每个阶段的缓存命中情况与耗时
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+BUILD_CACHE_FILE = ".build_cache.json"
+BUILD_CACHE_VERSION = 1
+
+# 阶段状态
+STATUS_RUN = "run"
+STATUS_CACHED = "cached"
+STATUS_FAILED = "failed"
+STATUS_BLOCKED = "blocked"
+
+STATUS_LABELS = {
+    STATUS_RUN: "✅ 已执行",
+    STATUS_CACHED: "⏭️ 命中缓存",
+    STATUS_FAILED: "❌ 失败",
+    STATUS_BLOCKED: "⛔ 依赖失败",
+}
+
+
+@dataclass
+class Stage:
+    """流水线中的一个阶段
+
+    action 接收 {依赖阶段名: 结果} 并返回可 JSON 序列化的结果，命中缓存时该结果从缓存中取回；
+    inputs 与 outputs 为文件或目录路径，目录按其中全部文件的内容计算指纹；
+    同时出现在两者中的路径（阶段读取并更新的文件）按执行后的内容记录指纹
+    """
+    name: str
+    action: Callable[[Dict[str, Any]], Any]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+    description: str = ""
+
+
+@dataclass
+class StageReport:
+    """阶段执行结果"""
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class Fingerprinter:
+    """计算文件与目录内容的指纹，同一次构建中同一文件只读取一次"""
+
+    def __init__(self):
+        self._files: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _file_digest(self, file_path: str) -> str:
+        with self._lock:
+            cached = self._files.get(file_path)
+        if cached is not None:
+            return cached
+
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        with self._lock:
+            self._files[file_path] = digest
+        return digest
+
+    def forget(self, paths: List[str]):
+        """阶段写出输出后丢弃这些路径下的旧指纹"""
+        prefixes = [os.path.normpath(path) for path in paths]
+        with self._lock:
+            for file_path in list(self._files):
+                normalized = os.path.normpath(file_path)
+                if any(normalized == prefix or normalized.startswith(prefix + os.sep) for prefix in prefixes):
+                    del self._files[file_path]
+
+    def path_digest(self, path: str) -> str:
+        """文件取内容哈希；目录按相对路径排序后合并每个文件的哈希；不存在时为 missing"""
+        if os.path.isfile(path):
+            return self._file_digest(path)
+        if not os.path.isdir(path):
+            return "missing"
+
+        sha256 = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                relative_path = os.path.relpath(file_path, path).replace(os.sep, '/')
+                sha256.update(f"{relative_path}\0{self._file_digest(file_path)}\n".encode('utf-8'))
+        return sha256.hexdigest()
+
+
+class BuildPipeline:
+    """按依赖关系调度阶段，跳过指纹未变化的阶段"""
+
+    def __init__(self, stages: List[Stage], cache_file: str = BUILD_CACHE_FILE, jobs: Optional[int] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_file = cache_file
+        self.jobs = jobs or min(4, os.cpu_count() or 1)
+        self.results: Dict[str, Any] = {}
+        self.reports: Dict[str, StageReport] = {}
+        self._fingerprinter = Fingerprinter()
+        self._cache = self._load_cache()
+        self._cache_lock = threading.Lock()
+        self._validate()
+
+    def _validate(self):
+        """检查依赖是否存在且没有环"""
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"阶段 {stage.name} 依赖不存在的阶段 {dep}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"阶段依赖存在环: {name}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _load_cache(self) -> Dict:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache.get('stages', {}) if cache.get('version') == BUILD_CACHE_VERSION else {}
+
+    def _save_cache(self):
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': BUILD_CACHE_VERSION, 'stages': self._cache}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.cache_file)
+
+    def fingerprint(self, stage: Stage) -> str:
+        """阶段指纹：参数、输入内容与上游阶段的结果
+
+        上游重新执行但输出内容与结果都没变时，下游仍可命中缓存
+        """
+        payload = {
+            'params': stage.params,
+            'inputs': {path: self._fingerprinter.path_digest(path) for path in stage.inputs},
+            'deps': {dep: self.results.get(dep) for dep in stage.deps},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _run_stage(self, stage: Stage, force: bool) -> StageReport:
+        started = time.perf_counter()
+        fingerprint = self.fingerprint(stage)
+        with self._cache_lock:
+            cached = self._cache.get(stage.name)
+
+        outputs_present = all(os.path.exists(path) for path in stage.outputs)
+        if not force and cached and cached.get('fingerprint') == fingerprint and outputs_present:
+            self.results[stage.name] = cached.get('result')
+            return StageReport(stage.name, STATUS_CACHED, time.perf_counter() - started)
+
+        print(f"\n▶️ 阶段 {stage.name}: {stage.description or stage.name}")
+        try:
+            result = stage.action({dep: self.results.get(dep) for dep in stage.deps})
+        except Exception as e:
+            return StageReport(stage.name, STATUS_FAILED, time.perf_counter() - started, str(e))
+
+        self._fingerprinter.forget(stage.outputs)
+        if set(stage.inputs) & set(stage.outputs):
+            # 阶段更新了自己读取的文件（如追加新菜谱的 ID 映射），按写出后的内容记录指纹，
+            # 否则下次运行会因为自己的输出而再次执行
+            fingerprint = self.fingerprint(stage)
+        self.results[stage.name] = result
+        with self._cache_lock:
+            self._cache[stage.name] = {'fingerprint': fingerprint, 'result': result}
+        return StageReport(stage.name, STATUS_RUN, time.perf_counter() - started)
+
+    def run(self, force: bool = False) -> bool:
+        """执行全部阶段，返回是否全部成功"""
+        pending = dict(self.stages)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while pending or running:
+                # 依赖失败的阶段不再执行，并沿依赖链继续传递
+                blocked = True
+                while blocked:
+                    blocked = False
+                    for name, stage in list(pending.items()):
+                        failed = [dep for dep in stage.deps if dep in self.reports
+                                  and self.reports[dep].status in (STATUS_FAILED, STATUS_BLOCKED)]
+                        if failed:
+                            self.reports[name] = StageReport(name, STATUS_BLOCKED, error=f"依赖失败: {', '.join(failed)}")
+                            del pending[name]
+                            blocked = True
+
+                # 依赖全部完成的阶段提交执行
+                for name, stage in list(pending.items()):
+                    if all(dep in self.reports for dep in stage.deps):
+                        running[executor.submit(self._run_stage, stage, force)] = name
+                        del pending[name]
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report = future.result()
+                    self.reports[running.pop(future)] = report
+                    if report.status == STATUS_FAILED:
+                        print(f"❌ 阶段 {report.name} 失败: {report.error}")
+
+        self._save_cache()
+        return all(report.status in (STATUS_RUN, STATUS_CACHED) for report in self.reports.values())
+
+    def print_report(self):
+        """打印每个阶段的状态与耗时"""
+        print("\n📋 构建阶段报告")
+        print(f"{'阶段':<16}{'状态':<14}{'耗时(s)':>10}")
+        total = 0.0
+        for name in self.stages:
+            report = self.reports.get(name)
+            if report is None:
+                continue
+            total += report.seconds
+            line = f"{name:<16}{STATUS_LABELS[report.status]:<14}{report.seconds:>10.2f}"
+            if report.error and report.status == STATUS_BLOCKED:
+                line += f"  ({report.error})"
+            print(line)
+        hits = sum(report.status == STATUS_CACHED for report in self.reports.values())
+        print(f"缓存命中 {hits}/{len(self.reports)} 个阶段，阶段耗时合计 {total:.2f}s")
@@ -2,47 +2,163 @@
 # -*- coding: utf-8 -*-
 """
 将导入的菜谱数据复制到 Android 项目的 assets 目录
+按大小与内容哈希增量同步：只复制变化的文件并删除源中已不存在的文件，
+未变化的文件保持原样，不会改动时间戳而触发 Gradle 重新合并与压缩 assets
 """
 
 import os
 import shutil
-import json
+import hashlib
+import argparse
+from dataclasses import dataclass
 
-def copy_assets_to_android():
-    """复制资源文件到 Android 项目"""
+try:
+    import fcntl
+except ImportError:  # Windows 上没有 fcntl，reflink 自动退回普通复制
+    fcntl = None
+
+# Linux FICLONE ioctl：在 Btrfs、XFS 等文件系统上共享数据块的写时复制克隆
+FICLONE = 0x40049409
+
+LINK_MODES = ("copy", "hardlink", "reflink")
+
+@dataclass
+class SyncStats:
+    """同步统计"""
+    copied_files: int = 0
+    copied_bytes: int = 0
+    linked_files: int = 0
+    skipped_files: int = 0
+    skipped_bytes: int = 0
+    removed_files: int = 0
+    
+    def summary(self) -> str:
+        text = (f"复制 {self.copied_files} 个文件 ({self.copied_bytes / 1024:.1f} KB), "
+                f"跳过 {self.skipped_files} 个未变化文件 ({self.skipped_bytes / 1024:.1f} KB), "
+                f"删除 {self.removed_files} 个过期文件")
+        if self.linked_files:
+            text += f", 其中 {self.linked_files} 个以链接方式放置"
+        return text
+
+def _file_sha256(file_path):
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+def files_identical(src_file, dst_file):
+    """大小不同直接判定为不同，大小相同时比较内容哈希"""
+    if not os.path.isfile(dst_file) or os.path.getsize(src_file) != os.path.getsize(dst_file):
+        return False
+    if os.path.samefile(src_file, dst_file):
+        return True
+    return _file_sha256(src_file) == _file_sha256(dst_file)
+
+def _reflink(src_file, dst_file):
+    with open(src_file, 'rb') as src, open(dst_file, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(src_file, dst_file)
+
+def _place_file(src_file, dst_file, link):
+    """经临时文件放置 dst_file；链接失败（跨设备、文件系统不支持）时退回普通复制，返回是否链接成功
+
+    DataImporter 通过临时文件替换写出，源文件更新后硬链接自然断开，不会改到已同步的副本
+    """
+    temp_file = f"{dst_file}.tmp"
+    if os.path.exists(temp_file):
+        os.remove(temp_file)
+    linked = False
+    try:
+        if link == "hardlink":
+            os.link(src_file, temp_file)
+            linked = True
+        elif link == "reflink" and fcntl is not None:
+            _reflink(src_file, temp_file)
+            linked = True
+    except OSError:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    if not linked:
+        shutil.copy2(src_file, temp_file)
+    os.replace(temp_file, dst_file)
+    return linked
+
+def sync_file(src_file, dst_file, stats=None, link="copy"):
+    """内容不同时才复制 src_file 到 dst_file，返回是否复制"""
+    stats = stats if stats is not None else SyncStats()
+    size = os.path.getsize(src_file)
+    if files_identical(src_file, dst_file):
+        stats.skipped_files += 1
+        stats.skipped_bytes += size
+        return False
+    
+    os.makedirs(os.path.dirname(dst_file) or '.', exist_ok=True)
+    if _place_file(src_file, dst_file, link):
+        stats.linked_files += 1
+    stats.copied_files += 1
+    stats.copied_bytes += size
+    return True
+
+def sync_tree(src_dir, dst_dir, stats=None, link="copy"):
+    """把 dst_dir 同步为 src_dir 的镜像：复制变化的文件，删除多余的文件与空目录"""
+    stats = stats if stats is not None else SyncStats()
+    expected = set()
+    for root, _, files in os.walk(src_dir):
+        relative_root = os.path.relpath(root, src_dir)
+        for name in files:
+            relative_path = os.path.normpath(os.path.join(relative_root, name))
+            expected.add(relative_path)
+            sync_file(os.path.join(src_dir, relative_path), os.path.join(dst_dir, relative_path), stats, link)
     
-    # 源目录和目标目录
-    source_dir = "."
-    android_assets_dir = "android_app/app/src/main/assets"
+    for root, dirs, files in os.walk(dst_dir, topdown=False):
+        relative_root = os.path.relpath(root, dst_dir)
+        for name in files:
+            if os.path.normpath(os.path.join(relative_root, name)) not in expected:
+                os.remove(os.path.join(root, name))
+                stats.removed_files += 1
+        if root != dst_dir and not os.listdir(root):
+            os.rmdir(root)
+    return stats
+
+def copy_assets_to_android(source_dir=".", android_assets_dir="android_app/app/src/main/assets", link="copy",
+                           layout=None):
+    """复制资源文件到 Android 项目
+
+    source_dir 为 DataImporter 输出 android_assets/ 的目录（合并的菜谱文件由 prepare_recipe_data.py 负责）；
+    link 为 hardlink / reflink 时尽量以链接代替复制，不支持时退回普通复制；
+    layout 为随后 prepare_recipe_data.py 使用的布局（copies / store），为 None 时按 manifest.json 是否存在判断；
+    返回 SyncStats
+    """
+    stats = SyncStats()
     
     # 创建 assets 目录
     os.makedirs(android_assets_dir, exist_ok=True)
     
-    print("🚀 开始复制资源文件到 Android 项目...")
+    print("🚀 开始同步资源文件到 Android 项目...")
     
-    # 复制主菜谱数据文件
-    main_recipe_file = "cooklikehoc_recipes.json"
-    if os.path.exists(main_recipe_file):
-        shutil.copy2(main_recipe_file, android_assets_dir)
-        print(f"✅ 已复制: {main_recipe_file}")
+    # assets/cooklikehoc_recipes.json 由 prepare_recipe_data.py 以应用所需的列表格式（带稳定 ID）写出，
+    # 这里不再同步导入器格式的合并文件，否则每次都会先被覆盖再被重写
+    # prepare_recipe_data.py --layout store 生成的内容寻址布局已包含全部菜谱数据，
+    # 再复制完整副本会重新引入冗余数据
+    if layout is None:
+        layout = "store" if os.path.exists(os.path.join(android_assets_dir, "manifest.json")) else "copies"
+    if layout == "store":
+        print("📦 内容寻址布局，跳过分类数据的复制")
     else:
-        print(f"❌ 文件不存在: {main_recipe_file}")
+        # 复制分类数据文件
+        android_assets_source = os.path.join(source_dir, "android_assets")
+        android_assets_target = os.path.join(android_assets_dir, "android_assets")
     
-    # 复制分类数据文件
-    android_assets_source = "android_assets"
-    android_assets_target = os.path.join(android_assets_dir, "android_assets")
-    
-    if os.path.exists(android_assets_source):
-        if os.path.exists(android_assets_target):
-            shutil.rmtree(android_assets_target)
-        shutil.copytree(android_assets_source, android_assets_target)
-        print(f"✅ 已复制目录: {android_assets_source}")
+        if os.path.exists(android_assets_source):
+            sync_tree(android_assets_source, android_assets_target, stats, link)
+            print(f"✅ 已同步目录: {android_assets_source}")
         
-        # 统计文件数量
-        file_count = len([f for f in os.listdir(android_assets_target) if f.endswith('.json')])
-        print(f"📊 共复制了 {file_count} 个分类数据文件")
-    else:
-        print(f"❌ 目录不存在: {android_assets_source}")
+            # 统计文件数量
+            file_count = len([f for f in os.listdir(android_assets_target) if f.endswith('.json')])
+            print(f"📊 目标目录共有 {file_count} 个分类数据文件")
+        else:
+            print(f"❌ 目录不存在: {android_assets_source}")
     
     # 验证复制结果
     print("\n📋 Android Assets 目录结构:")
@@ -54,8 +170,14 @@ def copy_assets_to_android():
         for file in files:
             print(f"{subindent}{file}")
     
+    print(f"\n📊 {stats.summary()}")
     print("\n🎉 资源文件复制完成！")
     print("💡 现在可以在 Android Studio 中打开项目并构建应用了。")
+    return stats
 
 if __name__ == "__main__":
-    copy_assets_to_android()
\ No newline at end of file
+    arg_parser = argparse.ArgumentParser(description="增量同步菜谱数据到 Android 项目的 assets 目录")
+    arg_parser.add_argument("--link", default="copy", choices=LINK_MODES,
+                            help="copy: 复制; hardlink / reflink: 文件系统支持时以链接代替复制")
+    args = arg_parser.parse_args()
+    copy_assets_to_android(link=args.link)
\ No newline at end of file
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱图片元数据清单
+只读取文件头得到每张被引用图片的宽高与字节数，并计算主色调与 BlurHash 占位符，
+写出以 image_path 为键的 image_metadata.json，使列表卡片在图片解码前即可预留布局并显示占位色；
+按源图内容哈希缓存，未变化的图片不再重新计算
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import struct
+import hashlib
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # 可选依赖: pip install Pillow，缺失时只记录尺寸与字节数
+    Image = None
+
+from asset_store import IMAGES_DIR, image_name_from_path
+
+METADATA_FILE = "image_metadata.json"
+METADATA_VERSION = 2
+
+# BlurHash 分量数 (横向, 纵向) 与计算时使用的采样边长
+BLURHASH_COMPONENTS = (4, 3)
+SAMPLE_SIZE = 32
+
+BASE83_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+# JPEG 中携带图像尺寸的帧起始标记（C4/C8/CC 不是 SOF）
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# EXIF 方向为 5-8 时图片需要旋转 90 度显示，宽高互换
+EXIF_TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def _file_sha256(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _jpeg_orientation(segment: bytes) -> int:
+    """从 APP1 段中读取 EXIF 方向，找不到时返回 1"""
+    if not segment.startswith(b'Exif\x00\x00'):
+        return 1
+    tiff = segment[6:]
+    byte_order = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+    if byte_order is None or len(tiff) < 8:
+        return 1
+    ifd_offset = struct.unpack(f'{byte_order}I', tiff[4:8])[0]
+    if ifd_offset + 2 > len(tiff):
+        return 1
+    entry_count = struct.unpack(f'{byte_order}H', tiff[ifd_offset:ifd_offset + 2])[0]
+    for index in range(entry_count):
+        entry = tiff[ifd_offset + 2 + index * 12:ifd_offset + 14 + index * 12]
+        if len(entry) < 12:
+            break
+        tag, _, _ = struct.unpack(f'{byte_order}HHI', entry[:8])
+        if tag == 0x0112:
+            return struct.unpack(f'{byte_order}H', entry[8:10])[0]
+    return 1
+
+
+def _jpeg_size(f) -> Optional[Tuple[int, int]]:
+    """逐段查找 SOF 标记读取尺寸；文件被截断或段结构损坏时返回 None"""
+    orientation = 1
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        # 标记之间允许填充 0xFF
+        while marker[1] == 0xFF:
+            next_byte = f.read(1)
+            if not next_byte:
+                return None
+            marker = marker[1:] + next_byte
+        if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if length < 2:
+            return None
+        if marker[1] in JPEG_SOF_MARKERS:
+            frame_header = f.read(5)
+            if len(frame_header) < 5:
+                return None
+            height, width = struct.unpack('>xHH', frame_header)
+            if orientation in EXIF_TRANSPOSED_ORIENTATIONS:
+                width, height = height, width
+            return width, height
+        if marker[1] == 0xE1 and orientation == 1:
+            orientation = _jpeg_orientation(f.read(length - 2))
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_header(file_path: str) -> Optional[Tuple[str, int, int]]:
+    """只读取文件头，返回 (格式, 宽, 高)；无法识别时返回 None
+
+    支持 PNG、JPEG（按 EXIF 方向换算为显示尺寸）、GIF 与 WebP
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(30)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', head[16:24])
+            return 'png', width, height
+        if head.startswith(b'\xff\xd8'):
+            size = _jpeg_size(f)
+            return ('jpeg', *size) if size else None
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            width, height = struct.unpack('<HH', head[6:10])
+            return 'gif', width, height
+        if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+            chunk = head[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', head[26:30])
+                return 'webp', width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L':
+                bits = int.from_bytes(head[21:25], 'little')
+                return 'webp', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                return 'webp', int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+    return None
+
+
+def _encode_base83(value: int, length: int) -> str:
+    return "".join(BASE83_CHARS[(value // 83 ** (length - index - 1)) % 83] for index in range(length))
+
+
+def _srgb_to_linear(value: int) -> float:
+    value = value / 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value: float) -> int:
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def encode_blurhash(pixels: Sequence[Tuple[int, int, int]], width: int, height: int,
+                    components: Tuple[int, int] = BLURHASH_COMPONENTS) -> str:
+    """按 BlurHash 算法把按行排列的 RGB 像素编码为占位字符串"""
+    x_components, y_components = components
+    linear = [(_srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)) for r, g, b in pixels]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            scale = (1 if i == 0 and j == 0 else 2) / (width * height)
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[i][x] * cos_y[j][y]
+                    pixel = linear[row + x]
+                    r += basis * pixel[0]
+                    g += basis * pixel[1]
+                    b += basis * pixel[2]
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode_base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, int(math.floor(max(abs(v) for f in ac for v in f) * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+        result += _encode_base83(quantised_max, 1)
+    else:
+        maximum = 1.0
+        result += _encode_base83(0, 1)
+
+    result += _encode_base83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        quantised = [
+            max(0, min(18, int(math.floor(math.copysign(abs(v / maximum) ** 0.5, v) * 9 + 9.5))))
+            for v in factor
+        ]
+        result += _encode_base83(quantised[0] * 19 * 19 + quantised[1] * 19 + quantised[2], 2)
+    return result
+
+
+def dominant_color(pixels: Sequence[Tuple[int, int, int]]) -> str:
+    """把像素按每通道 4 位分桶，返回像素最多的桶的平均颜色 (#rrggbb)"""
+    buckets = Counter((r >> 4, g >> 4, b >> 4) for r, g, b in pixels)
+    top = buckets.most_common(1)[0][0]
+    members = [pixel for pixel in pixels if (pixel[0] >> 4, pixel[1] >> 4, pixel[2] >> 4) == top]
+    average = [round(sum(pixel[channel] for pixel in members) / len(members)) for channel in range(3)]
+    return "#{:02x}{:02x}{:02x}".format(*average)
+
+
+def _analyze_image(file_path: str) -> Dict:
+    """在工作进程中计算一张图片的元数据"""
+    header = read_image_header(file_path)
+    entry = {
+        'format': header[0] if header else None,
+        'width': header[1] if header else None,
+        'height': header[2] if header else None,
+        'bytes': os.path.getsize(file_path),
+        'dominant_color': None,
+        'blurhash': None
+    }
+    if Image is None:
+        return entry
+
+    with Image.open(file_path) as source:
+        if header is None:
+            # draft 会缩小 source.size，先取完整尺寸并按 EXIF 方向换算为显示尺寸
+            width, height = source.size
+            if source.getexif().get(0x0112, 1) in EXIF_TRANSPOSED_ORIENTATIONS:
+                width, height = height, width
+            entry['width'], entry['height'] = width, height
+        # 只需要很小的采样图，JPEG 可直接按比例缩小解码
+        source.draft('RGB', (SAMPLE_SIZE, SAMPLE_SIZE))
+        # 占位符与主色调按显示方向计算，与记录的宽高一致
+        oriented = ImageOps.exif_transpose(source)
+        if oriented.mode in ('RGBA', 'LA') or (oriented.mode == 'P' and 'transparency' in oriented.info):
+            # 透明区域按白色背景合成，与卡片背景一致
+            rgba = oriented.convert('RGBA')
+            background = Image.new('RGBA', rgba.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, rgba).convert('RGB')
+        else:
+            image = oriented.convert('RGB')
+    image.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE), Image.BILINEAR)
+    pixels = list(image.getdata())
+    entry['dominant_color'] = dominant_color(pixels)
+    entry['blurhash'] = encode_blurhash(pixels, image.width, image.height)
+    return entry
+
+
+def _load_cache(metadata_file: str) -> Dict:
+    try:
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if metadata.get('version') != METADATA_VERSION or metadata.get('components') != list(BLURHASH_COMPONENTS):
+        return {}
+    return metadata.get('images', {})
+
+
+def _is_cached(entry: Optional[Dict], digest: str) -> bool:
+    """哈希一致且（未安装 Pillow 或）占位符已计算时复用缓存"""
+    if not entry or entry.get('sha256') != digest:
+        return False
+    return Image is None or entry.get('blurhash') is not None
+
+
+def build_image_metadata(recipes: Iterable[Dict], assets_dir: str, workers: Optional[int] = None) -> Dict:
+    """为 recipes 引用的图片生成 assets_dir/image_metadata.json，返回清单
+
+    images 以 assets 内的 image_path（images/x.png）为键
+    """
+    started = time.perf_counter()
+    metadata_file = os.path.join(assets_dir, METADATA_FILE)
+    cached = _load_cache(metadata_file)
+
+    image_paths = set()
+    missing = set()
+    for recipe in recipes:
+        image_name = image_name_from_path(recipe.get('image_path', ''))
+        if not image_name:
+            continue
+        if os.path.isfile(os.path.join(assets_dir, IMAGES_DIR, image_name)):
+            image_paths.add(f"{IMAGES_DIR}/{image_name}")
+        else:
+            missing.add(image_name)
+
+    images = {}
+    pending = {}
+    for image_path in sorted(image_paths):
+        digest = _file_sha256(os.path.join(assets_dir, *image_path.split('/')))
+        if _is_cached(cached.get(image_path), digest):
+            images[image_path] = cached[image_path]
+        else:
+            pending[image_path] = digest
+
+    analyzed = 0
+    if pending:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = {
+                image_path: executor.submit(_analyze_image, os.path.join(assets_dir, *image_path.split('/')))
+                for image_path in pending
+            }
+            for image_path, future in futures.items():
+                try:
+                    images[image_path] = {'sha256': pending[image_path], **future.result()}
+                    analyzed += 1
+                except Exception as e:
+                    print(f"❌ 读取图片元数据失败: {image_path} - {e}")
+
+    metadata = {
+        'version': METADATA_VERSION,
+        'components': list(BLURHASH_COMPONENTS),
+        'images': dict(sorted(images.items()))
+    }
+    temp_file = f"{metadata_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, metadata_file)
+
+    print(f"🖼️ 图片元数据: {len(images)} 张, 重新计算 {analyzed} 张, 缓存命中 {len(images) - analyzed} 张, "
+          f"耗时 {time.perf_counter() - started:.2f}s")
+    if Image is None:
+        print("⚠️ 未安装 Pillow，仅记录尺寸与字节数，未生成主色调与占位符: pip install Pillow")
+    if missing:
+        print(f"⚠️ {len(missing)} 张引用的图片不存在: {', '.join(sorted(missing)[:10])}")
+    return metadata
+
+
+def main():
+    """主函数"""
+    assets_dir = os.path.join("android_app", "app", "src", "main", "assets")
+    arg_parser = argparse.ArgumentParser(description="生成菜谱图片的尺寸、主色调与占位符清单")
+    arg_parser.add_argument("--recipes", default="cooklikehoc_recipes.json", help="菜谱 JSON 文件")
+    arg_parser.add_argument("--assets-dir", default=assets_dir, help="Android assets 目录（包含 images/）")
+    arg_parser.add_argument("--workers", type=int, help="进程数，默认 CPU 核数")
+    args = arg_parser.parse_args()
+
+    with open(args.recipes, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    recipes: List[Dict] = data['recipes'] if isinstance(data, dict) else data
+
+    if not os.path.isdir(os.path.join(args.assets_dir, IMAGES_DIR)):
+        print(f"❌ 图片目录不存在: {os.path.join(args.assets_dir, IMAGES_DIR)}")
+        sys.exit(1)
+
+    build_image_metadata(recipes, args.assets_dir, args.workers)
+    print(f"✅ 图片元数据已生成: {os.path.join(args.assets_dir, METADATA_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
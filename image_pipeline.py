@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱图片衍生图生成
+为每张被菜谱引用的图片按 Android 屏幕密度生成列表缩略图与详情图两种尺寸的 WebP，
+在进程池中并行处理，源图哈希与生成参数都未变化的图片直接跳过，
+并写出把菜谱映射到各个衍生图的 image_manifest.json
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # 可选依赖: pip install Pillow
+    Image = None
+
+from asset_store import image_name_from_path
+from recipe_ids import DEFAULT_ID_MAP_FILE, RecipeIdMap
+
+# Android 密度分组相对 mdpi 的缩放倍数
+DENSITY_SCALES = {
+    'mdpi': 1.0,
+    'hdpi': 1.5,
+    'xhdpi': 2.0,
+    'xxhdpi': 3.0,
+    'xxxhdpi': 4.0,
+}
+
+# 各用途的最大显示尺寸 (宽, 高)，单位 dp：列表卡片图高 180dp，详情页图高 250dp
+VARIANT_SIZES = {
+    'thumb': (240, 180),
+    'detail': (400, 250),
+}
+
+MANIFEST_NAME = "image_manifest.json"
+MANIFEST_VERSION = 2
+
+# EXIF Orientation 为 5-8 时图片需要转置，显示的宽高与存储的宽高互换
+EXIF_ORIENTATION_TAG = 0x0112
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def _file_sha256(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _recipe_field(recipe, name: str) -> str:
+    """同时支持 Recipe 对象与导出 JSON 中的菜谱字典"""
+    return recipe.get(name, "") if isinstance(recipe, dict) else getattr(recipe, name, "")
+
+
+def _variant_path(variant: str, density: str, image_name: str) -> str:
+    """衍生图相对输出目录的路径"""
+    stem = os.path.splitext(image_name)[0]
+    return f"{variant}/{density}/{stem}.webp"
+
+
+def _render_image(source_file: str, targets: List[Tuple[str, int, int]], output_dir: str,
+                  quality: int) -> Dict:
+    """在工作进程中生成一张源图的全部衍生图
+
+    targets 为 (相对路径, 最大宽度, 最大高度) 列表，返回源图按 EXIF 方向校正后的尺寸与每个衍生图的实际尺寸和大小
+    """
+    with Image.open(source_file) as source:
+        # draft 会缩小 source.size，先取完整尺寸再按方向校正
+        width, height = source.size
+        if source.getexif().get(EXIF_ORIENTATION_TAG, 1) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        # JPEG 可在解码时直接按 1/2、1/4、1/8 缩小，最大目标尺寸之上的像素不必完整解码
+        largest = max(targets, key=lambda target: target[1] * target[2])
+        source.draft('RGB', (largest[1], largest[2]))
+        image = ImageOps.exif_transpose(source)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    variants = {}
+    for relative_path, max_width, max_height in targets:
+        resized = image.copy()
+        # thumbnail 保持宽高比且不会放大
+        resized.thumbnail((max_width, max_height), Image.LANCZOS)
+
+        output_file = os.path.join(output_dir, *relative_path.split('/'))
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        temp_file = f"{output_file}.tmp"
+        resized.save(temp_file, 'WEBP', quality=quality, method=6)
+        os.replace(temp_file, output_file)
+
+        variants[relative_path] = {
+            'width': resized.width,
+            'height': resized.height,
+            'bytes': os.path.getsize(output_file)
+        }
+
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+class ImageDerivativePipeline:
+    """图片衍生图生成流水线"""
+
+    def __init__(self, images_dir: str, output_dir: str, densities: Optional[Iterable[str]] = None,
+                 quality: int = 80, workers: Optional[int] = None):
+        self.images_dir = images_dir
+        self.output_dir = output_dir
+        self.densities = list(densities or DENSITY_SCALES)
+        self.quality = quality
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest_file = os.path.join(output_dir, MANIFEST_NAME)
+
+        unknown = [density for density in self.densities if density not in DENSITY_SCALES]
+        if unknown:
+            raise ValueError(f"未知的屏幕密度: {', '.join(unknown)}")
+
+    def _settings(self) -> Dict:
+        """影响输出的参数，任何一项变化都需要重新生成全部衍生图"""
+        return {
+            'densities': self.densities,
+            'variant_sizes': {variant: list(size) for variant, size in VARIANT_SIZES.items()},
+            'quality': self.quality
+        }
+
+    def _targets(self, image_name: str) -> List[Tuple[str, int, int]]:
+        targets = []
+        for variant, (width_dp, height_dp) in VARIANT_SIZES.items():
+            for density in self.densities:
+                scale = DENSITY_SCALES[density]
+                targets.append((_variant_path(variant, density, image_name),
+                                round(width_dp * scale), round(height_dp * scale)))
+        return targets
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('settings') != self._settings():
+            return {}
+        return manifest
+
+    def _is_current(self, entry: Optional[Dict], digest: str) -> bool:
+        """源图哈希未变且衍生图都还在时无需重新生成"""
+        if not entry or entry['sha256'] != digest:
+            return False
+        return all(
+            os.path.exists(os.path.join(self.output_dir, *relative_path.split('/')))
+            for relative_path in entry['variants']
+        )
+
+    def run(self, recipes: Iterable, id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE) -> Dict:
+        """为 recipes 引用的图片生成衍生图并写出清单，返回清单
+
+        清单中的菜谱以稳定 ID 为键（标题在不同分类间可能重复）：菜谱自带 id 时直接使用，
+        否则按 id_map_file 中的映射分配，只读取不写回
+        """
+        if Image is None:
+            raise RuntimeError("生成 WebP 衍生图需要 Pillow: pip install Pillow")
+
+        started = time.perf_counter()
+        previous = self._load_manifest().get('images', {})
+
+        id_map = RecipeIdMap(id_map_file)
+        recipe_images = {}
+        missing = []
+        for recipe in recipes:
+            # 重名菜谱按出现顺序编号，每个菜谱都要依次分配，不能跳过没有图片的
+            recipe_id = _recipe_field(recipe, 'id') or id_map.assign(_recipe_field(recipe, 'category'),
+                                                                      _recipe_field(recipe, 'title'))
+            image_name = image_name_from_path(_recipe_field(recipe, 'image_path'))
+            if not image_name:
+                continue
+            if os.path.isfile(os.path.join(self.images_dir, image_name)):
+                recipe_images[recipe_id] = image_name
+            else:
+                missing.append(image_name)
+
+        images = {}
+        pending = {}
+        rendered = 0
+        for image_name in sorted(set(recipe_images.values())):
+            digest = _file_sha256(os.path.join(self.images_dir, image_name))
+            if self._is_current(previous.get(image_name), digest):
+                images[image_name] = previous[image_name]
+            else:
+                pending[image_name] = digest
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+                futures = {
+                    image_name: executor.submit(
+                        _render_image, os.path.join(self.images_dir, image_name),
+                        self._targets(image_name), self.output_dir, self.quality
+                    )
+                    for image_name in pending
+                }
+                for image_name, future in futures.items():
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"❌ 生成衍生图失败: {image_name} - {e}")
+                        continue
+                    images[image_name] = {'sha256': pending[image_name], **result}
+                    rendered += 1
+
+        removed = self._remove_stale_variants(images)
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'settings': self._settings(),
+            'recipes': {str(recipe_id): image_name for recipe_id, image_name in sorted(recipe_images.items())},
+            'images': dict(sorted(images.items()))
+        }
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_file = f"{self.manifest_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_file, self.manifest_file)
+
+        source_bytes = sum(os.path.getsize(os.path.join(self.images_dir, name)) for name in images)
+        variant_bytes = sum(variant['bytes'] for image in images.values() for variant in image['variants'].values())
+        print(f"🖼️ 衍生图: {len(images)} 张源图, 重新生成 {rendered} 张, 跳过 {len(images) - rendered} 张, "
+              f"删除过期文件 {removed} 个, 耗时 {time.perf_counter() - started:.2f}s")
+        print(f"   源图 {source_bytes / 1024 / 1024:.1f}MB -> 衍生图合计 {variant_bytes / 1024 / 1024:.1f}MB "
+              f"({len(self.densities)} 个密度 x {len(VARIANT_SIZES)} 种尺寸)")
+        if missing:
+            print(f"⚠️ {len(missing)} 张引用的图片不存在: {', '.join(sorted(set(missing))[:10])}")
+        return manifest
+
+    def _remove_stale_variants(self, images: Dict) -> int:
+        """删除不再属于任何图片的 .webp 文件"""
+        live = {
+            os.path.normpath(os.path.join(self.output_dir, *relative_path.split('/')))
+            for image in images.values() for relative_path in image['variants']
+        }
+        removed = 0
+        for variant in VARIANT_SIZES:
+            variant_dir = os.path.join(self.output_dir, variant)
+            for root, _, files in os.walk(variant_dir):
+                for name in files:
+                    file_path = os.path.normpath(os.path.join(root, name))
+                    if name.endswith('.webp') and file_path not in live:
+                        os.remove(file_path)
+                        removed += 1
+        return removed
+
+
+def load_recipes(recipes_file: str) -> List[Dict]:
+    """读取 DataImporter 导出的 {"recipes": [...]} 或 prepare_recipe_data 输出的菜谱数组"""
+    with open(recipes_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data['recipes'] if isinstance(data, dict) else data
+
+
+def main():
+    """主函数"""
+    assets_dir = os.path.join("android_app", "app", "src", "main", "assets")
+    arg_parser = argparse.ArgumentParser(description="为菜谱图片生成各屏幕密度的 WebP 衍生图")
+    arg_parser.add_argument("--recipes", default="cooklikehoc_recipes.json", help="菜谱 JSON 文件")
+    arg_parser.add_argument("--images-dir", default=os.path.join(assets_dir, "images"), help="源图目录")
+    arg_parser.add_argument("--output-dir", default=os.path.join(assets_dir, "image_variants"), help="输出目录")
+    arg_parser.add_argument("--densities", nargs="+", choices=list(DENSITY_SCALES), help="要生成的屏幕密度，默认全部")
+    arg_parser.add_argument("--quality", type=int, default=80, help="WebP 质量 (0-100)")
+    arg_parser.add_argument("--workers", type=int, help="进程数，默认 CPU 核数")
+    args = arg_parser.parse_args()
+
+    if Image is None:
+        print("❌ 生成 WebP 衍生图需要 Pillow 库: pip install Pillow")
+        sys.exit(1)
+
+    pipeline = ImageDerivativePipeline(args.images_dir, args.output_dir, args.densities, args.quality, args.workers)
+    pipeline.run(load_recipes(args.recipes))
+    print(f"✅ 图片清单已生成: {pipeline.manifest_file}")
+
+
+if __name__ == "__main__":
+    main()
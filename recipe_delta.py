@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱增量更新包
+比较 DataImporter 导出的两个 {"metadata": ..., "recipes": [...]} 文件，
+以稳定菜谱 ID（与 RecipeIdMap、预置数据库一致）为键计算新增、删除与修改（只记录变化的字段）的菜谱，
+写出带版本链（基准与目标导出的哈希）的增量文件；apply_delta 由旧导出加增量还原出新导出
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from typing import Dict, List, Optional
+
+from asset_output import OUTPUT_PROFILES, write_json
+from recipe_ids import DEFAULT_ID_MAP_FILE, RecipeIdMap
+
+DELTA_FORMAT = "cooklikehoc-delta"
+DELTA_VERSION = 2
+
+
+def recipe_keys(export: Dict, id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE) -> List[int]:
+    """导出中每个菜谱的稳定键，即应用使用的菜谱 ID
+
+    菜谱自带 id（prepare_recipe_data 的输出）时直接使用，否则按 id_map_file 中的映射分配（只读取不写回）；
+    重名菜谱按在导出中出现的顺序得到 键#2、键#3 … 对应的 ID，与分类文件和预置数据库一致
+    """
+    id_map = RecipeIdMap(id_map_file)
+    return [recipe.get('id') or id_map.assign(recipe['category'], recipe['title']) for recipe in export['recipes']]
+
+
+def export_digest(export: Dict) -> str:
+    """导出内容的哈希，作为增量版本链中的版本标识"""
+    canonical = json.dumps(export, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _index_recipes(export: Dict, id_map_file: Optional[str]) -> Dict[int, Dict]:
+    recipes = {}
+    for key, recipe in zip(recipe_keys(export, id_map_file), export['recipes']):
+        if key in recipes:
+            raise ValueError(f"导出中存在重复的菜谱 ID: {key}")
+        recipes[key] = recipe
+    return recipes
+
+
+def compute_delta(old_export: Dict, new_export: Dict, id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE) -> Dict:
+    """计算从 old_export 到 new_export 的增量，id_map_file 为分配菜谱 ID 的映射文件"""
+    old_recipes = _index_recipes(old_export, id_map_file)
+    new_recipes = _index_recipes(new_export, id_map_file)
+
+    removed = [key for key in old_recipes if key not in new_recipes]
+    modified = []
+    for key, recipe in new_recipes.items():
+        previous = old_recipes.get(key)
+        if previous is None or previous == recipe:
+            continue
+        changes = {'key': key}
+        changed_fields = {field: value for field, value in recipe.items() if previous.get(field, object()) != value}
+        if changed_fields:
+            changes['set'] = changed_fields
+        unset_fields = [field for field in previous if field not in recipe]
+        if unset_fields:
+            changes['unset'] = unset_fields
+        modified.append(changes)
+
+    # 新增菜谱记录其在新导出中的位置与 ID；保留的菜谱相对顺序变化时才写出完整顺序
+    new_keys = list(new_recipes)
+    added = [[index, key, new_recipes[key]] for index, key in enumerate(new_keys) if key not in old_recipes]
+    kept_old_order = [key for key in old_recipes if key in new_recipes]
+    kept_new_order = [key for key in new_keys if key in old_recipes]
+
+    delta = {
+        'format': DELTA_FORMAT,
+        'version': DELTA_VERSION,
+        'base': export_digest(old_export),
+        'target': export_digest(new_export),
+        'removed': removed,
+        'added': added,
+        'modified': modified
+    }
+    if kept_old_order != kept_new_order:
+        delta['order'] = new_keys
+    extra_old = {key: value for key, value in old_export.items() if key != 'recipes'}
+    extra_new = {key: value for key, value in new_export.items() if key != 'recipes'}
+    if extra_old != extra_new:
+        delta['header'] = extra_new
+    return delta
+
+
+def apply_delta(old_export: Dict, delta: Dict, verify: bool = True,
+                id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE) -> Dict:
+    """把增量应用到旧导出上，返回新导出；id_map_file 须与生成增量时相同
+
+    基准哈希不匹配（增量不是基于这个导出生成的）或结果与目标哈希不一致时抛出 ValueError
+    """
+    if delta.get('format') != DELTA_FORMAT or delta.get('version') != DELTA_VERSION:
+        raise ValueError(f"不支持的增量格式: {delta.get('format')} v{delta.get('version')}")
+    if verify and export_digest(old_export) != delta['base']:
+        raise ValueError(f"增量的基准版本 {delta['base'][:12]} 与当前导出不一致")
+
+    recipes = _index_recipes(old_export, id_map_file)
+    for key in delta['removed']:
+        if recipes.pop(key, None) is None:
+            raise ValueError(f"要删除的菜谱不存在: {key}")
+    for changes in delta['modified']:
+        recipe = recipes.get(changes['key'])
+        if recipe is None:
+            raise ValueError(f"要修改的菜谱不存在: {changes['key']}")
+        recipe = {field: value for field, value in recipe.items() if field not in changes.get('unset', ())}
+        recipe.update(changes.get('set', {}))
+        recipes[changes['key']] = recipe
+
+    if 'order' in delta:
+        added = {key: recipe for _, key, recipe in delta['added']}
+        new_recipes = [recipes.get(key) or added[key] for key in delta['order']]
+    else:
+        new_recipes = list(recipes.values())
+        for index, _, recipe in delta['added']:
+            new_recipes.insert(index, recipe)
+
+    header = delta.get('header', {key: value for key, value in old_export.items() if key != 'recipes'})
+    new_export = {**header, 'recipes': new_recipes}
+    if verify and export_digest(new_export) != delta['target']:
+        raise ValueError(f"应用增量后的结果与目标版本 {delta['target'][:12]} 不一致")
+    return new_export
+
+
+def apply_delta_chain(export: Dict, deltas: List[Dict], id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE) -> Dict:
+    """沿版本链依次应用多个增量；deltas 的顺序可以任意，按基准哈希串联"""
+    by_base = {delta['base']: delta for delta in deltas}
+    if len(by_base) != len(deltas):
+        raise ValueError("增量链中存在基准版本相同的多个增量")
+
+    current = export_digest(export)
+    while current in by_base:
+        delta = by_base.pop(current)
+        export = apply_delta(export, delta, id_map_file=id_map_file)
+        current = delta['target']
+    if by_base:
+        raise ValueError(f"{len(by_base)} 个增量无法接到版本链上")
+    return export
+
+
+def summarize_delta(delta: Dict) -> str:
+    return (f"新增 {len(delta['added'])} 个, 删除 {len(delta['removed'])} 个, 修改 {len(delta['modified'])} 个"
+            f"{', 顺序变化' if 'order' in delta else ''}")
+
+
+def _load_json(file_path: str) -> Dict:
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None):
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="生成或应用菜谱增量更新包")
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = subparsers.add_parser("diff", help="比较两个导出并写出增量")
+    diff_parser.add_argument("old", help="旧导出 JSON")
+    diff_parser.add_argument("new", help="新导出 JSON")
+    diff_parser.add_argument("-o", "--output", default="cooklikehoc_recipes.delta.json", help="增量文件")
+    diff_parser.add_argument("--profile", default="minified", choices=list(OUTPUT_PROFILES), help="JSON 输出配置")
+
+    apply_parser = subparsers.add_parser("apply", help="把一个或多个增量应用到旧导出")
+    apply_parser.add_argument("old", help="旧导出 JSON")
+    apply_parser.add_argument("deltas", nargs="+", help="增量文件（按版本链自动排序）")
+    apply_parser.add_argument("-o", "--output", default="cooklikehoc_recipes.json", help="输出的新导出")
+    for subparser in (diff_parser, apply_parser):
+        subparser.add_argument("--id-map", default=DEFAULT_ID_MAP_FILE, help="分配菜谱 ID 的映射文件（只读取）")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        if args.command == "diff":
+            delta = compute_delta(_load_json(args.old), _load_json(args.new), args.id_map)
+            written = write_json(args.output, delta, args.profile)
+            print(f"✅ 增量已生成: {args.output} ({summarize_delta(delta)})")
+            for file_path in written:
+                print(f"   {file_path}")
+        else:
+            new_export = apply_delta_chain(_load_json(args.old), [_load_json(path) for path in args.deltas],
+                                           args.id_map)
+            write_json(args.output, new_export)
+            print(f"✅ 已应用 {len(args.deltas)} 个增量: {args.output} ({len(new_export['recipes'])} 个菜谱)")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱文件发现
+基于 os.scandir 递归扫描分类目录（含任意层级的子分类目录），
+多个目录在线程池中并发读取，文件的大小与 mtime 随路径一起返回供后续阶段使用，
+不再对每个条目单独 stat 判断类型
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, List, Optional, Tuple
+
+RECIPE_SUFFIX = ".md"
+SKIPPED_FILES = frozenset({"README.md"})
+
+
+@dataclass(frozen=True)
+class RecipeFile:
+    """发现的菜谱文件
+
+    category_dir 为项目根目录下的分类目录名，subcategory 为分类目录下的相对子目录（直接位于分类目录时为空）
+    """
+    path: Path
+    category_dir: str
+    subcategory: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def stat_key(self) -> Tuple[int, int]:
+        """(mtime_ns, 大小)，与 ImportCache 和监视模式的文件状态一致"""
+        return self.mtime_ns, self.size
+
+
+def _scan_directory(dir_path: str, suffix: str, skipped: frozenset):
+    """读取单个目录，返回 (文件 [(路径, 大小, mtime_ns)], 子目录 [(路径, 目录名)])
+
+    条目类型取自目录项本身，只对匹配的文件 stat；不跟随目录符号链接以免循环，
+    以 . 开头的隐藏条目跳过
+    """
+    files, subdirs = [], []
+    try:
+        entries = os.scandir(dir_path)
+    except OSError:
+        return files, subdirs
+
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, name))
+                elif name.endswith(suffix) and name not in skipped and entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                # 扫描期间被删除
+                continue
+    return files, subdirs
+
+
+def scan_recipe_files(project_path, category_dirs: Iterable[str], workers: Optional[int] = None,
+                      suffix: str = RECIPE_SUFFIX, skipped: Iterable[str] = SKIPPED_FILES) -> List[RecipeFile]:
+    """递归扫描 project_path 下的分类目录，返回按路径排序的菜谱文件
+
+    workers 为并发读取目录的线程数，默认按 CPU 数决定；为 1 时在当前线程中逐个读取。
+    目录读取主要耗时在系统调用（网络挂载时尤为明显），线程池可以让多个目录的 I/O 重叠
+    """
+    project_path = str(project_path)
+    skipped = frozenset(skipped)
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    # (目录路径, 所属分类目录名, 相对分类目录的子分类路径)
+    roots = [(os.path.join(project_path, category_dir), category_dir, '') for category_dir in category_dirs]
+
+    found = []
+
+    def collect(task, files, subdirs):
+        _, category_dir, subcategory = task
+        found.extend((file_path, size, mtime_ns, category_dir, subcategory) for file_path, size, mtime_ns in files)
+        return [(subdir, category_dir, f"{subcategory}/{name}" if subcategory else name) for subdir, name in subdirs]
+
+    if workers <= 1:
+        pending = roots
+        while pending:
+            task = pending.pop()
+            pending.extend(collect(task, *_scan_directory(task[0], suffix, skipped)))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {executor.submit(_scan_directory, task[0], suffix, skipped): task for task in roots}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for task in collect(running.pop(future), *future.result()):
+                        running[executor.submit(_scan_directory, task[0], suffix, skipped)] = task
+
+    found.sort()
+    return [RecipeFile(Path(file_path), category_dir, subcategory, size, mtime_ns)
+            for file_path, size, mtime_ns, category_dir, subcategory in found]
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+稳定的菜谱 ID
+ID 由 分类 + 规范化标题 的哈希得到，与菜谱在导出中的顺序无关；
+已分配的 ID 持久化在 ID 映射文件中，重新构建时保持不变，删除的菜谱也保留记录以免 ID 被复用
+"""
+
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+from typing import Dict, Iterable, Optional
+
+ID_MAP_FILE = "recipe_ids.json"
+ID_MAP_VERSION = 1
+
+# 仓库中随 Android 应用发布的映射文件，导入器与代码生成默认读取它
+DEFAULT_ID_MAP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "android_app", ID_MAP_FILE)
+
+# 流水线中多个阶段可能同时写回同一映射文件
+_save_lock = threading.Lock()
+
+# 限制在 32 位有符号整数内，Room 的 Long 与 JSON/JavaScript 数字都能精确表示
+ID_SPACE = 2 ** 31 - 1
+
+
+def normalize_title(title: str) -> str:
+    """全角半角统一、去掉所有空白并转为小写，排版差异不影响 ID"""
+    return "".join(unicodedata.normalize('NFKC', title).split()).lower()
+
+
+def recipe_id_key(category: str, title: str) -> str:
+    return f"{category}/{normalize_title(title)}"
+
+
+def derive_recipe_id(key: str, attempt: int = 0) -> int:
+    """由键计算 1..ID_SPACE 内的 ID；attempt 用于哈希冲突时的再探测"""
+    payload = key if attempt == 0 else f"{key}#{attempt}"
+    return int.from_bytes(hashlib.sha256(payload.encode('utf-8')).digest()[:8], 'big') % ID_SPACE + 1
+
+
+class RecipeIdMap:
+    """持久化的 键 -> ID 映射；map_file 为 None 时只在内存中分配"""
+
+    def __init__(self, map_file: Optional[str] = ID_MAP_FILE):
+        self.map_file = map_file
+        self.ids: Dict[str, int] = {}
+        self.added = 0
+        self._used = set()
+        self._seen_keys = set()
+
+        if map_file and os.path.exists(map_file):
+            with open(map_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != ID_MAP_VERSION:
+                raise ValueError(f"ID 映射版本不受支持: {data.get('version')}")
+            self.ids = data['ids']
+            self._used = set(self.ids.values())
+
+    def seed(self, recipes: Iterable[Dict]) -> int:
+        """用已发布数据中的 {id, category, title} 初始化映射，使已有收藏与评分继续有效
+
+        只在键与 ID 都还未被占用时采用，返回采用的数量
+        """
+        seeded = 0
+        for recipe in recipes:
+            recipe_id = recipe.get('id')
+            if not isinstance(recipe_id, int) or recipe_id in self._used:
+                continue
+            key = recipe_id_key(recipe.get('category', ''), recipe.get('title', ''))
+            if key in self.ids:
+                continue
+            self.ids[key] = recipe_id
+            self._used.add(recipe_id)
+            seeded += 1
+        self.added += seeded
+        return seeded
+
+    def assign(self, category: str, title: str) -> int:
+        """返回菜谱的 ID；同一次构建中规范化后重名的菜谱依次使用 键#2、键#3 …"""
+        base_key = recipe_id_key(category, title)
+        key = base_key
+        suffix = 1
+        while key in self._seen_keys:
+            suffix += 1
+            key = f"{base_key}#{suffix}"
+        self._seen_keys.add(key)
+
+        recipe_id = self.ids.get(key)
+        if recipe_id is None:
+            attempt = 0
+            recipe_id = derive_recipe_id(key)
+            while recipe_id in self._used:
+                attempt += 1
+                recipe_id = derive_recipe_id(key, attempt)
+            self.ids[key] = recipe_id
+            self._used.add(recipe_id)
+            self.added += 1
+        return recipe_id
+
+    def retired_keys(self):
+        """本次构建未出现、但仍保留 ID 的键"""
+        return sorted(set(self.ids) - self._seen_keys)
+
+    def save(self) -> Optional[str]:
+        """有新分配的 ID 时写回映射文件，返回文件路径；无变化或没有映射文件时返回 None"""
+        if not self.added or not self.map_file:
+            return None
+        data = {'version': ID_MAP_VERSION, 'ids': dict(sorted(self.ids.items()))}
+        with _save_lock:
+            temp_file = f"{self.map_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.write('\n')
+            os.replace(temp_file, self.map_file)
+        self.added = 0
+        return self.map_file
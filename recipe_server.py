@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+菜谱 HTTP 接口
+启动时加载一次 DataImporter 导出的 JSON，在内存中预先建立按标题排序、按分类、按 id 与按字符的检索索引，
+用 asyncio 提供与应用 RecipeDao 查询对应的分页接口；响应带 ETag、按 Accept-Encoding 返回 gzip，
+序列化后的响应体保存在 LRU 缓存中，重复请求不再重新生成
+
+接口:
+  GET /api/recipes?page=&page_size=                 全部菜谱，按标题排序 (getAllRecipes)
+  GET /api/recipes/{id}                             单个菜谱 (getRecipeById)
+  GET /api/categories                               各分类菜谱数 (getCategoryStats)
+  GET /api/categories/{category}/recipes?page=      分类下的菜谱，按标题排序 (getRecipesByCategory)
+  GET /api/search?q=&page=                          标题 > 配料 > 步骤 的子串检索 (searchRecipes)
+  GET /api/random?limit=&seed=                      随机推荐 (getRandomRecipes)
+  GET /api/stats                                    菜谱总数与响应缓存命中情况
+"""
+
+import os
+import re
+import gzip
+import json
+import random
+import asyncio
+import hashlib
+import argparse
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from CookLikeHOCImporter import DataImporter, Recipe
+from recipe_ids import DEFAULT_ID_MAP_FILE
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_RANDOM_LIMIT = 50
+DEFAULT_CACHE_SIZE = 512
+
+# 小于该大小的响应压缩收益不抵开销
+GZIP_MIN_SIZE = 256
+MAX_HEADER_SIZE = 16 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+
+
+class ApiError(Exception):
+    """请求参数或资源错误，转换为对应状态码的 JSON 响应"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class RecipeIndex:
+    """内存中的菜谱与预计算索引
+
+    recipe_ids 为与 recipes 对应的稳定 ID（DataImporter.recipe_ids，与应用中的 id 一致）
+    """
+
+    def __init__(self, recipes: List[Recipe], recipe_ids: List[int]):
+        records = [{'id': recipe_id, **asdict(recipe)} for recipe_id, recipe in zip(recipe_ids, recipes)]
+
+        self.by_id: Dict[int, Dict] = {record['id']: record for record in records}
+        # ORDER BY title
+        self.ordered = sorted(records, key=lambda record: (record['title'], record['id']))
+        self.by_category: Dict[str, List[Dict]] = {}
+        for record in self.ordered:
+            self.by_category.setdefault(record['category'], []).append(record)
+        # 分类顺序与导出中首次出现的顺序一致
+        self.categories = list(dict.fromkeys(record['category'] for record in records))
+
+        # 检索：小写后的 (标题, 配料, 步骤) 文本，以及 字符 -> id 集合 的倒排表
+        self._texts: Dict[int, Tuple[str, str, str]] = {}
+        self._postings: Dict[str, set] = {}
+        for record in records:
+            texts = (record['title'].lower(), '\n'.join(record['ingredients']).lower(),
+                     '\n'.join(record['instructions']).lower())
+            self._texts[record['id']] = texts
+            for char in set(''.join(texts)):
+                self._postings.setdefault(char, set()).add(record['id'])
+
+    def search(self, query: str) -> List[Dict]:
+        """与 searchRecipes 相同的 LIKE '%query%' 语义与排序：标题命中优先，其次配料，最后步骤
+
+        先用查询中每个字符的倒排表求交集缩小候选，再逐个确认子串
+        """
+        needle = query.strip().lower()
+        if not needle:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "缺少检索词 q")
+
+        postings = [self._postings.get(char) for char in set(needle)]
+        if not all(postings):
+            return []
+        postings.sort(key=len)
+        candidates = set.intersection(*postings)
+
+        ranked = []
+        for recipe_id in candidates:
+            title, ingredients, instructions = self._texts[recipe_id]
+            if needle in title:
+                rank = 1
+            elif needle in ingredients:
+                rank = 2
+            elif needle in instructions:
+                rank = 3
+            else:
+                continue
+            record = self.by_id[recipe_id]
+            ranked.append((rank, record['title'], recipe_id, record))
+        ranked.sort(key=lambda item: item[:3])
+        return [item[3] for item in ranked]
+
+    def random_recipes(self, limit: int, seed: Optional[int] = None) -> List[Dict]:
+        rng = random.Random(seed) if seed is not None else random
+        return rng.sample(self.ordered, min(limit, len(self.ordered)))
+
+    def category_stats(self) -> List[Dict]:
+        return [{'category': category, 'recipe_count': len(self.by_category[category])}
+                for category in self.categories]
+
+
+@dataclass
+class CachedResponse:
+    """序列化后的响应，gzip 版本在首次需要时生成"""
+    status: int
+    body: bytes
+    etag: str
+    cacheable: bool = True
+    gzip_body: Optional[bytes] = None
+
+    def variant(self, use_gzip: bool) -> Tuple[bytes, str]:
+        """返回 (响应体, ETag)；gzip 版本使用不同的 ETag"""
+        if not use_gzip or len(self.body) < GZIP_MIN_SIZE:
+            return self.body, self.etag
+        if self.gzip_body is None:
+            self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self.gzip_body, f'{self.etag[:-1]}-gzip"'
+
+
+class ResponseCache:
+    """按 路径 + 规范化查询参数 缓存响应的 LRU"""
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: str, response: CachedResponse):
+        if self.capacity <= 0:
+            return
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        return {'size': len(self._entries), 'capacity': self.capacity, 'hits': self.hits, 'misses': self.misses}
+
+
+def _int_param(params: Dict[str, str], name: str, default: int, minimum: int, maximum: int) -> int:
+    value = params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"参数 {name} 必须是整数")
+    if not minimum <= number <= maximum:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"参数 {name} 必须在 {minimum} 到 {maximum} 之间")
+    return number
+
+
+def paginate(items: List[Dict], params: Dict[str, str]) -> Dict:
+    page_size = _int_param(params, 'page_size', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    pages = max(1, -(-len(items) // page_size))
+    page = _int_param(params, 'page', 1, 1, pages)
+    start = (page - 1) * page_size
+    return {
+        'items': items[start:start + page_size],
+        'page': page,
+        'page_size': page_size,
+        'total': len(items),
+        'pages': pages
+    }
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            quality = params.strip()
+            if not quality.startswith('q='):
+                return True
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+
+class RecipeServer:
+    """路由请求、维护响应缓存并处理 HTTP/1.1 连接（支持 keep-alive）"""
+
+    def __init__(self, index: RecipeIndex, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.index = index
+        self.cache = ResponseCache(cache_size)
+        self.routes = [
+            (re.compile(r'/api/recipes'), self._list_recipes),
+            (re.compile(r'/api/recipes/(\d+)'), self._get_recipe),
+            (re.compile(r'/api/categories'), self._list_categories),
+            (re.compile(r'/api/categories/([^/]+)/recipes'), self._category_recipes),
+            (re.compile(r'/api/search'), self._search),
+            (re.compile(r'/api/random'), self._random),
+            (re.compile(r'/api/stats'), self._stats),
+        ]
+
+    # 各接口返回 (响应数据, 是否可缓存)
+    def _list_recipes(self, params):
+        return paginate(self.index.ordered, params), True
+
+    def _get_recipe(self, params, recipe_id):
+        record = self.index.by_id.get(int(recipe_id))
+        if record is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"菜谱不存在: {recipe_id}")
+        return record, True
+
+    def _list_categories(self, params):
+        return {'categories': self.index.category_stats()}, True
+
+    def _category_recipes(self, params, category):
+        recipes = self.index.by_category.get(category)
+        if recipes is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"分类不存在: {category}")
+        return paginate(recipes, params), True
+
+    def _search(self, params):
+        return {'query': params.get('q', ''), **paginate(self.index.search(params.get('q', '')), params)}, True
+
+    def _random(self, params):
+        limit = _int_param(params, 'limit', 10, 1, MAX_RANDOM_LIMIT)
+        seed = params.get('seed')
+        if seed is None:
+            return {'items': self.index.random_recipes(limit)}, False
+        return {'items': self.index.random_recipes(limit, _int_param(params, 'seed', 0, 0, 2 ** 63))}, True
+
+    def _stats(self, params):
+        return {'total_recipes': len(self.index.ordered), 'categories': len(self.index.categories),
+                'cache': self.cache.stats()}, False
+
+    def build_response(self, target: str) -> CachedResponse:
+        """按请求目标生成响应；可缓存的响应以 路径 + 排序后的参数 为键进入 LRU"""
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip('/') or '/'
+        params = dict(parse_qsl(parts.query))
+        key = f"{path}?{sorted(params.items())}"
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            for pattern, handler in self.routes:
+                match = pattern.fullmatch(path)
+                if match:
+                    payload, cacheable = handler(params, *match.groups())
+                    status = HTTPStatus.OK
+                    break
+            else:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"接口不存在: {path}")
+        except ApiError as e:
+            payload, cacheable, status = {'error': e.message}, False, e.status
+
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        response = CachedResponse(status, body, f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"', cacheable)
+        if cacheable:
+            self.cache.put(key, response)
+        return response
+
+    def render(self, method: str, target: str, headers: Dict[str, str], keep_alive: bool) -> bytes:
+        """生成完整的 HTTP 响应报文"""
+        extra_headers = {}
+        if method not in ('GET', 'HEAD'):
+            response = CachedResponse(HTTPStatus.METHOD_NOT_ALLOWED, b'{"error":"only GET and HEAD"}', '', False)
+            extra_headers['Allow'] = 'GET, HEAD'
+        else:
+            response = self.build_response(target)
+
+        status = response.status
+        body, etag = response.variant(_accepts_gzip(headers.get('accept-encoding', '')))
+        if status == HTTPStatus.OK and _etag_matches(headers.get('if-none-match', ''), etag):
+            status, body = HTTPStatus.NOT_MODIFIED, b''
+
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        if status != HTTPStatus.NOT_MODIFIED:
+            lines.append("Content-Type: application/json; charset=utf-8")
+            if body is not response.body:
+                lines.append("Content-Encoding: gzip")
+        if etag and status in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED):
+            lines.append(f"ETag: {etag}")
+            lines.append("Cache-Control: " + ("no-cache" if response.cacheable else "no-store"))
+            lines.append("Vary: Accept-Encoding")
+        lines.extend(f"{name}: {value}" for name, value in extra_headers.items())
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        return head if method == 'HEAD' else head + body
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """处理一个连接上的若干请求，空闲超过 KEEP_ALIVE_TIMEOUT 秒后关闭"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(b"HTTP/1.1 431 Request Header Fields Too Large\r\n"
+                                 b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+                    break
+
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = request_line.split(' ')
+                except ValueError:
+                    writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                # GET 不应带请求体，带了也读掉以免破坏下一个请求
+                content_length = int(headers.get('content-length') or 0)
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+                writer.write(self.render(method, target, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def load_index(json_file: str, id_map_file: Optional[str] = DEFAULT_ID_MAP_FILE) -> RecipeIndex:
+    """加载导出的 JSON 并建立索引；ID 映射只读使用，不写回"""
+    importer = DataImporter.from_json(json_file, id_map_file=id_map_file)
+    return RecipeIndex(importer.recipes, importer.recipe_ids())
+
+
+async def start_server(recipe_server: RecipeServer, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+    """启动监听，port 为 0 时由系统分配端口"""
+    return await asyncio.start_server(recipe_server.handle_connection, host, port, limit=MAX_HEADER_SIZE)
+
+
+async def serve_forever(recipe_server: RecipeServer, host: str, port: int):
+    server = await start_server(recipe_server, host, port)
+    address = server.sockets[0].getsockname()
+    print(f"🚀 菜谱接口已启动: http://{address[0]}:{address[1]}/api/recipes "
+          f"({len(recipe_server.index.ordered)} 个菜谱, 缓存 {recipe_server.cache.capacity} 个响应)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="以 HTTP 接口提供导入的菜谱数据")
+    arg_parser.add_argument("json_file", nargs="?", default="cooklikehoc_recipes.json", help="DataImporter 导出的 JSON")
+    arg_parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    arg_parser.add_argument("--port", type=int, default=8080, help="监听端口")
+    arg_parser.add_argument("--id-map", default=DEFAULT_ID_MAP_FILE,
+                            help="稳定菜谱 ID 映射文件，不存在时 ID 只由分类与标题的哈希决定")
+    arg_parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="LRU 缓存的响应数")
+    args = arg_parser.parse_args()
+
+    if not os.path.exists(args.json_file):
+        print(f"❌ 导出文件不存在: {args.json_file}")
+        return
+
+    recipe_server = RecipeServer(load_index(args.json_file, args.id_map), args.cache_size)
+    try:
+        asyncio.run(serve_forever(recipe_server, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 菜谱接口已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,22 @@ CookLikeHOC 菜谱数据导入运行脚本
 import os
 import sys
 import time
+import argparse
+import threading
 from pathlib import Path
-from CookLikeHOCImporter import DataImporter, main as import_main
+from typing import List, Optional
+from CookLikeHOCImporter import CookLikeHOCParser, DataImporter, main as import_main
+from asset_output import OUTPUT_PROFILES, print_size_report
 from android_importer import AndroidDataGenerator
+from build_pipeline import BuildPipeline, Stage
+from copy_assets import copy_assets_to_android
+from image_metadata import METADATA_FILE
+from image_pipeline import Image, MANIFEST_NAME, ImageDerivativePipeline, load_recipes
+from recipe_discovery import scan_recipe_files
+from recipe_ids import ID_MAP_FILE
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "android_app"))
+from prepare_recipe_data import load_id_map, prepare_from_importer
 
 def print_banner():
     """打印欢迎横幅"""
@@ -35,44 +48,142 @@ def check_project_path():
     print(f"✅ 项目路径验证成功: {project_path}")
     return True
 
-def run_full_import():
-    """运行完整的导入流程"""
-    print("\n🚀 开始完整导入流程...")
+# 各阶段的输出位置
+JSON_FILE = "cooklikehoc_recipes.json"
+ASSETS_DIR = "android_assets"
+CODE_DIR = "android_generated"
+APP_DIR = "android_app"
+APP_ASSETS_DIR = os.path.join(APP_DIR, "app", "src", "main", "assets")
+ID_MAP_PATH = os.path.join(APP_DIR, ID_MAP_FILE)
+
+def build_stages(profile: str = "pretty", layout: str = "copies",
+                 project_path: str = r"e:\UGit\CookLikeHOC") -> List[Stage]:
+    """定义导入流水线：导入 -> (代码生成 | 复制资源 -> 准备应用数据 | 衍生图) -> 使用说明
+
+    导入阶段在本次运行中执行时，内存中的 DataImporter 直接交给代码生成与准备应用数据阶段；
+    导入命中缓存时才从 JSON 文件重建
+    """
+    session = {}
+    session_lock = threading.Lock()
     
-    try:
-        # 1. 创建导入器并导入数据
-        print("\n📖 步骤 1: 导入菜谱数据...")
-        importer = DataImporter()
-        stats = importer.import_all_recipes()
-        
+    def current_importer():
+        # 代码生成与准备应用数据可能并发执行，只重建一次
+        with session_lock:
+            importer = session.get('importer')
+            if importer is None:
+                importer = session['importer'] = DataImporter.from_json(JSON_FILE, project_path, profile,
+                                                                        id_map_file=ID_MAP_PATH)
+        return importer
+    
+    def import_stage(_):
+        importer = DataImporter(project_path, output_profile=profile, id_map_file=ID_MAP_PATH)
+        stats = importer.import_all_recipes(cache_file="import_cache.json")
         if stats['successful'] == 0:
-            print("❌ 没有成功导入任何菜谱，请检查项目路径和文件格式")
-            return False
-        
-        # 2. 打印导入摘要
+            raise RuntimeError("没有成功导入任何菜谱，请检查项目路径和文件格式")
         importer.print_import_summary()
+        session['importer'] = importer
         
-        # 3. 导出 JSON 格式
-        print("\n📄 步骤 2: 导出 JSON 格式...")
-        json_file = importer.export_to_json("cooklikehoc_recipes.json")
-        print(f"✅ JSON 文件已生成: {json_file}")
+        # 先为新菜谱分配并写回 ID，之后的导出、代码生成、衍生图与准备应用数据都只读取映射
+        id_map = load_id_map(ID_MAP_PATH, APP_ASSETS_DIR)
+        for recipe in importer.recipes:
+            id_map.assign(recipe.category, recipe.title)
+        if id_map.save():
+            print(f"🔖 菜谱 ID 映射已更新: {ID_MAP_PATH}")
         
-        # 4. 导出 Android Assets
-        print("\n📱 步骤 3: 导出 Android Assets...")
-        assets_dir = importer.export_to_android_assets("android_assets")
+        json_file = importer.export_to_json(JSON_FILE)
+        print(f"✅ JSON 文件已生成: {json_file}")
+        assets_dir = importer.export_to_android_assets(ASSETS_DIR)
         print(f"✅ Android Assets 已生成: {assets_dir}")
         
-        # 5. 生成 Android 代码
-        print("\n💻 步骤 4: 生成 Android 代码...")
-        android_generator = AndroidDataGenerator(importer)
-        code_dir = android_generator.generate_all_android_files("android_generated")
+        asset_files = sorted(
+            os.path.join(assets_dir, name) for name in os.listdir(assets_dir) if name.endswith('.json')
+        )
+        print_size_report([json_file] + asset_files, f"资源体积报告 ({importer.output_profile.name})")
+        return stats
+    
+    def codegen_stage(_):
+        android_generator = AndroidDataGenerator(current_importer())
+        code_dir = android_generator.generate_all_android_files(CODE_DIR)
+        android_generator.generate_prebuilt_database(os.path.join(code_dir, "cooklikehoc.db"))
         print(f"✅ Android 代码已生成: {code_dir}")
+        return code_dir
+    
+    def copy_assets_stage(_):
+        copy_assets_to_android(".", APP_ASSETS_DIR, layout=layout)
+    
+    def prepare_stage(_):
+        output_files = prepare_from_importer(current_importer(), layout, ID_MAP_PATH,
+                                             assets_dir=APP_ASSETS_DIR, profile=profile)
+        if output_files is None:
+            raise RuntimeError("准备应用数据失败")
+        return len(output_files)
+    
+    def images_stage(_):
+        pipeline = ImageDerivativePipeline(os.path.join(APP_ASSETS_DIR, "images"),
+                                           os.path.join(APP_ASSETS_DIR, "image_variants"))
+        manifest = pipeline.run(load_recipes(JSON_FILE), ID_MAP_PATH)
+        return len(manifest['images'])
+    
+    def guide_stage(results):
+        generate_usage_guide(results['import'], JSON_FILE, ASSETS_DIR, results['codegen'])
+    
+    # 导入阶段只读取发现的菜谱文件，按这些文件计算指纹，而不是整个项目目录（含 .git 与图片）
+    recipe_files = [str(recipe_file.path)
+                    for recipe_file in scan_recipe_files(project_path, CookLikeHOCParser(project_path).categories)]
+    
+    # 内容寻址布局下 prepare 会移除 android_assets/ 副本，只有完整副本布局才保留该输出
+    copied_assets = [os.path.join(APP_ASSETS_DIR, ASSETS_DIR)] if layout == "copies" else []
+    
+    stages = [
+        Stage('import', import_stage, description="导入菜谱数据并导出 JSON 与 Android Assets",
+              inputs=recipe_files + ["CookLikeHOCImporter.py", "recipe_discovery.py", "asset_output.py",
+                                     ID_MAP_PATH, "recipe_ids.py"],
+              outputs=[JSON_FILE, os.path.join(ASSETS_DIR, "recipes_index.json"), ID_MAP_PATH],
+              params={'profile': profile}),
+        Stage('codegen', codegen_stage, description="生成 Android 代码与预置数据库",
+              inputs=[JSON_FILE, "android_importer.py", ID_MAP_PATH, "recipe_ids.py"],
+              outputs=[os.path.join(CODE_DIR, "DataModels.kt"), os.path.join(CODE_DIR, "cooklikehoc.db")],
+              deps=['import']),
+        Stage('copy_assets', copy_assets_stage, description="复制资源文件到 Android 项目",
+              inputs=[ASSETS_DIR, "copy_assets.py"], outputs=copied_assets,
+              deps=['import'], params={'layout': layout}),
+        Stage('prepare', prepare_stage, description="准备 Android 应用使用的菜谱数据",
+              inputs=[JSON_FILE, os.path.join(APP_DIR, "prepare_recipe_data.py"), ID_MAP_PATH,
+                      os.path.join(APP_ASSETS_DIR, "images"), "asset_store.py", "image_metadata.py", "recipe_ids.py"],
+              outputs=[os.path.join(APP_ASSETS_DIR, name) for name in ("cooklikehoc_recipes.json", "categories.json",
+                                                                       "metadata.json", METADATA_FILE)],
+              deps=['import', 'copy_assets'], params={'profile': profile, 'layout': layout}),
+        Stage('guide', guide_stage, description="生成使用说明",
+              inputs=["run_import.py"], outputs=["USAGE_GUIDE.md"], deps=['import', 'codegen']),
+    ]
+    
+    # WebP 衍生图依赖 Pillow，未安装时不加入流水线
+    if Image is not None:
+        stages.append(Stage('images', images_stage, description="生成各屏幕密度的 WebP 衍生图",
+                            inputs=[JSON_FILE, os.path.join(APP_ASSETS_DIR, "images"), "image_pipeline.py",
+                                    ID_MAP_PATH, "recipe_ids.py"],
+                            outputs=[os.path.join(APP_ASSETS_DIR, "image_variants", MANIFEST_NAME)],
+                            deps=['import']))
+    else:
+        print("⚠️ 未安装 Pillow，跳过 WebP 衍生图阶段: pip install Pillow")
+    return stages
+
+def run_full_import(profile: str = "pretty", layout: str = "copies", force: bool = False,
+                    jobs: Optional[int] = None):
+    """运行完整的导入流程，profile 为 asset_output.OUTPUT_PROFILES 中的输出配置
+
+    各阶段按依赖关系并发执行，输入指纹未变化的阶段直接跳过；force 为 True 时全部重新执行
+    """
+    print("\n🚀 开始完整导入流程...")
+    
+    try:
+        pipeline = BuildPipeline(build_stages(profile, layout), jobs=jobs)
+        success = pipeline.run(force=force)
+        pipeline.print_report()
         
-        # 6. 生成使用说明
-        generate_usage_guide(stats, json_file, assets_dir, code_dir)
-        
-        print("\n🎉 所有步骤完成!")
-        return True
+        if success:
+            print("\n🎉 所有步骤完成!")
+        return success
         
     except Exception as e:
         print(f"❌ 导入过程中发生错误: {e}")
@@ -175,14 +286,21 @@ importer.importFromAssets()
 
 def main():
     """主函数"""
+    arg_parser = argparse.ArgumentParser(description="一键导入菜谱数据并生成各种格式的输出")
+    arg_parser.add_argument("profile", nargs="?", default="pretty", choices=list(OUTPUT_PROFILES), help="JSON 输出配置")
+    arg_parser.add_argument("--layout", default="copies", choices=["copies", "store"], help="Android 应用数据布局")
+    arg_parser.add_argument("--force", action="store_true", help="忽略构建缓存，重新执行所有阶段")
+    arg_parser.add_argument("--jobs", type=int, help="并发执行的阶段数")
+    args = arg_parser.parse_args()
+    
     print_banner()
     
     # 检查项目路径
     if not check_project_path():
         return False
     
-    # 运行完整导入
-    success = run_full_import()
+    # 运行完整导入，可通过第一个命令行参数选择输出配置：pretty / minified / compressed
+    success = run_full_import(args.profile, args.layout, args.force, args.jobs)
     
     if success:
         print("\n" + "="*60)
@@ -3,18 +3,22 @@
 
 import os
 import re
-import json
+import sys
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+from asset_output import get_output_profile, print_size_report, write_json
+from recipe_discovery import scan_recipe_files
+from recipe_ids import DEFAULT_ID_MAP_FILE, RecipeIdMap
+
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     title: str
     category: str
@@ -34,9 +38,17 @@ class Recipe:
             self.ingredients = []
         if self.instructions is None:
             self.instructions = []
+        self.intern_strings()
+    
+    def intern_strings(self):
+        """驻留分类、描述、难度和配料等高度重复的字符串，使相同取值共享同一对象"""
+        self.category = sys.intern(self.category)
+        self.description = sys.intern(self.description)
+        self.difficulty = sys.intern(self.difficulty)
+        self.ingredients = [sys.intern(ingredient) for ingredient in self.ingredients]
 
-def parse_markdown_recipe(file_path: Path) -> Optional[Recipe]:
-    """解析单个 Markdown 菜谱文件"""
+def parse_markdown_recipe(file_path: Path, category_name: Optional[str] = None) -> Optional[Recipe]:
+    """解析单个 Markdown 菜谱文件，category_name 为所属分类目录名，默认取文件所在目录名"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -52,7 +64,7 @@ def parse_markdown_recipe(file_path: Path) -> Optional[Recipe]:
             '早餐': 'breakfast', '汤': 'soup', '烫菜': 'blanched', '砂锅菜': 'casserole',
             '煮锅': 'hot_pot', '饮品': 'beverage', '配料': 'seasoning'
         }
-        category_name = file_path.parent.name
+        category_name = category_name or file_path.parent.name
         category = category_mapping.get(category_name, 'other')
         
         # 提取图片路径
@@ -147,8 +159,9 @@ def parse_markdown_recipe(file_path: Path) -> Optional[Recipe]:
         logger.error(f"解析文件 {file_path} 时出错: {e}")
         return None
 
-def import_all_recipes():
-    """导入所有菜谱数据"""
+def import_all_recipes(profile: str = "pretty"):
+    """导入所有菜谱数据，profile 为 asset_output.OUTPUT_PROFILES 中的输出配置"""
+    profile = get_output_profile(profile)
     project_path = Path("e:/UGit/CookLikeHOC")
     
     if not project_path.exists():
@@ -165,26 +178,26 @@ def import_all_recipes():
     categories = ['主食', '炒菜', '炖菜', '蒸菜', '烤类', '炸品', '凉拌', '卤菜', 
                  '早餐', '汤', '烫菜', '砂锅菜', '煮锅', '饮品', '配料']
     
-    for category_name in categories:
-        category_dir = project_path / category_name
-        if category_dir.exists() and category_dir.is_dir():
-            print(f"扫描分类目录: {category_name}")
+    # 递归扫描分类目录（含子分类目录），子目录中的菜谱归入上级分类
+    current_category = None
+    for recipe_file in scan_recipe_files(project_path, categories):
+        if recipe_file.category_dir != current_category:
+            current_category = recipe_file.category_dir
+            print(f"扫描分类目录: {current_category}")
+        
+        stats['total_files'] += 1
+        recipe = parse_markdown_recipe(recipe_file.path, recipe_file.category_dir)
+        
+        if recipe:
+            recipes.append(recipe)
+            stats['successful'] += 1
             
-            for file_path in category_dir.glob("*.md"):
-                if file_path.name != "README.md":
-                    stats['total_files'] += 1
-                    recipe = parse_markdown_recipe(file_path)
-                    
-                    if recipe:
-                        recipes.append(recipe)
-                        stats['successful'] += 1
-                        
-                        category = recipe.category
-                        if category not in stats['categories']:
-                            stats['categories'][category] = 0
-                        stats['categories'][category] += 1
-                    else:
-                        stats['failed'] += 1
+            category = recipe.category
+            if category not in stats['categories']:
+                stats['categories'][category] = 0
+            stats['categories'][category] += 1
+        else:
+            stats['failed'] += 1
     
     print(f"\n导入完成! 成功: {stats['successful']}, 失败: {stats['failed']}")
     
@@ -199,8 +212,7 @@ def import_all_recipes():
         'recipes': [asdict(recipe) for recipe in recipes]
     }
     
-    with open("cooklikehoc_recipes.json", 'w', encoding='utf-8') as f:
-        json.dump(recipes_data, f, ensure_ascii=False, indent=2)
+    write_json("cooklikehoc_recipes.json", recipes_data, profile)
     
     print(f"数据已导出到: cooklikehoc_recipes.json")
     
@@ -215,17 +227,19 @@ def import_all_recipes():
             category_groups[category] = []
         category_groups[category].append(recipe)
     
-    # 导出每个分类
+    # 导出每个分类，id 为与应用一致的稳定菜谱 ID（只读取映射，不写回）
+    id_map = RecipeIdMap(DEFAULT_ID_MAP_FILE)
+    output_files = ["cooklikehoc_recipes.json"]
     for category, category_recipes in category_groups.items():
         category_file = f"android_assets/{category}_recipes.json"
         category_data = {
             'category': category,
             'count': len(category_recipes),
-            'recipes': [asdict(recipe) for recipe in category_recipes]
+            'recipes': [{'id': id_map.assign(category, recipe.title), **asdict(recipe)} for recipe in category_recipes]
         }
         
-        with open(category_file, 'w', encoding='utf-8') as f:
-            json.dump(category_data, f, ensure_ascii=False, indent=2)
+        write_json(category_file, category_data, profile)
+        output_files.append(category_file)
     
     # 创建索引文件
     index_data = {
@@ -234,10 +248,11 @@ def import_all_recipes():
         'files': [f"{cat}_recipes.json" for cat in category_groups.keys()]
     }
     
-    with open("android_assets/recipes_index.json", 'w', encoding='utf-8') as f:
-        json.dump(index_data, f, ensure_ascii=False, indent=2)
+    write_json("android_assets/recipes_index.json", index_data, profile)
+    output_files.append("android_assets/recipes_index.json")
     
     print("Android Assets 已导出到: android_assets/")
+    print_size_report(output_files, f"资源体积报告 ({profile.name})")
     
     # 打印摘要
     print("\n" + "="*60)
@@ -260,4 +275,4 @@ def import_all_recipes():
     print("🎉 导入完成!")
 
 if __name__ == "__main__":
-    import_all_recipes()
\ No newline at end of file
+    import_all_recipes(sys.argv[1] if len(sys.argv) > 1 else "pretty")
\ No newline at end of file
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CookLikeHOC 菜谱监视模式
+持续监视分类目录下的 .md 文件，只重新解析发生变化的文件，
+并只重写受影响的 {category}_recipes.json 以及必要时的 recipes_index.json
+"""
+
+import os
+import time
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from asset_output import GZIP_SUFFIX, ZSTD_SUFFIX, OUTPUT_PROFILES
+from CookLikeHOCImporter import DataImporter, Recipe
+from recipe_discovery import scan_recipe_files
+
+logger = logging.getLogger(__name__)
+
+FileSnapshot = Dict[str, Tuple[int, int]]
+
+
+class RecipeWatcher:
+    """基于轮询的菜谱文件监视器"""
+
+    def __init__(self, importer: DataImporter, output_dir: str = "android_assets",
+                 interval: float = 1.0, debounce: float = 0.5):
+        self.importer = importer
+        self.output_dir = output_dir
+        self.interval = interval
+        self.debounce = debounce
+        self.recipes_by_file: Dict[str, Recipe] = {}
+        self.failed_files: Set[str] = set()
+        self.snapshot: FileSnapshot = {}
+
+    def _scan(self) -> FileSnapshot:
+        """扫描分类目录（含子分类目录），返回 {文件路径: (mtime, 大小)}"""
+        parser = self.importer.parser
+        return {str(recipe_file.path): recipe_file.stat_key
+                for recipe_file in scan_recipe_files(parser.project_path, parser.categories)}
+
+    def initial_build(self):
+        """首次完整导入并导出全部分类文件"""
+        self.snapshot = self._scan()
+        for file_path in sorted(self.snapshot):
+            self._parse(file_path)
+
+        self._sync_importer()
+        self.importer.export_to_android_assets(self.output_dir)
+        logger.info(f"监视模式初始构建完成: {len(self.recipes_by_file)} 个菜谱")
+
+    def _parse(self, file_path: str) -> Optional[Recipe]:
+        """解析单个文件并更新内部状态"""
+        recipe = self.importer.parser.parse_markdown_recipe(Path(file_path))
+        if recipe:
+            self.recipes_by_file[file_path] = recipe
+            self.failed_files.discard(file_path)
+        else:
+            self.recipes_by_file.pop(file_path, None)
+            self.failed_files.add(file_path)
+        return recipe
+
+    def _sync_importer(self):
+        """用当前状态刷新 importer.recipes 与 import_stats
+
+        菜谱按源文件路径排序，与 scan_recipe_files 的发现顺序（即完整导入的顺序）一致
+        """
+        self.importer.recipes = [self.recipes_by_file[file_path] for file_path in sorted(self.recipes_by_file)]
+
+        categories = {}
+        for recipe in self.importer.recipes:
+            categories[recipe.category] = categories.get(recipe.category, 0) + 1
+
+        self.importer.import_stats = {
+            'total_files': len(self.recipes_by_file) + len(self.failed_files),
+            'successful': len(self.recipes_by_file),
+            'failed': len(self.failed_files),
+            'categories': categories
+        }
+
+    def _diff(self, new_snapshot: FileSnapshot) -> Tuple[List[str], List[str]]:
+        """比较两次扫描，返回 (新增或修改的文件, 删除的文件)"""
+        changed = [path for path, state in new_snapshot.items() if self.snapshot.get(path) != state]
+        deleted = [path for path in self.snapshot if path not in new_snapshot]
+        return changed, deleted
+
+    def apply_changes(self, changed: List[str], deleted: List[str]) -> List[str]:
+        """重新解析变化的文件并重写受影响的分类文件，返回写出的文件列表"""
+        old_counts = dict(self.importer.import_stats['categories'])
+        affected_categories = set()
+
+        for file_path in deleted:
+            recipe = self.recipes_by_file.pop(file_path, None)
+            self.failed_files.discard(file_path)
+            if recipe:
+                affected_categories.add(recipe.category)
+
+        for file_path in changed:
+            old_recipe = self.recipes_by_file.get(file_path)
+            if old_recipe:
+                affected_categories.add(old_recipe.category)
+            new_recipe = self._parse(file_path)
+            if new_recipe:
+                affected_categories.add(new_recipe.category)
+
+        self._sync_importer()
+        groups = self.importer._group_by_category()
+        group_ids = self.importer._group_ids_by_category(self.importer.recipe_ids())
+        written = []
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        for category in sorted(affected_categories):
+            if category in groups:
+                category_file = self.importer.write_category_file(self.output_dir, category, groups[category],
+                                                                  group_ids[category])
+                if category_file:
+                    written.append(category_file)
+            else:
+                # 分类已没有任何菜谱
+                category_file = os.path.join(self.output_dir, f"{category}_recipes.json")
+                for stale_file in (category_file, category_file + GZIP_SUFFIX, category_file + ZSTD_SUFFIX):
+                    if os.path.exists(stale_file):
+                        os.remove(stale_file)
+                        logger.info(f"删除空分类文件: {stale_file}")
+
+        if self.importer.import_stats['categories'] != old_counts:
+            index_file = self.importer.write_index_file(self.output_dir, groups)
+            if index_file:
+                written.append(index_file)
+
+        return written
+
+    def run(self, max_cycles: Optional[int] = None):
+        """轮询监视，连续变化在 debounce 秒内静默后才统一处理"""
+        pending_changed: Set[str] = set()
+        pending_deleted: Set[str] = set()
+        last_change = 0.0
+        cycles = 0
+
+        logger.info(f"开始监视: {self.importer.project_path} (间隔 {self.interval}s, 防抖 {self.debounce}s)")
+
+        while max_cycles is None or cycles < max_cycles:
+            cycles += 1
+            new_snapshot = self._scan()
+            changed, deleted = self._diff(new_snapshot)
+            self.snapshot = new_snapshot
+
+            if changed or deleted:
+                pending_changed.update(changed)
+                pending_changed.difference_update(deleted)
+                pending_deleted.update(deleted)
+                pending_deleted.difference_update(changed)
+                last_change = time.monotonic()
+            elif (pending_changed or pending_deleted) and time.monotonic() - last_change >= self.debounce:
+                written = self.apply_changes(sorted(pending_changed), sorted(pending_deleted))
+                logger.info(
+                    f"处理变化: 修改/新增 {len(pending_changed)} 个, 删除 {len(pending_deleted)} 个, "
+                    f"重写 {len(written)} 个文件"
+                )
+                pending_changed.clear()
+                pending_deleted.clear()
+
+            time.sleep(self.interval)
+
+
+def main():
+    """主函数"""
+    arg_parser = argparse.ArgumentParser(description="监视 CookLikeHOC 菜谱目录并增量更新 Android Assets")
+    arg_parser.add_argument("project_path", nargs="?", default=r"e:\UGit\CookLikeHOC", help="菜谱项目路径")
+    arg_parser.add_argument("--output-dir", default="android_assets", help="Android Assets 输出目录")
+    arg_parser.add_argument("--interval", type=float, default=1.0, help="轮询间隔（秒）")
+    arg_parser.add_argument("--debounce", type=float, default=0.5, help="防抖时间（秒）")
+    arg_parser.add_argument("--profile", default="pretty", choices=list(OUTPUT_PROFILES), help="JSON 输出配置")
+    args = arg_parser.parse_args()
+
+    if not os.path.exists(args.project_path):
+        print(f"❌ 错误: 项目路径不存在 - {args.project_path}")
+        return False
+
+    importer = DataImporter(args.project_path, output_profile=args.profile)
+    watcher = RecipeWatcher(importer, args.output_dir, args.interval, args.debounce)
+    watcher.initial_build()
+    print(f"👀 正在监视 {args.project_path}，按 Ctrl+C 退出")
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 已停止监视")
+
+    return True
+
+
+if __name__ == "__main__":
+    main()